@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: compiling the IR of a `tc.define` library with thousands of routes.
+
+"uncached" walks the class and calls every route form (the default), while `cache=True` reads
+from a persistent `IRCache`: "disk" is a fresh process reading the payload back from
+`__pycache__`, and "memory" is a repeat call in the same process. Each is shown for the parsed
+dict (`compile_ir`) and for the JSON bytes which `tc.define.install` sends (`compile_ir_bytes`).
+
+    python py/benchmarks/bench_compile_ir.py [--routes N] [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import pathlib
+import sys
+import tempfile
+import timeit
+
+import tinychain as tc
+
+
+def _write_library(directory: pathlib.Path, routes: int) -> None:
+    lines = ["import tinychain as tc", "", "", "class Wide(tc.define.Library):"]
+    for i in range(routes):
+        lines.append("    @tc.define.get")
+        if i % 2:
+            lines.append(f"    def route_{i}(self):")
+            lines.append(f"        return tc.OpRef('GET', self.route('route_{i - 1}'))")
+        else:
+            lines.append(f"    def route_{i}(self) -> tc.Json:")
+            lines.append(f"        return {{'index': {i}, 'tags': ['a', 'b']}}")
+        lines.append("")
+    (directory / "wide_library.py").write_text("\n".join(lines))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--routes", type=int, default=5_000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tc-ir-cache-") as directory:
+        _write_library(pathlib.Path(directory), args.routes)
+        sys.path.insert(0, directory)
+        module = importlib.import_module("wide_library")
+        library = module.Wide(publisher="example-devco", name="wide", version="0.1.0")
+
+        cache = tc.define.ir_cache = tc.define.IRCache(persist=True)
+        assert tc.define.compile_ir(library, cache=True) == tc.define.compile_ir(library)
+
+        def from_disk(compile):
+            def stmt():
+                cache.clear()
+                compile(library, cache=True)
+
+            return stmt
+
+        print(f"{args.routes} routes")
+        for name, compile in (
+            ("compile_ir", tc.define.compile_ir),
+            ("compile_ir_bytes", tc.define.compile_ir_bytes),
+        ):
+            for label, stmt in (
+                ("uncached", lambda: compile(library)),
+                ("disk", from_disk(compile)),
+                ("memory", lambda: compile(library, cache=True)),
+            ):
+                best = min(timeit.repeat(stmt, number=args.number, repeat=5))
+                print(f"{name:>16} {label:>8}: {best / args.number * 1e3:8.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
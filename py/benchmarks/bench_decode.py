@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decoding a large `/state/scalar/map` response.
+
+"before" is the reference decoder (`json.loads` followed by the recursive, copying
+`tc.testing._unwrap_state`); "after" is `tc.decode.decode_text`.
+
+    python py/benchmarks/bench_decode.py [--entries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+import tinychain as tc
+
+
+def _payload(entries: int) -> str:
+    value = {
+        f"key-{i}": {"/state/scalar/value/number": [i, i + 0.5, f"label-{i}"]}
+        for i in range(entries)
+    }
+    return json.dumps({"/state/scalar/map": value})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    text = _payload(args.entries)
+    assert tc.decode.decode_text(text) == tc.testing._unwrap_state(json.loads(text))
+
+    print(f"backend: {'orjson' if tc.decode.orjson() is not None else 'json'}")
+    for label, stmt in (
+        ("before", lambda: tc.testing._unwrap_state(json.loads(text))),
+        ("after", lambda: tc.decode.decode_text(text)),
+    ):
+        best = min(timeit.repeat(stmt, number=args.number, repeat=3)) / args.number
+        print(f"{label:>6}: {best * 1e3:8.1f} ms/response ({args.entries} entries)")
+
+
+if __name__ == "__main__":
+    main()
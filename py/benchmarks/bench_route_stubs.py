@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: the cost of calling a `tc.define` route stub.
+
+"before" replays the per-call work stubs used to do (`get_type_hints` plus full URI validation on
+every call); "after" calls the real, precompiled stub.
+
+    python py/benchmarks/bench_route_stubs.py [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import get_type_hints
+
+import tinychain as tc
+
+
+class Echo(tc.define.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+
+def _legacy_call(library: Echo, body: object) -> tc.String:
+    route = Echo.__dict__["hello"]
+    path = tc.uri.library(
+        publisher=library.publisher,
+        name=library.name,
+        version=library.version,
+        path=["hello"],
+    ).path
+    opref = tc.OpRef(method=route.method, path=path)
+    opref = tc.OpRef(method=opref.method, path=opref.path, headers=opref.headers, body=body)
+    rtype = get_type_hints(route.form, globalns=route.form.__globals__).get("return")
+    return rtype(opref)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    echo = Echo(publisher="example-devco", name="echo", version="0.1.0")
+    assert _legacy_call(echo, "World") == echo.hello("World")
+
+    for label, stmt in (
+        ("before", lambda: _legacy_call(echo, "World")),
+        ("after", lambda: echo.hello("World")),
+    ):
+        best = min(timeit.repeat(stmt, number=args.number, repeat=5))
+        print(f"{label:>6}: {best / args.number * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time and peak RSS to build a WASM `/lib` install payload, against artifact size.
+
+"before" reads the artifact, base64-encodes it and embeds it with `json.dumps` (the previous
+`tc.wasm.install` path); "after" is `tc.wasm.install_payload` (memory-mapped, chunked encoding);
+"stream" consumes `tc.wasm.iter_install_payload` chunk by chunk, as a streaming consumer would.
+Each measurement runs in a fresh subprocess so peak RSS is not shared between runs. No kernel is
+needed: only payload construction is measured, up to the point it would be handed to
+`StateHandle`.
+
+    python py/benchmarks/bench_wasm_install.py [--sizes-mb 16 64 256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+_CHILD = r"""
+import base64, json, pathlib, resource, sys, time
+
+import tinychain as tc
+
+mode, artifact = sys.argv[1], pathlib.Path(sys.argv[2])
+schema = {"id": "/lib/example-devco/bench/0.1.0", "version": "0.1.0", "dependencies": []}
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+if mode == "before":
+    payload = json.dumps(
+        {
+            "schema": schema,
+            "artifacts": [
+                {
+                    "path": "/lib/wasm",
+                    "content_type": "application/wasm",
+                    "bytes": base64.b64encode(artifact.read_bytes()).decode("ascii"),
+                }
+            ],
+        },
+        separators=(",", ":"),
+    )
+elif mode == "after":
+    payload = tc.wasm.install_payload(schema, artifact)
+else:
+    for chunk in tc.wasm.iter_install_payload(schema, artifact):
+        pass
+elapsed = time.perf_counter() - start
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"{elapsed:.3f} {(peak - baseline) / 1024:.0f}")
+"""
+
+
+def _measure(mode: str, artifact: pathlib.Path) -> tuple[float, float]:
+    env = dict(os.environ, PYTHONPATH=str(pathlib.Path(__file__).resolve().parents[1]))
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, mode, str(artifact)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'mode':>7} {'time (s)':>9} {'peak RSS (MB)':>14} {'x size':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            artifact = pathlib.Path(tmp) / f"{size_mb}.wasm"
+            with open(artifact, "wb") as file:
+                for _ in range(size_mb):
+                    file.write(os.urandom(1 << 20))
+
+            for mode in ("before", "after", "stream"):
+                elapsed, peak_mb = _measure(mode, artifact)
+                print(
+                    f"{size_mb:>6}MB {mode:>7} {elapsed:>9.3f} {peak_mb:>14.0f} "
+                    f"{peak_mb / size_mb:>7.2f}"
+                )
+            artifact.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,8 +22,23 @@ def _body_text(handle: "tc.StateHandle") -> str:
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Install a WASM TinyChain library")
-    parser.add_argument("schema", type=pathlib.Path, help="Path to schema JSON")
-    parser.add_argument("wasm", type=pathlib.Path, help="Path to compiled .wasm")
+    parser.add_argument("schema", type=pathlib.Path, nargs="?", help="Path to schema JSON")
+    parser.add_argument("wasm", type=pathlib.Path, nargs="?", help="Path to compiled .wasm")
+    parser.add_argument(
+        "--many",
+        type=pathlib.Path,
+        default=None,
+        help=(
+            "Install every library in a directory of <name>.json/<name>.wasm pairs, "
+            "or listed in a JSON manifest, through one kernel"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of threads encoding artifacts with --many",
+    )
     parser.add_argument(
         "--data-dir",
         type=pathlib.Path,
@@ -35,14 +50,31 @@ def main() -> None:
         default=None,
         help="Optional bearer token for authorized installs",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reinstall even if the data directory manifest shows the library is unchanged",
+    )
     args = parser.parse_args()
 
+    if args.many is not None:
+        if args.schema is not None or args.wasm is not None:
+            parser.error("--many cannot be combined with a schema and WASM path")
+        _install_many(args)
+        return
+    if args.schema is None or args.wasm is None:
+        parser.error("expected a schema and WASM path, or --many")
+
     response = install(
         args.schema,
         args.wasm,
         data_dir=args.data_dir,
         bearer_token=args.bearer_token,
+        force=args.force,
     )
+    if isinstance(response, tc.manifest.SkippedInstall):
+        print(f"{response.library} is unchanged ({response.digest}); skipped install")
+        return
     if response.status != 204:
         body = _body_text(response.body) if response.body else ""
         raise RuntimeError(
@@ -50,6 +82,39 @@ def main() -> None:
         )
 
 
+def _install_many(args: argparse.Namespace) -> None:
+    if args.data_dir is None:
+        raise RuntimeError("--many requires --data-dir")
+
+    results = tc.wasm.install_many(
+        args.many,
+        data_dir=args.data_dir,
+        bearer_token=args.bearer_token,
+        force=args.force,
+        max_workers=args.workers,
+    )
+
+    failed = 0
+    for result in results:
+        name = result.library or str(result.schema)
+        timing = f"prepare={result.prepare_seconds:.3f}s install={result.install_seconds:.3f}s"
+        if result.skipped:
+            print(f"unchanged {name} {timing}")
+        elif result.ok:
+            print(f"installed {name} {timing}")
+        else:
+            failed += 1
+            if result.error is not None:
+                reason = f"{type(result.error).__name__}: {result.error}"
+            else:
+                body = result.response.body
+                reason = f"status={result.response.status} body={_body_text(body) if body else ''}"
+            print(f"FAILED {name} {timing} {reason}")
+
+    if failed:
+        raise RuntimeError(f"{failed} of {len(results)} installs failed")
+
+
 def install(
     schema_path: pathlib.Path,
     wasm_path: pathlib.Path,
@@ -57,13 +122,15 @@ def install(
     kernel: "tc.KernelHandle | None" = None,
     data_dir: pathlib.Path | None = None,
     bearer_token: str | None = None,
-) -> "tc.KernelResponse":
+    force: bool = False,
+) -> "tc.KernelResponse | tc.manifest.SkippedInstall":
     return tc.wasm.install(
         schema_path,
         wasm_path,
         kernel=kernel,
         data_dir=data_dir,
         bearer_token=bearer_token,
+        force=force,
     )
 
 
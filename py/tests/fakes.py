@@ -0,0 +1,55 @@
+"""Stand-ins for the `tinychain_local` request, response and state types used by executor tests."""
+
+from __future__ import annotations
+
+import json
+
+
+class Value:
+    def __init__(self, payload: object):
+        self._payload = payload
+
+    def to_json(self) -> str:
+        return json.dumps(self._payload)
+
+
+class Body:
+    def __init__(self, value: object):
+        self._value = value
+
+    def value(self):
+        return self._value
+
+
+class Response:
+    """A response whose body holds `payload` as a JSON state value."""
+
+    def __init__(self, payload: object = None, status: int = 200):
+        self.status = status
+        self.body = Body(Value(payload))
+
+
+class RawResponse:
+    """A response whose body holds `value` as is (JSON text, a buffer, or a state value)."""
+
+    def __init__(self, value: object, status: int = 200):
+        self.status = status
+        self.body = Body(value)
+
+
+class Request:
+    def __init__(self, method: str, path: str, headers, body):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+class Handle:
+    """A `StateHandle` built from the JSON text which the executor encodes."""
+
+    def __init__(self, payload: str):
+        self.payload = payload
+
+    def value(self):
+        return Value(json.loads(self.payload))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+class _SlowKernel:
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.threads: set[str] = set()
+        self._lock = threading.Lock()
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return Response(bearer_token)
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+
+def test_aexecute_runs_off_the_event_loop_with_bounded_concurrency():
+    kernel = _SlowKernel()
+    lib = Lib(publisher="example-devco", name="async", version="0.1.0")
+
+    async def main():
+        executor = tc.AsyncExecutor(kernel, bearer_token="t", max_in_flight=3, coalesce=False)
+        async with executor:
+            return await asyncio.gather(*(tc.aexecute(lib.hello()) for _ in range(9)))
+
+    assert asyncio.run(main()) == ["t"] * 9
+    assert kernel.peak == 3
+    assert all(name.startswith("tinychain-kernel") for name in kernel.threads)
+
+
+def test_aexecute_requires_an_active_async_executor():
+    lib = Lib(publisher="example-devco", name="async", version="0.1.0")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(tc.aexecute(lib.hello()))
+
+
+def test_async_executor_context_is_task_local():
+    kernel = _SlowKernel(delay=0)
+
+    async def main():
+        outer = tc.abackend(kernel)
+        async with outer:
+            async def inner():
+                async with tc.abackend(kernel) as nested:
+                    return tc.executor.acurrent() is nested
+
+            assert await asyncio.create_task(inner())
+            assert tc.executor.acurrent() is outer
+
+    asyncio.run(main())
+
+
+def test_async_executor_can_be_reused_across_event_loops():
+    kernel = _SlowKernel(delay=0)
+    lib = Lib(publisher="example-devco", name="async", version="0.1.0")
+    executor = tc.AsyncExecutor(kernel, bearer_token="t", max_in_flight=2)
+
+    async def main():
+        return await asyncio.gather(*(executor.execute(lib.hello()) for _ in range(4)))
+
+    try:
+        for _ in range(2):
+            assert [response.status for response in asyncio.run(main())] == [200] * 4
+    finally:
+        executor.close()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import RawResponse
+
+
+def _value(kind: str, value: object) -> dict:
+    return {f"/state/scalar/value/{kind}": value}
+
+
+def _map(value: dict) -> dict:
+    return {"/state/scalar/map": value}
+
+
+PAYLOADS = [
+    "hello",
+    42,
+    None,
+    _value("string", "hello"),
+    _value("number", _value("int", 7)),
+    [_value("int", 1), 2, [_value("int", 3)]],
+    _map({"a": _value("int", 1), "b": _map({"c": [_value("string", "x")]})}),
+    {"plain": _value("int", 1), "other": 2},
+    {"/state/scalar/tuple": [_value("int", 1)]},
+    _map({"a": {"nested": _value("int", 1)}}),
+    _value("tuple", [_map({"k": _value("int", 1)})]),
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_unwrap_state_matches_reference_rules(payload):
+    expected = tc.testing._unwrap_state(copy.deepcopy(payload))
+    assert tc.decode.unwrap_state(copy.deepcopy(payload)) == expected
+
+
+def test_unwrap_state_does_not_copy_envelope_free_payloads():
+    payload = {"a": [1, 2, {"b": 3}], "c": "d"}
+    assert tc.decode.unwrap_state(payload) is payload
+
+    rows = [[1, 2], [3, 4]]
+    assert tc.decode.unwrap_state(rows) is rows
+
+
+def test_unwrap_state_handles_deep_nesting():
+    payload: object = _value("int", 1)
+    for _ in range(5000):
+        payload = [payload]
+
+    result = tc.decode.unwrap_state(payload)
+    for _ in range(5000):
+        (result,) = result
+    assert result == 1
+
+
+def test_decode_falls_back_for_values_the_fast_backend_rejects():
+    assert tc.decode.decode_text("[NaN, 18446744073709551616]")[1] == 2**64
+    assert tc.decode.decode_text(json.dumps(_map({"x": _value("int", 1)}))) == {"x": 1}
+
+
+class _Stream:
+    """Serve `text` a few characters per read, to split tokens across chunk boundaries."""
+
+    def __init__(self, text: str, size: int):
+        self._data = text.encode("utf-8")
+        self._size = size
+        self.reads = 0
+
+    def read(self, _n: int = -1) -> bytes:
+        self.reads += 1
+        chunk, self._data = self._data[: self._size], self._data[self._size:]
+        return chunk
+
+
+TUPLE = _value(
+    "tuple",
+    [_value("int", 12345), "héllo, \"world\"", _map({"k": [_value("int", 1)]}), [], 1.5e3, None],
+)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [TUPLE, {"/state/scalar/tuple": [1, _value("int", 2)]}, [], [[1], {"a": 2}], _value("list", [])],
+)
+def test_iter_text_matches_full_decode(payload):
+    text = json.dumps(payload, ensure_ascii=False)
+    elements = payload
+    while isinstance(elements, dict):
+        (elements,) = elements.values()
+    expected = [tc.testing._unwrap_state(copy.deepcopy(e)) for e in elements]
+
+    assert list(tc.decode.iter_text(text)) == expected
+    for size in (1, 3, 7):
+        assert list(tc.decode.iter_text(_Stream(text, size))) == expected
+
+
+def test_iter_text_is_lazy():
+    stream = _Stream(json.dumps(list(range(100_000))), 1 << 10)
+    elements = tc.decode.iter_text(stream)
+
+    assert [next(elements) for _ in range(3)] == [0, 1, 2]
+    assert stream.reads == 1
+
+
+def test_iter_text_rejects_non_sequences():
+    with pytest.raises(ValueError):
+        list(tc.decode.iter_text(json.dumps(_map({"a": 1}))))
+    with pytest.raises(ValueError):
+        list(tc.decode.iter_text("[1, 2"))
+
+
+def test_iter_response():
+    assert list(tc.iter_response(RawResponse(json.dumps(TUPLE)))) == tc.decode.decode_text(
+        json.dumps(TUPLE)
+    )
+    assert list(tc.iter_response(RawResponse("", status=204))) == []
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import importlib
+import sys
+
+import pytest
+
+import tinychain as tc
+
+LIBRARY_SOURCE = '''
+import tinychain as tc
+
+CALLS = []
+
+
+def greeting():
+    return {GREETING!r}
+
+
+class Lib(tc.define.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        CALLS.append("hello")
+        return greeting()
+
+    @tc.define.get
+    def link(self):
+        CALLS.append("link")
+        return tc.OpRef("GET", self.route("hello"))
+'''
+
+
+@pytest.fixture
+def library_module(tmp_path, monkeypatch):
+    """Write (and rewrite) a library module on disk, importing it afresh each time."""
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(tc.define, "ir_cache", tc.define.IRCache(persist=True))
+
+    def write(greeting: str = "hi"):
+        (tmp_path / "ir_cache_lib.py").write_text(LIBRARY_SOURCE.replace("{GREETING!r}", repr(greeting)))
+        sys.modules.pop("ir_cache_lib", None)
+        importlib.invalidate_caches()
+        return importlib.import_module("ir_cache_lib")
+
+    yield write
+    sys.modules.pop("ir_cache_lib", None)
+
+
+def _lib(module, version: str = "0.1.0"):
+    return module.Lib(publisher="example-devco", name="cached", version=version)
+
+
+def test_ir_is_served_from_memory_then_from_pycache(library_module, tmp_path):
+    module = library_module()
+    cache = tc.define.ir_cache
+
+    first = tc.define.compile_ir(_lib(module), cache=True)
+    assert first["routes"] == [
+        {"path": "/hello", "value": "hi"},
+        {"path": "/link", "op": {"method": "GET", "path": _lib(module).route("hello")}},
+    ]
+    first["routes"].clear()  # callers may mutate what they get back
+
+    assert tc.define.compile_ir(_lib(module), cache=True)["routes"][0] == {"path": "/hello", "value": "hi"}
+    assert module.CALLS == ["hello", "link"]
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert len(list((tmp_path / "__pycache__").glob("*.tc-ir.json"))) == 1
+
+    # A new process (an empty memory cache) reads the payload back from disk.
+    cache.clear()
+    assert tc.define.compile_ir_bytes(_lib(module), cache=True) == tc.define.compile_ir_bytes(_lib(module), cache=False)
+    assert cache.disk_hits == 1
+    assert module.CALLS == ["hello", "link", "hello", "link"]
+
+
+def test_code_and_schema_changes_invalidate(library_module, tmp_path):
+    module = library_module("hi")
+    assert tc.define.compile_ir(_lib(module), cache=True)["routes"][0]["value"] == "hi"
+    assert tc.define.compile_ir(_lib(module, "0.2.0"), cache=True)["schema"]["version"] == "0.2.0"
+
+    # Editing a helper the route calls changes the module source, so the IR is recompiled.
+    module = library_module("hello")
+    tc.define.ir_cache.clear()
+    assert tc.define.compile_ir(_lib(module), cache=True)["routes"][0]["value"] == "hello"
+    assert tc.define.ir_cache.misses == 3
+
+    # Stale payloads for the same class and schema are pruned; other schemas are kept.
+    assert len(list((tmp_path / "__pycache__").glob("*.tc-ir.json"))) == 2
+
+
+def test_uncached_compilation_and_memory_only_cache(library_module, tmp_path, monkeypatch):
+    module = library_module()
+    monkeypatch.setattr(tc.define, "ir_cache", tc.define.IRCache(persist=False))
+
+    tc.define.compile_ir(_lib(module), cache=False)
+    tc.define.compile_ir(_lib(module), cache=True)
+    tc.define.compile_ir(_lib(module), cache=True)
+
+    assert module.CALLS == ["hello", "link"] * 2
+    assert tc.define.ir_cache.hits == 1
+    assert not (tmp_path / "__pycache__").exists() or not list((tmp_path / "__pycache__").glob("*.tc-ir.json"))
+
+
+def test_compile_ir_recompiles_unless_asked_to_cache(library_module):
+    module = library_module()
+
+    tc.define.compile_ir(_lib(module))
+    tc.define.compile_ir_bytes(_lib(module))
+
+    assert module.CALLS == ["hello", "link"] * 2
+    assert (tc.define.ir_cache.hits, tc.define.ir_cache.misses) == (0, 0)
+
+
+def test_route_digest_tracks_route_definitions():
+    cache = tc.define.IRCache(persist=False)
+
+    def make(form):
+        return type("Lib", (tc.define.Library,), {"hello": tc.define.get(form)})
+
+    first = make(lambda self: "a")
+    second = make(lambda self: "b")
+
+    assert cache.class_digest(first) == cache.class_digest(first)
+    assert cache.class_digest(first) != cache.class_digest(second)
+
+
+def test_factory_classes_are_never_persisted(tmp_path, monkeypatch):
+    monkeypatch.setattr(tc.define, "ir_cache", tc.define.IRCache(tmp_path, persist=True))
+
+    def make(greeting: str):
+        class Lib(tc.define.Library):
+            @tc.define.get
+            def hello(self) -> tc.String:
+                return greeting
+
+        return Lib(publisher="example-devco", name="factory", version="0.1.0")
+
+    assert tc.define.compile_ir(make("hello"), cache=True)["routes"][0]["value"] == "hello"
+    assert tc.define.compile_ir(make("goodbye"), cache=True)["routes"][0]["value"] == "goodbye"
+    assert tc.define.ir_cache.misses == 2
+    assert list(tmp_path.glob("*.tc-ir.json")) == []
@@ -25,3 +25,26 @@ def test_define_library_returns_typed_refs():
     assert raw.method == "GET"
     assert raw.path == "/lib/example-devco/a/0.1.0/raw"
 
+
+def test_define_route_stubs_resolve_return_type_once(monkeypatch):
+    class A(tc.define.Library):
+        @tc.define.get
+        def hello(self) -> tc.String:
+            """Say hello."""
+
+    calls = []
+
+    def _fail(*args, **kwargs):
+        calls.append(args)
+        raise AssertionError("return types should be resolved when the class is defined")
+
+    monkeypatch.setattr(tc.define, "get_type_hints", _fail)
+
+    a = A(publisher="example-devco", name="a", version="0.1.0")
+    refs = [a.hello(name) for name in ("x", "y", "z")]
+    assert all(isinstance(ref, tc.String) for ref in refs)
+    assert [ref.op.body for ref in refs] == ["x", "y", "z"]
+    assert refs[0].op.path is refs[1].op.path
+    assert a.hello.__name__ == "hello"
+    assert a.hello.__doc__ == "Say hello."
+    assert calls == []
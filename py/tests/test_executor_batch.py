@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import tinychain as tc
+
+from .fakes import Request, Response
+
+
+class _Kernel:
+    def __init__(self):
+        self.dispatched: list[tuple[str, str]] = []
+        self.resolved: list[str] = []
+
+    def dispatch(self, request):
+        self.dispatched.append((request.method, request.path))
+        return Response(None, status=204)
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.resolved.append(path)
+        return Response(path)
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self):
+        ...
+
+    @tc.define.get
+    def goodbye(self) -> tc.String:
+        ...
+
+    @tc.define.put
+    def update(self):
+        ...
+
+
+def test_execute_many_preserves_order_and_dedups_gets(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", Request)
+
+    kernel = _Kernel()
+    lib = Lib(publisher="example-devco", name="batch", version="0.1.0")
+
+    with tc.backend(kernel):
+        results = tc.execute_many([lib.hello(), lib.goodbye(), lib.hello()])
+
+    hello = lib.route("hello")
+    goodbye = lib.route("goodbye")
+    assert results == [hello, goodbye, hello]
+    assert kernel.resolved == [hello, goodbye]
+
+
+def test_execute_many_never_dedups_writes(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", Request)
+
+    kernel = _Kernel()
+    lib = Lib(publisher="example-devco", name="batch", version="0.1.0")
+
+    with tc.backend(kernel) as executor:
+        responses = executor.execute_many([lib.update(), lib.hello(), lib.update()])
+
+    assert [r.status for r in responses] == [204, 200, 204]
+    assert kernel.dispatched == [("PUT", lib.route("update")), ("PUT", lib.route("update"))]
+    assert kernel.resolved == [lib.route("hello")]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+class _GatedKernel:
+    """Blocks every `resolve_get` until the test opens the gate."""
+
+    def __init__(self, fail: bool = False, statuses: tuple[int, ...] = ()):
+        self.fail = fail
+        self.statuses = list(statuses)
+        self.calls = 0
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self._lock = threading.Lock()
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        with self._lock:
+            self.calls += 1
+            status = self.statuses.pop(0) if self.statuses else 200
+        self.started.set()
+        self.gate.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("dependency unavailable")
+        return Response(bearer_token, status=status)
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+
+def _run_concurrently(fn, count: int, kernel: _GatedKernel) -> list:
+    """Run `fn(0)` as the leader, then `fn(i)` for each follower once the leader is in flight."""
+
+    results: list = [None] * count
+    flights = tc.executor._flights
+    before = flights.coalesced
+
+    def worker(i: int) -> None:
+        try:
+            results[i] = fn(i)
+        except Exception as err:
+            results[i] = err
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    threads[0].start()
+    assert kernel.started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+
+    # Release the leader only once every follower has joined its flight.
+    deadline = time.monotonic() + 5
+    while flights.coalesced - before < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    kernel.gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_identical_gets_share_one_kernel_call():
+    kernel = _GatedKernel()
+    lib = Lib(publisher="example-devco", name="flight", version="0.1.0")
+    executor = tc.backend(kernel, bearer_token="t")
+
+    results = _run_concurrently(lambda _i: tc.executor.execute(lib.hello(), executor=executor), 8, kernel)
+
+    assert kernel.calls == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_coalesced_callers_share_the_error():
+    kernel = _GatedKernel(fail=True)
+    lib = Lib(publisher="example-devco", name="flight", version="0.1.0")
+    executor = tc.backend(kernel)
+
+    results = _run_concurrently(lambda _i: tc.executor.execute(lib.hello(), executor=executor), 4, kernel)
+
+    assert kernel.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_coalescing_can_be_disabled():
+    kernel = _GatedKernel()
+    kernel.gate.set()
+    lib = Lib(publisher="example-devco", name="flight", version="0.1.0")
+    executor = tc.Executor(kernel=kernel, coalesce=False)
+
+    for _ in range(3):
+        tc.executor.execute(lib.hello(), executor=executor)
+
+    assert kernel.calls == 3
+
+
+def test_followers_with_more_time_rerun_a_failure_under_the_leaders_deadline():
+    # The leader's short deadline runs out in the dependency, which answers 504.
+    kernel = _GatedKernel(statuses=(504,))
+    lib = Lib(publisher="example-devco", name="flight", version="0.1.0")
+    executor = tc.backend(kernel)
+
+    def call(i: int):
+        return tc.executor.execute(lib.hello(), executor=executor, timeout=5.0 if i == 0 else None)
+
+    leader, follower = _run_concurrently(call, 2, kernel)
+
+    assert (leader.status, follower.status) == (504, 200)
+    assert kernel.calls == 2
+
+
+def test_backend_coalescing_can_be_disabled():
+    kernel = _GatedKernel()
+    kernel.gate.set()
+    lib = Lib(publisher="example-devco", name="flight", version="0.1.0")
+
+    with tc.backend(kernel, coalesce=False) as executor:
+        for _ in range(3):
+            tc.executor.execute(lib.hello(), executor=executor)
+
+    assert not executor.coalesce and tc.abackend(kernel, coalesce=False).coalesce is False
+    assert kernel.calls == 3
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Request, Response
+
+
+class _Kernel:
+    """Sleeps `delay` seconds per call and records the headers each dispatch carried."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[str] = []
+        self.headers: list[dict] = []
+        self._lock = threading.Lock()
+
+    def _answer(self, path: str):
+        with self._lock:
+            self.calls.append(path)
+        time.sleep(self.delay)
+        return Response(path)
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        return self._answer(path)
+
+    def dispatch(self, request):
+        self.headers.append(dict(request.headers))
+        return self._answer(request.path)
+
+
+@pytest.fixture(autouse=True)
+def kernel_request(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", Request)
+    monkeypatch.setitem(vars(tc), "StateHandle", lambda payload: payload)
+
+
+def test_execute_abandons_calls_past_the_deadline():
+    kernel = _Kernel(delay=0.5)
+
+    start = time.perf_counter()
+    with tc.backend(kernel):
+        with pytest.raises(tc.DeadlineExceeded):
+            tc.execute(tc.OpRef("GET", "/state/scalar/value"), timeout=0.05)
+    assert time.perf_counter() - start < 0.3
+
+    with tc.backend(_Kernel()):
+        assert tc.execute(tc.OpRef("GET", "/state/scalar/value"), timeout=1.0) == "/state/scalar/value"
+
+
+def test_executor_default_timeout_and_remaining_budget_header():
+    kernel = _Kernel()
+
+    with tc.backend(kernel, timeout=2.0):
+        tc.execute(tc.OpRef("PUT", "/state/scalar/value", body=1))
+        with tc.deadline.scope(0.5):
+            tc.execute(tc.OpRef("PUT", "/state/scalar/value", body=2), timeout=5.0)
+
+    first, second = (int(headers[tc.deadline.HEADER]) for headers in kernel.headers)
+    assert 1500 < first <= 2000
+    assert 0 < second <= 500
+
+    executor = tc.Executor(kernel=kernel, timeout=0.25)
+    executor.dispatch("PUT", "/state/scalar/value", body=3)
+    assert 0 < int(kernel.headers[-1][tc.deadline.HEADER]) <= 250
+
+
+def test_execute_many_stops_submitting_once_the_deadline_passes():
+    kernel = _Kernel(delay=0.05)
+    ops = [tc.OpRef("GET", f"/state/scalar/{i}") for i in range(20)]
+
+    with tc.backend(kernel):
+        with pytest.raises(tc.DeadlineExceeded):
+            tc.execute_many(ops, timeout=0.12)
+
+    time.sleep(0.15)
+    assert len(kernel.calls) < 6
+
+
+def test_aexecute_cancellation_is_real():
+    kernel = _Kernel(delay=0.05)
+    ops = [tc.OpRef("GET", f"/state/scalar/{i}") for i in range(20)]
+
+    async def main():
+        async with tc.AsyncExecutor(kernel=kernel, max_in_flight=1) as executor:
+            with pytest.raises(tc.DeadlineExceeded):
+                await executor.execute_many(ops, timeout=0.12)
+
+            # Queued behind a slow call, this one is cancelled before it reaches the kernel.
+            slow = asyncio.ensure_future(executor.execute(tc.OpRef("GET", "/slow")))
+            queued = asyncio.ensure_future(executor.execute(tc.OpRef("GET", "/queued")))
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            await slow
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+
+            with pytest.raises(tc.DeadlineExceeded):
+                await executor.execute(tc.OpRef("GET", "/late"), timeout=0.01)
+
+    asyncio.run(main())
+    time.sleep(0.15)
+    assert "/queued" not in kernel.calls
+    assert len([path for path in kernel.calls if path.startswith("/state/scalar/")]) < 6
+
+
+def test_retries_stop_at_the_deadline():
+    class _Flaky(_Kernel):
+        def resolve_get(self, path: str, body=None, bearer_token=None):
+            self._answer(path)
+            raise RuntimeError("unavailable")
+
+    kernel = _Flaky()
+    policy = tc.Policy(retries=10, backoff=0.2, max_backoff=0.2, sleep=lambda _: None)
+    policy._delay = lambda attempt: 0.2
+
+    with tc.backend(kernel, policy=policy):
+        with pytest.raises(RuntimeError, match="unavailable"):
+            tc.execute(tc.OpRef("GET", "/state/scalar/value"), timeout=0.1)
+
+    assert len(kernel.calls) == 1
+
+
+def test_stuck_calls_do_not_starve_later_timed_calls():
+    gate = threading.Event()
+
+    class _StuckKernel(_Kernel):
+        def resolve_get(self, path: str, body=None, bearer_token=None):
+            if path.endswith("/stuck"):
+                gate.wait(timeout=10)
+            return self._answer(path)
+
+    kernel = _StuckKernel()
+    executor = tc.backend(kernel, timeout=0.05, coalesce=False)
+    errors: list[BaseException] = []
+
+    def stuck():
+        try:
+            executor.execute(tc.OpRef("GET", "/state/scalar/stuck"))
+        except tc.DeadlineExceeded as err:
+            errors.append(err)
+
+    try:
+        threads = [threading.Thread(target=stuck) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len(errors) == 100
+
+        response = executor.execute(tc.OpRef("GET", "/state/scalar/healthy"), timeout=1.0)
+        assert response.status == 200
+        assert kernel.calls == ["/state/scalar/healthy"]
+    finally:
+        gate.set()
+
+
+def test_abandoned_async_calls_do_not_starve_later_ones():
+    gate = threading.Event()
+
+    class _StuckKernel(_Kernel):
+        def resolve_get(self, path: str, body=None, bearer_token=None):
+            if path.endswith("/stuck"):
+                gate.wait(timeout=10)
+            return self._answer(path)
+
+    kernel = _StuckKernel()
+
+    async def main():
+        async with tc.AsyncExecutor(kernel=kernel, max_in_flight=4, coalesce=False) as executor:
+            stuck = tc.OpRef("GET", "/state/scalar/stuck")
+            results = await asyncio.gather(
+                *(executor.execute(stuck, timeout=0.05) for _ in range(8)), return_exceptions=True
+            )
+            assert all(isinstance(result, tc.DeadlineExceeded) for result in results)
+
+            return await executor.execute(tc.OpRef("GET", "/state/scalar/healthy"), timeout=1.0)
+
+    try:
+        assert asyncio.run(main()).status == 200
+        assert kernel.calls == ["/state/scalar/healthy"]
+    finally:
+        gate.set()
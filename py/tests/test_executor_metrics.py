@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+class _Kernel:
+    def __init__(self, metrics: tc.Metrics):
+        self.metrics = metrics
+        self.in_flight_seen: list[dict] = []
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.in_flight_seen.append(self.metrics.snapshot()["in_flight"])
+        if path.endswith("/broken"):
+            raise RuntimeError("boom")
+        return Response("ok")
+
+
+class _Ticker:
+    def __init__(self, step: float):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+    @tc.define.get
+    def broken(self) -> tc.String:
+        ...
+
+
+def test_metrics_record_latency_status_and_in_flight():
+    metrics = tc.Metrics(clock=_Ticker(0.02))
+    kernel = _Kernel(metrics)
+    lib = Lib(publisher="example-devco", name="metrics", version="0.1.0")
+    hello = f"GET {lib.route('hello')}"
+
+    with tc.backend(kernel, metrics=metrics):
+        assert tc.execute(lib.hello()) == "ok"
+        with pytest.raises(RuntimeError):
+            tc.execute(lib.broken())
+
+    assert kernel.in_flight_seen[0] == {hello: 1}
+
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"][hello] == 0
+    assert set(snapshot["latency"][hello]) == {"encode", "kernel", "decode"}
+    assert snapshot["latency"][hello]["kernel"]["count"] == 1
+    assert snapshot["latency"][hello]["kernel"]["buckets"]["0.025"] == 1
+    assert snapshot["status"] == {
+        f"GET {lib.route('broken')}": {"error": 1},
+        hello: {"200": 1},
+    }
+
+
+def test_resolve_records_metrics():
+    metrics = tc.Metrics(clock=_Ticker(0.02))
+    executor = tc.Executor(kernel=_Kernel(metrics), metrics=metrics)
+
+    assert executor.resolve("get", "/state/hello").status == 200
+    with pytest.raises(RuntimeError):
+        executor.resolve("GET", "/state/broken")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"] == {"GET /state/hello": 0, "GET /state/broken": 0}
+    assert snapshot["latency"]["GET /state/hello"]["kernel"]["count"] == 1
+    assert snapshot["status"] == {"GET /state/hello": {"200": 1}, "GET /state/broken": {"error": 1}}
+
+
+def test_metrics_prometheus_exposition():
+    metrics = tc.Metrics(buckets=(0.1, 1.0))
+    metrics.observe("get", '/lib/a/"b"/0.1.0/c', "kernel", 0.5)
+    metrics.record_status("GET", '/lib/a/"b"/0.1.0/c', 200)
+
+    text = metrics.prometheus()
+    labels = 'method="GET",path="/lib/a/\\"b\\"/0.1.0/c"'
+    assert "# TYPE tinychain_client_latency_seconds histogram" in text
+    assert f'tinychain_client_latency_seconds_bucket{{{labels},phase="kernel",le="0.1"}} 0' in text
+    assert f'tinychain_client_latency_seconds_bucket{{{labels},phase="kernel",le="+Inf"}} 1' in text
+    assert f"tinychain_client_latency_seconds_count{{{labels},phase=\"kernel\"}} 1" in text
+    assert f'tinychain_client_responses_total{{{labels},status="200"}} 1' in text
+
+
+def test_metrics_collapse_state_keys():
+    metrics = tc.Metrics()
+    users = tc.uri.state(namespace="demo", path=["users", "user:123", "name"])
+    metrics.record_status("GET", users, 200)
+
+    assert metrics.snapshot()["status"] == {"GET /state/demo/users/...": {"200": 1}}
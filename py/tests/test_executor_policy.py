@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+DEP = tc.uri.library(publisher="example-devco", name="b", version="0.1.0")
+
+
+class _Kernel:
+    """Answers each call with the next outcome: a status code, or an exception to raise."""
+
+    def __init__(self, *outcomes, name: str = "kernel"):
+        self.outcomes = list(outcomes)
+        self.name = name
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(self.name, status=outcome)
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        return self._next()
+
+    def dispatch(self, request):
+        return self._next()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+    @tc.define.put
+    def update(self):
+        ...
+
+
+def _lib() -> Lib:
+    return Lib(publisher="example-devco", name="b", version="0.1.0")
+
+
+def _policy(clock=None, **kwargs) -> tc.Policy:
+    delays: list[float] = []
+    breaker = lambda: tc.policy.CircuitBreaker(  # noqa: E731
+        failure_threshold=2, reset_timeout=10.0, clock=clock or _Clock()
+    )
+    policy = tc.Policy(
+        routes=tc.RoutingTable({DEP.path: ["b:8702"]}),
+        breaker=breaker,
+        sleep=delays.append,
+        **kwargs,
+    )
+    policy.delays = delays
+    return policy
+
+
+def test_gets_are_retried_with_jittered_backoff():
+    policy = _policy(retries=3, backoff=0.1, max_backoff=0.15)
+    kernel = _Kernel(RuntimeError("reset"), 503)
+
+    with tc.backend(kernel, policy=policy):
+        assert tc.execute(tc.OpRef("GET", "/state/scalar/value")) == "kernel"
+
+    assert kernel.calls == 3
+    assert policy.retried == 2
+    assert 0 <= policy.delays[0] <= 0.1
+    assert 0 <= policy.delays[1] <= 0.15
+
+
+def test_writes_are_not_retried(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", lambda *request: request)
+    policy = _policy(retries=3)
+    kernel = _Kernel(RuntimeError("reset"))
+
+    with tc.backend(kernel, policy=policy):
+        with pytest.raises(RuntimeError, match="reset"):
+            tc.execute(_lib().update())
+
+    assert kernel.calls == 1
+
+
+def test_retry_budget_bounds_retries():
+    budget = tc.policy.RetryBudget(ratio=0.0, min_tokens=1)
+    policy = _policy(retries=5, budget=budget)
+    kernel = _Kernel(*[RuntimeError("down")] * 10)
+
+    with tc.backend(kernel, policy=policy):
+        with pytest.raises(RuntimeError):
+            tc.execute(tc.OpRef("GET", "/state/scalar/value"))
+
+    assert kernel.calls == 2
+    assert budget.exhausted == 1
+
+
+def test_circuit_breaker_fails_fast_and_probes_for_recovery():
+    clock = _Clock()
+    policy = _policy(clock=clock, retries=0)
+    kernel = _Kernel(RuntimeError("down"), 500)
+
+    with tc.backend(kernel, policy=policy):
+        with pytest.raises(RuntimeError, match="down"):
+            tc.execute(_lib().hello())
+        with pytest.raises(AssertionError, match="500"):
+            tc.execute(_lib().hello())
+
+        assert policy.breaker("b:8702").state == tc.policy.OPEN
+        with pytest.raises(tc.CircuitOpenError):
+            tc.execute(_lib().hello())
+        assert kernel.calls == 2
+
+        # Calls outside the routed dependency are not affected by its breaker.
+        assert tc.execute(tc.OpRef("GET", "/state/scalar/value")) == "kernel"
+
+        clock.now = 11.0
+        assert policy.breaker("b:8702").state == tc.policy.HALF_OPEN
+        assert tc.execute(_lib().hello()) == "kernel"
+
+    snapshot = policy.snapshot()["breakers"]["b:8702"]
+    assert snapshot["state"] == tc.policy.CLOSED
+    assert snapshot["opened"] == 1
+    assert snapshot["rejected"] == 1
+
+
+def test_open_replicas_are_skipped():
+    replicas = {
+        "a:8702": _Kernel(*[RuntimeError("a down")] * 2, name="a"),
+        "b:8702": _Kernel(name="b"),
+    }
+    # Rank `b` far behind `a`, so only the open breaker can send traffic to it.
+    tracker = tc.routing.LatencyTracker(half_life=0, failure_penalty=0.0)
+    tracker.observe("b:8702", 60.0)
+    router = tc.routing.ReplicaRouter(
+        tc.RoutingTable({DEP.path: list(replicas)}),
+        lambda _prefix, authority: replicas[authority],
+        tracker=tracker,
+    )
+    policy = _policy(retries=0)
+
+    with tc.backend(_Kernel(), replicas=router, policy=policy):
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="a down"):
+                tc.execute(_lib().hello())
+
+        assert policy.breaker("a:8702").state == tc.policy.OPEN
+        assert tc.execute(_lib().hello()) == "b"
+        assert replicas["a:8702"].calls == 2
+
+
+def test_a_lost_half_open_probe_expires():
+    clock = _Clock()
+    breaker = tc.policy.CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10.0
+    assert breaker.acquire()  # this probe hangs and never reports back
+    assert not breaker.acquire()
+
+    clock.now = 19.0
+    assert not breaker.allows()
+    clock.now = 20.0
+    assert breaker.state == tc.policy.HALF_OPEN
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == tc.policy.CLOSED
+
+
+def test_deadlines_do_not_count_as_authority_failures():
+    clock = _Clock()
+    policy = _policy(clock=clock, retries=0)
+    kernel = _Kernel(tc.DeadlineExceeded("deadline exceeded"), tc.DeadlineExceeded("cancelled"))
+    breaker = policy.breaker("b:8702")
+
+    with tc.backend(kernel, policy=policy):
+        with pytest.raises(tc.DeadlineExceeded):
+            tc.execute(_lib().hello())
+        with tc.deadline.scope(0.0), pytest.raises(tc.DeadlineExceeded):
+            tc.execute(_lib().hello())
+    assert kernel.calls == 1
+    assert breaker.snapshot()["failures"] == 0
+
+    # An abandoned half-open probe is given back rather than held or judged.
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 10.0
+    with pytest.raises(tc.DeadlineExceeded):
+        policy.guard("b:8702", kernel._next)
+    assert breaker.state == tc.policy.HALF_OPEN and breaker.acquire()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Handle, Request, Response
+
+
+class _Kernel:
+    """`/state/scalar/<n>` answers `n`; `.../add` answers the sum of its body's values (and lists)."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[tuple[str, object]] = []
+        self._lock = threading.Lock()
+
+    def _answer(self, path: str, body) -> Response:
+        payload = None if body is None else json.loads(body.payload)
+        with self._lock:
+            self.calls.append((path, payload))
+        time.sleep(self.delay)
+        if path.endswith("/fail"):
+            raise RuntimeError("fail")
+        if path.endswith("/add"):
+            values = [v for value in payload.values() for v in (value if isinstance(value, list) else [value])]
+            return Response(sum(values))
+        return Response(int(path.rsplit("/", 1)[1]))
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        return self._answer(path, body)
+
+    def dispatch(self, request):
+        self._answer(request.path, request.body)
+        return Response(status=204)
+
+
+class Math(tc.Library):
+    @tc.define.get
+    def add(self, body) -> tc.Json:
+        ...
+
+
+MATH = Math(publisher="example-devco", name="math", version="0.1.0")
+
+
+@pytest.fixture(autouse=True)
+def local_types(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", Request)
+    monkeypatch.setitem(vars(tc), "StateHandle", Handle)
+
+
+def _leaf(n: int) -> tc.Json:
+    return tc.Json(tc.OpRef("GET", f"/state/scalar/{n}"))
+
+
+def test_shared_subexpressions_run_once_and_feed_their_dependents():
+    kernel = _Kernel()
+    x = _leaf(2)
+    y = MATH.add({"a": x, "b": _leaf(3)})
+    z = MATH.add({"a": x, "b": y, "c": [_leaf(2)]})
+
+    with tc.backend(kernel):
+        assert tc.graph.evaluate([z, y, x]) == [9, 5, 2]
+        assert tc.graph.evaluate({"sum": y}) == {"sum": 5}
+
+    paths = [path for path, _body in kernel.calls]
+    assert paths.count("/state/scalar/2") == 2  # once per evaluation
+    assert (MATH.add({}).op.path, {"a": 2, "b": 5, "c": [2]}) in kernel.calls
+
+    graph = tc.graph.Graph()
+    graph.add(z)
+    graph.add(MATH.add({"a": _leaf(2), "b": _leaf(3)}))
+    assert len(graph) == 4
+
+
+def test_independent_branches_run_concurrently():
+    kernel = _Kernel(delay=0.1)
+    total = MATH.add({str(n): _leaf(n) for n in range(4)})
+
+    start = time.perf_counter()
+    with tc.backend(kernel):
+        assert tc.graph.evaluate([total]) == [6]
+    # Four leaves in parallel, then the sum: two rounds instead of five.
+    assert time.perf_counter() - start < 0.35
+
+
+def test_writes_are_not_deduplicated():
+    kernel = _Kernel()
+    write = tc.OpRef("PUT", "/state/scalar/1", body={"v": 1})
+    same = tc.OpRef("PUT", "/state/scalar/1", body={"v": 1})
+
+    with tc.backend(kernel):
+        assert tc.graph.evaluate([write, same, write]) == [None, None, None]
+
+    assert len(kernel.calls) == 2
+
+
+def test_a_failure_stops_its_dependents():
+    kernel = _Kernel()
+    broken = MATH.add({"a": tc.Json(tc.OpRef("GET", "/state/scalar/fail"))})
+
+    with tc.backend(kernel):
+        with pytest.raises(RuntimeError, match="fail"):
+            tc.graph.evaluate([broken])
+
+    assert [path for path, _body in kernel.calls] == ["/state/scalar/fail"]
+
+
+def test_graph_timeout():
+    kernel = _Kernel(delay=0.5)
+
+    with tc.backend(kernel):
+        with pytest.raises(tc.DeadlineExceeded):
+            tc.graph.evaluate([MATH.add({"a": _leaf(1)})], timeout=0.05)
+
+    time.sleep(0.5)
+    assert len(kernel.calls) == 1
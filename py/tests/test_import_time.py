@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import subprocess
+import sys
+
+import tinychain as tc
+
+PACKAGE_ROOT = pathlib.Path(tc.__file__).resolve().parents[1]
+
+# Modules which `import tinychain` must not pull in eagerly.
+LAZY_MODULES = (
+    "tinychain.define",
+    "tinychain.graph",
+    "tinychain.kernel",
+    "tinychain.manifest",
+    "tinychain.shard",
+    "tinychain.testing",
+    "tinychain.wasm",
+    "tinychain_local",
+    "subprocess",
+    "asyncio",
+    "concurrent.futures",
+    "orjson",
+)
+
+# Generous ceiling on the package's own cumulative import time, in microseconds.
+IMPORT_BUDGET_US = int(os.environ.get("TC_IMPORT_BUDGET_US", "250000"))
+
+
+def _importtime() -> dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=str(PACKAGE_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tinychain"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def test_import_tinychain_is_lazy():
+    imported = _importtime()
+
+    assert "tinychain" in imported
+    assert [name for name in LAZY_MODULES if name in imported] == []
+    assert imported["tinychain"] < IMPORT_BUDGET_US, (
+        f"`import tinychain` took {imported['tinychain']}us (budget {IMPORT_BUDGET_US}us)"
+    )
+
+
+def test_lazy_attributes_resolve_on_access():
+    assert tc.define.get is tc.get
+    assert tc.testing.decode_json_body is not None
+    assert "wasm" in dir(tc)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import types
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+SCHEMA = {
+    "id": tc.uri.library(publisher="example-devco", name="example", version="0.1.0").path,
+    "version": "0.1.0",
+    "dependencies": [],
+}
+
+
+class _Kernel:
+    def __init__(self, data_dir: pathlib.Path, status: int = 204) -> None:
+        self.data_dir = data_dir
+        self.status = status
+        self.requests: list[object] = []
+
+    def dispatch(self, request):
+        self.requests.append(request)
+        if self.status == 204:
+            # Mimic the kernel persisting the library under the data_dir.
+            lib_path = self.data_dir.joinpath(*SCHEMA["id"].strip("/").split("/"))
+            lib_path.mkdir(parents=True, exist_ok=True)
+        return Response(status=self.status)
+
+
+@pytest.fixture
+def local(monkeypatch):
+    module = types.SimpleNamespace(
+        KernelRequest=lambda method, path, headers, body: (method, path, headers, body),
+        StateHandle=lambda payload: payload,
+    )
+    monkeypatch.setitem(sys.modules, "tinychain_local", module)
+    monkeypatch.setattr(tc.define, "ir_cache", tc.define.IRCache(persist=False))
+    return module
+
+
+def test_content_digest_covers_schema_and_artifact(tmp_path: pathlib.Path):
+    artifact = tmp_path / "library.wasm"
+    artifact.write_bytes(b"\0asm" * 1000)
+
+    digest = tc.manifest.content_digest(SCHEMA, "/lib/wasm", "application/wasm", artifact)
+    assert digest.startswith("sha256:")
+    assert digest == tc.manifest.content_digest(
+        dict(reversed(list(SCHEMA.items()))), "/lib/wasm", "application/wasm", b"\0asm" * 1000
+    )
+    assert digest != tc.manifest.content_digest(
+        {**SCHEMA, "version": "0.1.1"}, "/lib/wasm", "application/wasm", artifact
+    )
+    assert digest != tc.manifest.content_digest(
+        SCHEMA, "/lib/wasm", "application/wasm", b"\0asm" * 1001
+    )
+
+
+def test_wasm_install_skips_unchanged_artifacts(tmp_path: pathlib.Path, local):
+    artifact = tmp_path / "library.wasm"
+    artifact.write_bytes(b"\0asm")
+    data_dir = tmp_path / "data"
+    kernel = _Kernel(data_dir)
+
+    assert tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir).status == 204
+    assert len(kernel.requests) == 1
+
+    skipped = tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir)
+    assert isinstance(skipped, tc.manifest.SkippedInstall)
+    assert skipped.status == 204
+    assert len(kernel.requests) == 1
+
+    tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir, force=True)
+    assert len(kernel.requests) == 2
+
+    artifact.write_bytes(b"\0asm\1")
+    tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir)
+    assert len(kernel.requests) == 3
+
+    manifest = json.loads((data_dir / tc.manifest.MANIFEST_NAME).read_text())
+    assert list(manifest["libraries"]) == [SCHEMA["id"]]
+
+
+def test_install_is_not_recorded_on_failure(tmp_path: pathlib.Path, local):
+    artifact = tmp_path / "library.wasm"
+    artifact.write_bytes(b"\0asm")
+    data_dir = tmp_path / "data"
+    kernel = _Kernel(data_dir, status=401)
+
+    assert tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir).status == 401
+    assert tc.wasm.install(SCHEMA, artifact, kernel=kernel, data_dir=data_dir).status == 401
+    assert len(kernel.requests) == 2
+    assert not (data_dir / tc.manifest.MANIFEST_NAME).exists()
+
+
+def test_install_reruns_when_the_library_directory_is_missing(tmp_path: pathlib.Path):
+    manifest = tc.manifest.InstallManifest(tmp_path)
+    manifest.record(SCHEMA["id"], "sha256:abc")
+
+    assert manifest.digest(SCHEMA["id"]) == "sha256:abc"
+    assert not manifest.is_current(SCHEMA["id"], "sha256:abc")
+
+    tmp_path.joinpath(*SCHEMA["id"].strip("/").split("/")).mkdir(parents=True)
+    assert manifest.is_current(SCHEMA["id"], "sha256:abc")
+    assert not manifest.is_current(SCHEMA["id"], "sha256:def")
+
+
+def test_define_install_skips_unchanged_ir(tmp_path: pathlib.Path, local):
+    class Defined(tc.define.Library):
+        @tc.define.get
+        def hello(self):
+            return "hello"
+
+    defined = Defined(publisher="example-devco", name="example", version="0.1.0")
+    kernel = _Kernel(tmp_path)
+
+    tc.define.install(defined, kernel=kernel, data_dir=tmp_path)
+    assert isinstance(
+        tc.define.install(defined, kernel=kernel, data_dir=tmp_path), tc.manifest.SkippedInstall
+    )
+    assert len(kernel.requests) == 1
+
+    tc.define.install(defined, kernel=kernel, data_dir=tmp_path, force=True)
+    assert len(kernel.requests) == 2
+
+    # Installs compile afresh unless asked to use the IR cache.
+    assert tc.define.ir_cache.misses == 0
+    tc.define.install(defined, kernel=kernel, data_dir=tmp_path, force=True, cache=True)
+    assert tc.define.ir_cache.misses == 1
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pathlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+import tinychain as tc
+
+
+class _Handle:
+    def __init__(self, kind: str, args: tuple, data_dir: str) -> None:
+        self.kind = kind
+        self.args = args
+        self.data_dir = data_dir
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def local(monkeypatch):
+    built: list[_Handle] = []
+
+    def constructor(kind):
+        def build(*args, data_dir):
+            time.sleep(0.01)  # widen the window for concurrent first calls
+            built.append(_Handle(kind, args, data_dir))
+            return built[-1]
+
+        return build
+
+    module = types.SimpleNamespace(
+        KernelHandle=types.SimpleNamespace(
+            local=constructor("local"),
+            with_library_schema_rjwt=constructor("rjwt"),
+        ),
+        built=built,
+    )
+    monkeypatch.setitem(sys.modules, "tinychain_local", module)
+    return module
+
+
+def test_registry_reuses_handles_per_data_dir_and_arguments(tmp_path: pathlib.Path, local):
+    registry = tc.kernel.KernelRegistry()
+
+    first = registry.local(tmp_path)
+    assert registry.local(tmp_path / ".") is first
+    assert registry.local(tmp_path / "other") is not first
+
+    rjwt = registry.handle("with_library_schema_rjwt", "{}", "host", "actor", "key", data_dir=tmp_path)
+    assert rjwt is not first
+    assert registry.handle(
+        "with_library_schema_rjwt", "{}", "host", "actor", "key", data_dir=tmp_path
+    ) is rjwt
+    assert registry.handle(
+        "with_library_schema_rjwt", "{}", "host", "other-actor", "key", data_dir=tmp_path
+    ) is not rjwt
+
+    assert len(local.built) == 4
+    assert len(registry) == 4
+
+
+def test_registry_constructs_once_under_concurrency(tmp_path: pathlib.Path, local):
+    registry = tc.kernel.KernelRegistry()
+    handles = []
+
+    threads = [
+        threading.Thread(target=lambda: handles.append(registry.local(tmp_path)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(local.built) == 1
+    assert all(handle is handles[0] for handle in handles)
+
+
+def test_registry_evicts_and_closes(tmp_path: pathlib.Path, local):
+    registry = tc.kernel.KernelRegistry()
+    a = registry.local(tmp_path / "a")
+    b = registry.local(tmp_path / "b")
+
+    assert registry.evict(tmp_path / "a") == 1
+    assert a.closed and not b.closed
+    assert registry.local(tmp_path / "a") is not a
+
+    registry.close()
+    assert b.closed
+    assert len(registry) == 0
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+class _Kernel:
+    def __init__(self, statuses: dict[str, int] | None = None) -> None:
+        self.statuses = statuses or {}
+        self.loaded: set[str] = set()
+        self.calls: list[tuple[str, str, object]] = []
+
+    def resolve_get(self, path, body=None, bearer_token=None):
+        self.calls.append(("GET", path, bearer_token))
+        if path not in self.loaded:
+            time.sleep(0.02)  # simulate lazy WASM instantiation
+            self.loaded.add(path)
+        if path.endswith("/boom"):
+            raise RuntimeError("route failed to instantiate")
+        return Response(status=self.statuses.get(path, 200))
+
+    def dispatch(self, request):  # pragma: no cover - warm must not issue writes
+        raise AssertionError(f"unexpected dispatch {request}")
+
+
+class Example(tc.Library):
+    @tc.get
+    def hello(self) -> tc.String:
+        ...
+
+    @tc.get(name="greet")
+    def greeting(self, name: str) -> tc.String:
+        ...
+
+    @tc.post
+    def reset(self):
+        ...
+
+
+def test_warm_reports_cold_and_warm_timings():
+    dependency = tc.uri.library(publisher="example-devco", name="dep", version="0.1.0")
+    lib = Example(
+        publisher="example-devco", name="example", version="0.1.0", dependencies=(dependency,)
+    )
+    kernel = _Kernel(statuses={lib.route("greet"): 400})
+
+    report = tc.kernel.warm(kernel, lib, bearer_token="token")
+
+    assert [route.path for route in report.routes] == [
+        lib.id().path,
+        dependency.path,
+        lib.route("hello"),
+        lib.route("greet"),
+    ]
+    assert report.skipped == [lib.route("reset")]
+    assert all(call[0] == "GET" and call[2] == "token" for call in kernel.calls)
+    assert len(kernel.calls) == 8
+
+    for route in report.routes:
+        assert route.cold_seconds > route.warm_seconds
+        assert route.speedup > 1
+    assert report.routes[-1].status == 400
+    assert report.ready
+
+
+def test_warm_records_failures_and_is_not_ready():
+    class Broken(tc.define.Library):
+        @tc.define.get
+        def boom(self):
+            return "boom"
+
+    lib = Broken(publisher="example-devco", name="broken", version="0.1.0")
+
+    report = tc.kernel.warm(_Kernel(), lib)
+
+    assert isinstance(report.routes[-1].error, RuntimeError)
+    assert report.routes[-1].speedup is None
+    assert not report.ready
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import RawResponse, Response
+
+
+class _Vector:
+    def __init__(self, values: list[float]):
+        self._values = values
+
+    def tolist(self) -> list[float]:
+        return list(self._values)
+
+
+def test_json_default_converts_array_likes():
+    payload = json.dumps({"x": _Vector([1.0, 2.5])}, default=tc.ndarray.json_default)
+    assert json.loads(payload) == {"x": [1.0, 2.5]}
+
+    with pytest.raises(TypeError):
+        json.dumps({"x": object()}, default=tc.ndarray.json_default)
+
+
+def test_is_ndarray_does_not_need_numpy():
+    assert not tc.ndarray.is_ndarray([1, 2, 3])
+    assert not tc.ndarray.is_ndarray(_Vector([]))
+
+
+def test_ndarray_round_trip_through_json():
+    np = pytest.importorskip("numpy")
+
+    array = np.arange(12, dtype=np.float64).reshape(3, 4)
+    assert tc.ndarray.is_ndarray(array)
+    assert json.loads(tc.ndarray.dumps(array)) == array.tolist()
+    assert json.loads(tc.ndarray.dumps(array.T)) == array.T.tolist()
+
+    response = Response({"/state/scalar/value/tuple": array.tolist()})
+    decoded = tc.ndarray.decode_json_body(response, dtype=np.float32)
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, array)
+
+
+def test_ndarray_decodes_binary_buffers_without_copying():
+    np = pytest.importorskip("numpy")
+
+    raw = bytearray(np.arange(6, dtype=np.float32).tobytes())
+    decoded = tc.ndarray.decode_json_body(RawResponse(raw), dtype=np.float32, shape=(2, 3))
+
+    np.testing.assert_array_equal(decoded, np.arange(6, dtype=np.float32).reshape(2, 3))
+    raw[:4] = np.float32(42).tobytes()
+    assert decoded[0, 0] == 42
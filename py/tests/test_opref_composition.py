@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Handle, Response
+
+
+class _Kernel:
+    """Records the JSON body of each call, as the kernel would receive it."""
+
+    def __init__(self):
+        self.bodies: list[object] = []
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.bodies.append(None if body is None else json.loads(body.payload))
+        return Response("Hello, World!")
+
+
+class B(tc.Library):
+    @tc.define.get
+    def hello(self, name) -> tc.String:
+        ...
+
+    @tc.define.post
+    def store(self, body):
+        ...
+
+    @tc.define.delete
+    def drop(self, key):
+        ...
+
+
+class A(tc.Library):
+    @tc.define.get
+    def from_b(self, greeting) -> tc.String:
+        ...
+
+
+B_LIB = B(publisher="example-devco", name="b", version="0.1.0")
+A_LIB = A(publisher="example-devco", name="a", version="0.1.0")
+
+
+@pytest.fixture(autouse=True)
+def state_handle(monkeypatch):
+    monkeypatch.setitem(vars(tc), "StateHandle", Handle)
+
+
+def test_a_chain_of_refs_is_one_kernel_request():
+    kernel = _Kernel()
+    hello = B_LIB.hello
+    chain = A_LIB.from_b({"greeting": hello(hello("World")), "n": 2})
+
+    with tc.backend(kernel, cache=tc.ResponseCache()):
+        assert tc.execute(chain) == "Hello, World!"
+        # Nested refs may read state which the cache cannot see, so chains are never cached.
+        assert tc.execute(chain) == "Hello, World!"
+
+    hello_path = hello("World").op.path
+    assert kernel.bodies == [
+        {"greeting": {hello_path: [{hello_path: ["World"]}]}, "n": 2},
+    ] * 2
+
+
+def test_each_method_has_a_tcref_form():
+    get = B_LIB.hello("World").op
+    assert json.loads(get.to_json()) == {get.path: ["World"]}
+    assert json.loads(tc.OpRef("GET", get.path).to_json()) == {get.path: []}
+
+    put = tc.OpRef("PUT", tc.uri.state(namespace="scalar", path=["value"]), body=get)
+    assert json.loads(put.to_json()) == {put.path: [None, {get.path: ["World"]}]}
+
+    post = B_LIB.store({"name": B_LIB.hello("World")})
+    assert json.loads(post.to_json()) == {post.path: {"name": {get.path: ["World"]}}}
+
+    delete = B_LIB.drop("World")
+    assert json.loads(delete.to_json()) == {tc.opref.DELETE_SUBJECT: [delete.path, "World"]}
+
+    with pytest.raises(TypeError, match="map body"):
+        tc.OpRef("GET", get.path, body=B_LIB.store(["not", "a", "map"])).to_json()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+DEP = tc.uri.library(publisher="example-devco", name="b", version="0.1.0")
+
+
+class _Replica:
+    """A kernel routed to one replica, answering after `delay` seconds."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, gate=None):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.gate = gate
+        self.calls = 0
+        self.done = threading.Event()
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.calls += 1
+        try:
+            time.sleep(self.delay)
+            if self.gate is not None:
+                self.gate.wait(5)
+            if self.fail:
+                raise RuntimeError(f"{self.name} is down")
+            return Response(self.name)
+        finally:
+            self.done.set()
+
+    def dispatch(self, request):
+        self.calls += 1
+        return Response(self.name)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def hello(self) -> tc.String:
+        ...
+
+
+def _router(replicas: dict[str, _Replica], **kwargs) -> tc.routing.ReplicaRouter:
+    routes = tc.RoutingTable({DEP.path: list(replicas)})
+    return tc.routing.ReplicaRouter(
+        routes, lambda _prefix, authority: replicas[authority], **kwargs
+    )
+
+
+def _dependency() -> Lib:
+    return Lib(publisher="example-devco", name="b", version="0.1.0")
+
+
+def test_latency_tracker_ranks_by_ewma_and_decays():
+    clock = _Clock()
+    tracker = tc.routing.LatencyTracker(alpha=0.5, half_life=10.0, clock=clock)
+
+    tracker.observe("slow", 0.4)
+    tracker.observe("fast", 0.1)
+    assert tracker.rank(["slow", "fast", "new"]) == ["new", "fast", "slow"]
+
+    tracker.observe("fast", 0.3)
+    assert tracker.estimate("fast") == pytest.approx(0.2)
+
+    tracker.failure("fast")
+    assert tracker.rank(["slow", "fast"]) == ["slow", "fast"]
+
+    clock.now = 100.0
+    assert tracker.estimate("slow") < 0.001
+
+
+def test_executor_prefers_the_faster_replica():
+    replicas = {"a:8702": _Replica("a", delay=0.03), "b:8702": _Replica("b", delay=0.0)}
+    router = _router(replicas)
+    local = _Replica("local")
+
+    with tc.backend(local, replicas=router):
+        # The first two calls measure each replica; after that, the faster one wins.
+        answers = [tc.execute(_dependency().hello()) for _ in range(6)]
+        assert tc.execute(tc.OpRef("GET", "/lib/example-devco/other/0.1.0/x")) == "local"
+
+    assert answers[2:] == ["b"] * 4
+    assert replicas["a:8702"].calls == 1
+    assert local.calls == 1
+
+
+def test_hedged_get_takes_the_first_answer():
+    replicas = {"a:8702": _Replica("a", delay=0.5), "b:8702": _Replica("b", delay=0.0)}
+    router = _router(replicas, hedge_after=0.02)
+
+    start = time.perf_counter()
+    with tc.backend(_Replica("local"), replicas=router):
+        assert tc.execute(_dependency().hello()) == "b"
+    assert time.perf_counter() - start < 0.4
+    assert router.hedged == 1
+
+    replicas["a:8702"].done.wait(timeout=2)
+    assert router.tracker.rank(list(replicas)) == ["b:8702", "a:8702"]
+
+
+def test_hedging_fails_over_when_the_primary_errors():
+    replicas = {"a:8702": _Replica("a", fail=True), "b:8702": _Replica("b")}
+    router = _router(replicas, hedge_after=5.0)
+
+    start = time.perf_counter()
+    with tc.backend(_Replica("local"), replicas=router):
+        assert tc.execute(_dependency().hello()) == "b"
+    assert time.perf_counter() - start < 1.0
+    assert router.hedged == 0
+
+
+def test_writes_are_never_hedged():
+    replicas = {"a:8702": _Replica("a", delay=0.05), "b:8702": _Replica("b")}
+    router = _router(replicas, hedge_after=0.0)
+
+    def dispatch(_authority, kernel):
+        return kernel.dispatch(None)
+
+    assert router.call("PUT", router.replicas(DEP.path), dispatch).status == 200
+    assert replicas["a:8702"].calls + replicas["b:8702"].calls == 1
+
+
+def test_hedged_gets_end_at_the_deadline_and_never_queue_behind_hung_replicas():
+    gate = threading.Event()
+    hung = {"a:8702": _Replica("a", gate=gate), "b:8702": _Replica("b", gate=gate)}
+    router = _router(hung, hedge_after=0.0)
+    get = lambda _authority, kernel: kernel.resolve_get(DEP.path)  # noqa: E731
+
+    try:
+        # Each call leaves two attempts hung, more in total than a fixed pool of 32 workers.
+        for _ in range(20):
+            start = time.perf_counter()
+            with tc.deadline.scope(0.02), pytest.raises(tc.DeadlineExceeded):
+                router.call("GET", router.replicas(DEP.path), get)
+            assert time.perf_counter() - start < 0.5
+
+        healthy = _router({"c:8702": _Replica("c"), "d:8702": _Replica("d")}, hedge_after=0.0)
+        with tc.deadline.scope(1.0):
+            assert healthy.call("GET", healthy.replicas(DEP.path), get).status == 200
+    finally:
+        gate.set()
+
+
+def test_replicas_helper_lists_one_dependency_per_authority():
+    deps = tc.uri.replicas(DEP, "http://a:8702", tc.URI.parse("b:8702"))
+
+    assert [dep.path for dep in deps] == [DEP.path, DEP.path]
+    assert dict(tc.RoutingTable.from_dependencies(deps)) == {DEP.path: ("a:8702", "b:8702")}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+class _Kernel:
+    def __init__(self):
+        self.resolved: list[tuple[str, str | None]] = []
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.resolved.append((path, bearer_token))
+        return Response(len(self.resolved))
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Lib(tc.Library):
+    @tc.define.get
+    def versioned(self):
+        ...
+
+    @tc.define.get(cache=False)
+    def volatile(self):
+        ...
+
+
+def test_cache_reuses_lib_responses_per_identity():
+    kernel = _Kernel()
+    cache = tc.ResponseCache(maxsize=8)
+    lib = Lib(publisher="example-devco", name="cache", version="0.1.0")
+
+    with tc.backend(kernel, bearer_token="a", cache=cache):
+        assert tc.execute(lib.versioned()) == 1
+        assert tc.execute(lib.versioned()) == 1
+
+    with tc.backend(kernel, bearer_token="b", cache=cache):
+        assert tc.execute(lib.versioned()) == 2
+
+    assert len(kernel.resolved) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 8}
+
+
+def test_cache_respects_route_opt_out():
+    kernel = _Kernel()
+    cache = tc.ResponseCache()
+    lib = Lib(publisher="example-devco", name="cache", version="0.1.0")
+
+    with tc.backend(kernel, cache=cache):
+        assert tc.execute(lib.volatile()) == 1
+        assert tc.execute(lib.volatile()) == 2
+
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_opt_in_for_non_lib_paths():
+    cache = tc.ResponseCache()
+    state = tc.uri.state(namespace="demo", path=["users"])
+
+    assert not cache.accepts(tc.OpRef(method="GET", path=state))
+    assert cache.accepts(tc.OpRef(method="GET", path=state, cacheable=True))
+    assert not cache.accepts(tc.OpRef(method="PUT", path=state, cacheable=True))
+
+
+def test_cache_expires_entries_and_evicts_lru():
+    clock = _Clock()
+    cache = tc.ResponseCache(maxsize=2, ttl=10.0, clock=clock)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is tc.cache._MISS
+    assert cache.get("a") == 1
+
+    clock.now = 11.0
+    assert cache.get("a") is tc.cache._MISS
+    assert len(cache) == 1
+
+
+def test_cache_keys_on_canonical_body():
+    cache = tc.ResponseCache()
+    path = tc.uri.library(publisher="example-devco", name="cache", version="0.1.0").path
+
+    a = cache.key(tc.OpRef(method="GET", path=path, body={"x": 1, "y": 2}), None)
+    b = cache.key(tc.OpRef(method="GET", path=path, body={"y": 2, "x": 1}), None)
+    assert a == b
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import types
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Request, Response
+
+A = tc.uri.library(publisher="example-devco", name="a", version="0.1.0")
+B = tc.uri.library(publisher="example-devco", name="b", version="0.1.0")
+
+
+def test_routing_table_uses_longest_segment_prefix():
+    table = tc.routing.RoutingTable(
+        {
+            "/lib/example-devco": ["fallback:8702"],
+            A.path: ["a1:8702", "a2:8702"],
+        }
+    )
+
+    assert table.resolve(A.path) == (A.path, ("a1:8702", "a2:8702"))
+    assert table.authorities(f"{A.path}/hello") == ("a1:8702", "a2:8702")
+    assert table.authorities(f"{A.path}.1/hello") == ("fallback:8702",)
+    assert table.authorities(B.path) == ("fallback:8702",)
+    assert table.resolve("/lib/other/a/0.1.0") is None
+    assert table.prefixes() == [A.path, "/lib/example-devco"]
+
+    with pytest.raises(ValueError):
+        table.add("/", "host:1")
+
+
+def test_routing_table_from_dependencies_groups_replicas():
+    deps = (
+        tc.URI.parse(f"http://a1:8702{A.path}"),
+        tc.URI.parse(f"http://a2:8702{A.path}"),
+        tc.URI.parse(f"http://a1:8702{A.path}"),
+        tc.URI.parse(f"http://b:8702{B.path}"),
+        tc.uri.library(publisher="example-devco", name="local", version="0.1.0"),
+    )
+
+    table = tc.routing.RoutingTable.from_dependencies(deps)
+
+    assert dict(table) == {A.path: ("a1:8702", "a2:8702"), B.path: ("b:8702",)}
+    assert json.loads(table.to_json()) == [
+        {"prefix": A.path, "authorities": ["a1:8702", "a2:8702"]},
+        {"prefix": B.path, "authorities": ["b:8702"]},
+    ]
+
+
+class _RouteKernel:
+    def __init__(self, route):
+        self.route = route
+        self.paths = []
+
+    def dispatch(self, request):
+        self.paths.append(request.path)
+        return Response(status=200)
+
+    def resolve_get(self, path, body=None, bearer_token=None):
+        self.paths.append(path)
+        return Response(status=200)
+
+
+@pytest.fixture
+def kernel_handle(monkeypatch):
+    calls = []
+
+    def constructor(name):
+        def build(*args, data_dir):
+            calls.append((name, args))
+            return _RouteKernel(args[1:])
+
+        return staticmethod(build)
+
+    handle = type(
+        "KernelHandle",
+        (),
+        {
+            "with_library_schema_and_dependency_route": constructor("single"),
+        },
+    )
+    monkeypatch.setitem(vars(tc), "KernelHandle", handle)
+    monkeypatch.setitem(sys.modules, "tinychain_local", types.SimpleNamespace(KernelHandle=handle))
+    yield handle, calls
+    tc.kernel.registry.close()
+
+
+def test_for_library_routes_every_dependency(tmp_path: pathlib.Path, kernel_handle):
+    _handle, calls = kernel_handle
+    lib = tc.Library(
+        publisher="example-devco",
+        name="local",
+        version="0.1.0",
+        dependencies=(
+            tc.URI.parse(f"http://a1:8702{A.path}"),
+            tc.URI.parse(f"http://a2:8702{A.path}"),
+            tc.URI.parse(f"http://b:8702{B.path}"),
+        ),
+    )
+
+    kernel = tc.kernel.for_library(lib, data_dir=tmp_path)
+    assert isinstance(kernel, tc.kernel.RoutedKernel)
+    assert kernel.route == (A.path, "a1:8702")
+
+    kernel.dispatch(Request("PUT", f"{B.path}/item", [], None))
+    kernel.resolve_get(f"{A.path}/hello")
+    kernel.resolve_get("/lib/example-devco/local/0.1.0/hello")
+
+    assert kernel.replicas._kernels[(B.path, "b:8702")].paths == [f"{B.path}/item"]
+    assert kernel.kernel.paths == [f"{A.path}/hello", "/lib/example-devco/local/0.1.0/hello"]
+    assert [args[1:] for _name, args in calls] == [
+        (A.path, "a1:8702"),
+        (B.path, "b:8702"),
+        (A.path, "a2:8702"),
+    ]
+
+    single = tc.kernel.for_library(lib, data_dir=tmp_path, dependency=lib.dependencies[2])
+    assert single is kernel.replicas._kernels[(B.path, "b:8702")]
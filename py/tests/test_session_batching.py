@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Handle, Request, Response
+
+
+class _Kernel:
+    """Records every request as `(method, path, body)`."""
+
+    def __init__(self):
+        self.log: list[tuple] = []
+
+    @staticmethod
+    def _entry(method, path, body):
+        return (method, path, None if body is None else json.loads(body.payload))
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        self.log.append(self._entry("GET", path, body))
+        return Response(path)
+
+    def dispatch(self, request):
+        self.log.append(self._entry(request.method, request.path, request.body))
+        return Response(status=204)
+
+
+@pytest.fixture(autouse=True)
+def local_types(monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelRequest", Request)
+    monkeypatch.setitem(vars(tc), "StateHandle", Handle)
+
+
+def _put(path: str, value: object) -> tc.OpRef:
+    return tc.OpRef("PUT", path, body=value)
+
+
+def test_writes_are_coalesced_and_sent_on_commit():
+    kernel = _Kernel()
+
+    with tc.backend(kernel):
+        with tc.session() as session:
+            for i in range(1000):
+                assert tc.execute(_put(f"/state/scalar/{i % 10}", i)) is None
+            assert kernel.log == [] and len(session) == 10
+
+    assert kernel.log == [("PUT", f"/state/scalar/{i}", 990 + i) for i in range(10)]
+    assert (session.queued, session.coalesced, session.commits) == (1000, 990, 1)
+
+
+def test_puts_do_not_coalesce_across_other_writes():
+    kernel = _Kernel()
+
+    with tc.backend(kernel), tc.session():
+        tc.execute_many([
+            _put("/state/scalar/a", 1),
+            tc.OpRef("POST", "/lib/example-devco/a/0.1.0/use_a", body={"x": 1}),
+            _put("/state/scalar/a", 2),
+            _put("/state/scalar/a", 3),
+        ])
+
+    assert kernel.log == [
+        ("PUT", "/state/scalar/a", 1),
+        ("POST", "/lib/example-devco/a/0.1.0/use_a", {"x": 1}),
+        ("PUT", "/state/scalar/a", 3),
+    ]
+
+
+def test_reads_of_pending_writes_commit_first():
+    kernel = _Kernel()
+
+    with tc.backend(kernel), tc.session() as session:
+        tc.execute(_put("/state/scalar/a/b", 1))
+        tc.execute(tc.OpRef("GET", "/state/scalar/c"))
+        assert kernel.log == [("GET", "/state/scalar/c", None)]
+
+        assert tc.execute(tc.OpRef("GET", "/state/scalar/a")) == "/state/scalar/a"
+        assert kernel.log[1:] == [("PUT", "/state/scalar/a/b", 1), ("GET", "/state/scalar/a", None)]
+        assert len(session) == 0
+
+
+def test_failed_block_discards_and_disabled_session_is_per_request():
+    kernel = _Kernel()
+
+    with tc.backend(kernel):
+        with pytest.raises(RuntimeError):
+            with tc.session():
+                tc.execute(_put("/state/scalar/a", 1))
+                raise RuntimeError("abort")
+
+        with tc.session(enabled=False) as session:
+            assert session is None
+            tc.execute(_put("/state/scalar/a", 1))
+            tc.execute(_put("/state/scalar/a", 2))
+
+    assert kernel.log == [("PUT", "/state/scalar/a", 1), ("PUT", "/state/scalar/a", 2)]
+
+
+def test_nested_sessions_join_and_send_writes_in_order_on_commit():
+    kernel = _Kernel()
+
+    with tc.backend(kernel) as executor:
+        with tc.session(executor) as outer:
+            tc.execute(_put("/state/scalar/a", 1))
+            with tc.session(executor) as inner:
+                assert inner is outer
+                tc.execute(tc.OpRef("DELETE", "/state/scalar/b"))
+                tc.execute(_put("/state/scalar/a", 2))
+            assert kernel.log == []
+
+            assert [response.status for response in outer.commit()] == [204, 204, 204]
+            tc.execute(_put("/state/scalar/c", 3))
+
+    assert kernel.log == [
+        ("PUT", "/state/scalar/a", 1),
+        ("DELETE", "/state/scalar/b", None),
+        ("PUT", "/state/scalar/a", 2),
+        ("PUT", "/state/scalar/c", 3),
+    ]
+
+
+class _FailingKernel(_Kernel):
+    """Answers 500 for `.../bad` and raises for `.../boom`."""
+
+    def dispatch(self, request):
+        response = super().dispatch(request)
+        if request.path.endswith("/boom"):
+            raise RuntimeError("connection reset")
+        if request.path.endswith("/bad"):
+            return Response(status=500)
+        return response
+
+
+def test_a_failed_write_fails_the_commit_and_names_the_unsent_writes():
+    kernel = _FailingKernel()
+
+    with tc.backend(kernel):
+        with pytest.raises(tc.CommitError, match=r"PUT /state/scalar/bad \(status 500\)") as err:
+            with tc.session():
+                tc.execute(_put("/state/scalar/a", 1))
+                tc.execute(_put("/state/scalar/bad", 2))
+                tc.execute(_put("/state/scalar/c", 3))
+
+        assert [response.status for response in err.value.responses] == [204]
+        assert [opref.path for opref in err.value.unsent] == ["/state/scalar/c"]
+        assert [path for _method, path, _body in kernel.log] == ["/state/scalar/a", "/state/scalar/bad"]
+
+        with pytest.raises(tc.CommitError, match="RuntimeError: connection reset") as err:
+            with tc.session():
+                tc.execute(_put("/state/scalar/boom", 1))
+        assert err.value.unsent == []
+
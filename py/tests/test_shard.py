@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+import tinychain as tc
+
+HOSTS = ["http://a:8702", "http://b:8702", "http://c:8702", "http://d:8702"]
+
+
+def _keys(count: int) -> list:
+    return [*range(count // 2), *(f"user-{i}" for i in range(count // 2))]
+
+
+def test_keys_map_to_host_authorities_deterministically():
+    ring = tc.shard.HashRing(HOSTS)
+    again = tc.shard.HashRing(reversed(HOSTS))
+    keys = _keys(1000)
+
+    assert ring.assign(keys) == again.assign(keys)
+    assert ring.assign(keys) == [ring.host(key) for key in keys]
+    assert {host.authority() for host in ring.assign(keys)} == {"a:8702", "b:8702", "c:8702", "d:8702"}
+    assert tc.shard.key_hash(1) != tc.shard.key_hash("1")
+    assert tc.shard.key_hash((1, "x")) == tc.shard.key_hash([1, "x"])
+
+
+def test_joining_and_leaving_move_only_a_fair_share_of_keys():
+    ring = tc.shard.HashRing(HOSTS)
+    keys = _keys(20_000)
+    before = ring.assign(keys)
+
+    ring.add("e:8702")
+    joined = ring.assign(keys)
+    moved = [(old, new) for old, new in zip(before, joined) if old != new]
+    assert all(new.authority() == "e:8702" for _old, new in moved)
+    assert 0.12 < len(moved) / len(keys) < 0.28
+
+    ring.remove("http://b:8702")
+    left = ring.assign(keys)
+    moved = [(old, new) for old, new in zip(joined, left) if old != new]
+    assert all(old.authority() == "b:8702" for old, _new in moved)
+    assert "b:8702" not in {host.authority() for host in left}
+
+
+def test_weights_scale_ownership():
+    ring = tc.shard.HashRing({"a:8702": 1.0, "b:8702": 3.0}, vnodes=256)
+
+    shares = {host.authority(): share for host, share in ring.ownership().items()}
+    assert sum(shares.values()) == pytest.approx(1.0)
+    assert 0.65 < shares["b:8702"] < 0.85
+
+    assigned = [host.authority() for host in ring.assign(_keys(10_000))]
+    assert 0.65 < assigned.count("b:8702") / len(assigned) < 0.85
+
+
+def test_partition_and_locate():
+    ring = tc.shard.HashRing(HOSTS)
+    keys = _keys(200)
+
+    groups = ring.partition(keys)
+    assert sorted(key for group in groups.values() for key in group if isinstance(key, int)) == list(range(100))
+    for host, group in groups.items():
+        assert all(ring.host(key) == host for key in group)
+
+    located = ring.locate("user-7", namespace="collection", path=["users"])
+    assert located.path == tc.uri.state(namespace="collection", path=["users"])
+    assert located.authority() == ring.host("user-7").authority()
+    assert str(located).startswith("http://")
+
+
+def test_numpy_integer_keys_are_assigned_in_bulk():
+    np = pytest.importorskip("numpy")
+    ring = tc.shard.HashRing(HOSTS)
+    keys = np.arange(-500, 500, dtype=np.int64)
+
+    expected = [ring.host(int(key)) for key in keys]
+    assert ring.assign(keys) == expected
+
+    groups = ring.partition(keys)
+    assert sum(len(group) for group in groups.values()) == len(keys)
+    for host, group in groups.items():
+        assert all(ring.host(int(key)) == host for key in group)
+
+
+def test_empty_ring_and_bad_hosts_are_rejected():
+    ring = tc.shard.HashRing()
+    with pytest.raises(LookupError):
+        ring.host("x")
+    with pytest.raises(ValueError):
+        ring.add("/state/collection")
+    with pytest.raises(ValueError):
+        ring.add("a:8702", weight=0)
+    with pytest.raises(KeyError):
+        ring.remove("a:8702")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Handle, Response
+
+HOSTS = ["http://a:8702", "http://b:8702", "http://c:8702"]
+
+
+class _Shard:
+    """Serves a sorted list of rows in pages, honouring `limit`, `after` and a `[start, end)` range."""
+
+    def __init__(self, rows: list, delay: float = 0.0, key=lambda row: row):
+        self.rows = sorted(rows, key=key)
+        self.delay = delay
+        self.key = key
+        self.pages: list[dict] = []
+        self._lock = threading.Lock()
+
+    def resolve_get(self, path: str, body=None, bearer_token=None):
+        page = json.loads(body.payload)
+        with self._lock:
+            self.pages.append(page)
+        time.sleep(self.delay)
+
+        rows = self.rows
+        if "range" in page:
+            start, end = page["range"]
+            rows = [row for row in rows if start <= self.key(row) < end]
+        if "after" in page:
+            rows = [row for row in rows if self.key(row) > page["after"]]
+        return Response(rows[: page["limit"]])
+
+
+@pytest.fixture(autouse=True)
+def state_handle(monkeypatch):
+    monkeypatch.setitem(vars(tc), "StateHandle", Handle)
+
+
+def _shards(count: int = 300, **kwargs) -> dict[str, _Shard]:
+    ring = tc.shard.HashRing(HOSTS)
+    groups = ring.partition(list(range(count)))
+    return {host.authority(): _Shard(groups.get(host, []), **kwargs) for host in ring.hosts}
+
+
+def _scan(shards: dict[str, _Shard], **kwargs):
+    kwargs.setdefault("namespace", "collection")
+    with tc.backend(object()):
+        return list(
+            tc.shard.scan(
+                [f"http://{authority}" for authority in shards],
+                connect=lambda host: shards[host.authority()],
+                **kwargs,
+            )
+        )
+
+
+def test_scan_merges_every_shard_in_key_order():
+    shards = _shards()
+
+    assert _scan(shards, path=["numbers"], page_size=16) == list(range(300))
+    for shard in shards.values():
+        assert [page["limit"] for page in shard.pages] == [16] * (len(shard.rows) // 16 + 1)
+        assert "after" not in shard.pages[0]
+
+
+def test_range_body_and_key_function_are_passed_through():
+    key = lambda row: row["id"]  # noqa: E731
+    rows = [{"id": i, "name": f"user-{i}"} for i in range(60)]
+    shards = {
+        "a:8702": _Shard(rows[0::2], key=key),
+        "b:8702": _Shard(rows[1::2], key=key),
+    }
+
+    result = _scan(shards, body={"range": [10, 40]}, key=key, page_size=4)
+
+    assert [row["id"] for row in result] == list(range(10, 40))
+    assert all(page["range"] == [10, 40] for shard in shards.values() for page in shard.pages)
+
+
+def test_limit_stops_fetching_early():
+    shards = _shards(3000)
+
+    assert _scan(shards, limit=25, page_size=100) == list(range(25))
+    # No shard is asked for more rows than the limit, so each one answers a single page.
+    assert all([page["limit"] for page in shard.pages] == [25] for shard in shards.values())
+
+
+def test_first_pages_are_fetched_concurrently():
+    shards = _shards(delay=0.1)
+
+    start = time.perf_counter()
+    assert _scan(shards, page_size=1000) == list(range(300))
+    assert time.perf_counter() - start < 0.25
+
+
+def test_scan_timeout_and_early_close():
+    shards = _shards(delay=0.5)
+    with pytest.raises(tc.DeadlineExceeded):
+        _scan(shards, timeout=0.05)
+
+    shards = _shards(count=3000)
+    with tc.backend(object()):
+        rows = tc.shard.scan(
+            [f"http://{authority}" for authority in shards],
+            namespace="collection",
+            connect=lambda host: shards[host.authority()],
+            page_size=10,
+        )
+        assert [next(rows) for _ in range(5)] == list(range(5))
+        rows.close()
+
+    assert all(len(shard.pages) <= 2 for shard in shards.values())
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import threading
+import types
+
+import pytest
+
+import tinychain as tc
+
+from .fakes import Response
+
+
+def _schema(name: str) -> dict:
+    return {
+        "id": tc.uri.library(publisher="example-devco", name=name, version="0.1.0").path,
+        "version": "0.1.0",
+        "dependencies": [],
+    }
+
+
+class _Kernel:
+    def __init__(self, data_dir: str, fail: frozenset = frozenset()) -> None:
+        self.data_dir = pathlib.Path(data_dir)
+        self.fail = fail
+        self.installed: list[str] = []
+
+    def dispatch(self, request):
+        _method, _path, _headers, payload = request
+        lib_id = json.loads(payload)["schema"]["id"]
+        if lib_id in self.fail:
+            return Response(status=400)
+        self.installed.append(lib_id)
+        self.data_dir.joinpath(*lib_id.strip("/").split("/")).mkdir(parents=True, exist_ok=True)
+        return Response(status=204)
+
+
+@pytest.fixture
+def local(monkeypatch):
+    kernels: list[_Kernel] = []
+    encoders: set[str] = set()
+
+    def state_handle(payload):
+        encoders.add(threading.current_thread().name)
+        return payload
+
+    def local_kernel(*_args, data_dir):
+        kernels.append(_Kernel(data_dir))
+        return kernels[-1]
+
+    module = types.SimpleNamespace(
+        KernelHandle=types.SimpleNamespace(
+            local=local_kernel,
+            with_library_schema_rjwt=local_kernel,
+            with_library_schema_and_dependency_route=local_kernel,
+        ),
+        KernelRequest=lambda method, path, headers, body: (method, path, headers, body),
+        StateHandle=state_handle,
+        kernels=kernels,
+        encoders=encoders,
+    )
+    monkeypatch.delenv("TC_TOKEN_HOST", raising=False)
+    monkeypatch.setitem(sys.modules, "tinychain_local", module)
+    yield module
+    tc.kernel.registry.close()
+
+
+def _write_library(directory: pathlib.Path, name: str) -> None:
+    (directory / f"{name}.json").write_text(json.dumps(_schema(name)), encoding="utf-8")
+    (directory / f"{name}.wasm").write_bytes(b"\0asm" + name.encode())
+
+
+def test_install_many_reuses_one_kernel_and_keeps_order(tmp_path: pathlib.Path, local):
+    source = tmp_path / "libs"
+    source.mkdir()
+    names = [f"lib{i:02}" for i in range(12)]
+    for name in names:
+        _write_library(source, name)
+
+    results = tc.wasm.install_many(source, data_dir=tmp_path / "data", max_workers=4)
+
+    assert len(local.kernels) == 1
+    assert local.kernels[0].installed == [_schema(name)["id"] for name in names]
+    assert all(result.ok and not result.skipped for result in results)
+    assert all(name.startswith("tinychain-install") for name in local.encoders)
+
+    again = tc.wasm.install_many(source, data_dir=tmp_path / "data", max_workers=4)
+    assert all(result.skipped for result in again)
+    assert len(local.kernels) == 1
+    assert len(local.kernels[0].installed) == len(names)
+
+
+def test_install_many_reports_failures_without_aborting(tmp_path: pathlib.Path, local):
+    for name in ("a", "b", "c"):
+        _write_library(tmp_path, name)
+    (tmp_path / "b.wasm").write_bytes(b"")
+
+    kernel = _Kernel(str(tmp_path / "data"), fail=frozenset({_schema("c")["id"]}))
+    manifest = tmp_path / "libraries.json"
+    manifest.write_text(
+        json.dumps([{"schema": f"{name}.json", "wasm": f"{name}.wasm"} for name in "abc"]),
+        encoding="utf-8",
+    )
+
+    results = tc.wasm.install_many(manifest, kernel=kernel, data_dir=tmp_path / "data")
+
+    assert [result.ok for result in results] == [True, False, False]
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[2].error is None and results[2].response.status == 400
+    assert kernel.installed == [_schema("a")["id"]]
+    assert all(result.prepare_seconds >= 0 for result in results)
+
+
+def test_an_install_drops_handles_hydrated_before_it(tmp_path: pathlib.Path, local, monkeypatch):
+    monkeypatch.setitem(vars(tc), "KernelHandle", local.KernelHandle)
+    _write_library(tmp_path, "a")
+    data_dir = tmp_path / "data"
+    consumer = tc.Library(
+        publisher="example-devco",
+        name="consumer",
+        version="0.1.0",
+        dependencies=(tc.URI.parse(f"http://a:8702{_schema('a')['id']}"),),
+    )
+
+    before = tc.kernel.for_library(consumer, data_dir=data_dir)
+    assert tc.kernel.for_library(consumer, data_dir=data_dir) is before
+
+    tc.wasm.install(tmp_path / "a.json", tmp_path / "a.wasm", data_dir=data_dir, force=True)
+    after = tc.kernel.for_library(consumer, data_dir=data_dir)
+    assert after is not before
+    assert tc.kernel.registry.local(data_dir).installed == [_schema("a")["id"]]
+
+
+def test_install_many_does_not_cache_rjwt_kernels(tmp_path: pathlib.Path, local, monkeypatch):
+    monkeypatch.setenv("TC_TOKEN_HOST", "http://auth")
+    monkeypatch.setenv("TC_ACTOR_ID", "installer")
+    monkeypatch.setenv("TC_PUBLIC_KEY_B64", "a2V5")
+    for name in ("a", "b", "c"):
+        _write_library(tmp_path, name)
+
+    results = tc.wasm.install_many(tmp_path, data_dir=tmp_path / "data")
+
+    assert all(result.ok for result in results)
+    assert [kernel.installed for kernel in local.kernels] == [[_schema(n)["id"]] for n in "abc"]
+    assert len(tc.kernel.registry) == 0
+
+
+def test_discover_requires_a_schema_per_binary(tmp_path: pathlib.Path):
+    (tmp_path / "orphan.wasm").write_bytes(b"\0asm")
+
+    with pytest.raises(ValueError, match="orphan.json"):
+        tc.wasm.discover(tmp_path)
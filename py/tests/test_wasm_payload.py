@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import base64
+import json
+import pathlib
+
+import pytest
+
+import tinychain as tc
+
+SCHEMA = {
+    "id": tc.uri.library(publisher="example-devco", name="example", version="0.1.0").path,
+    "version": "0.1.0",
+    "dependencies": [],
+}
+
+
+def _legacy_payload(schema: dict, data: bytes) -> str:
+    return json.dumps(
+        {
+            "schema": schema,
+            "artifacts": [
+                {
+                    "path": "/lib/wasm",
+                    "content_type": "application/wasm",
+                    "bytes": base64.b64encode(data).decode("ascii"),
+                }
+            ],
+        },
+        separators=(",", ":"),
+    )
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 1000, 3 * 1024 + 1])
+def test_install_payload_matches_single_shot_encoding(tmp_path: pathlib.Path, size: int):
+    data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+    artifact = tmp_path / "library.wasm"
+    artifact.write_bytes(data)
+
+    expected = _legacy_payload(SCHEMA, data)
+    assert tc.wasm.install_payload(SCHEMA, artifact) == expected
+
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA), encoding="utf-8")
+    chunks = tc.wasm.iter_install_payload(schema_path, artifact, chunk_size=3 * 7)
+    assert b"".join(chunks).decode("ascii") == expected
+
+
+def test_install_payload_rejects_empty_artifacts(tmp_path: pathlib.Path):
+    artifact = tmp_path / "empty.wasm"
+    artifact.write_bytes(b"")
+
+    with pytest.raises(RuntimeError, match="is empty"):
+        tc.wasm.install_payload(SCHEMA, artifact)
+
+
+def test_iter_install_payload_requires_aligned_chunks(tmp_path: pathlib.Path):
+    artifact = tmp_path / "library.wasm"
+    artifact.write_bytes(b"\0asm")
+
+    with pytest.raises(ValueError):
+        list(tc.wasm.iter_install_payload(SCHEMA, artifact, chunk_size=4))
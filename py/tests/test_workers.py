@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import tinychain as tc
+
+
+def test_elastic_pool_grows_per_blocked_task_and_shrinks_when_idle():
+    pool = tc.workers.ElasticPool("test-elastic", idle_timeout=0.05)
+    gate = threading.Event()
+
+    blocked = [pool.submit(gate.wait, 5) for _ in range(3)]
+    assert pool.submit(lambda: "free").result(timeout=1) == "free"
+    assert pool.workers == 4
+
+    gate.set()
+    assert all(future.result(timeout=1) for future in blocked)
+    deadline = time.monotonic() + 2
+    while pool.workers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.workers == 0
+
+
+def test_lazy_pool_starts_on_first_use_and_resizes():
+    pool = tc.workers.LazyPool("test-lazy", max_workers=1)
+    assert pool._pool is None
+
+    assert pool.submit(lambda: threading.current_thread().name).result().startswith("test-lazy")
+    first = pool.get()
+    pool.resize(4)
+    assert pool.get() is not first and pool.get()._max_workers == 4
+    pool.shutdown()
+
+    with pytest.raises(ValueError):
+        pool.resize(0)
@@ -1,27 +1,53 @@
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
+import importlib
+
+from .batch import CommitError, Session, session
+from .cache import ResponseCache
+from .metrics import Metrics
 from .library import Library
-from .executor import Executor, backend
+from . import decode as _decode
+from . import deadline
+from .deadline import DeadlineExceeded
+from . import executor as _executor
+from .executor import AsyncExecutor, Executor, abackend, backend
+from .executor import aexecute as _dispatch_aexecute
 from .executor import execute as _dispatch_execute
+from .executor import execute_many as _dispatch_execute_many
 from .opref import OpRef
+from .policy import CircuitOpenError, Policy
+from . import policy
 from .ref import Ref, String, Json
+from .routing import RoutingTable
+from . import routing
 from .uri import URI
-from . import define
-from . import kernel
 from . import uri
-from . import testing
-from . import wasm
+
+# Submodules which are not needed to build or execute refs load on first attribute access,
+# so `import tinychain` stays cheap for short-lived processes.
+_LAZY_SUBMODULES = frozenset({"define", "graph", "kernel", "manifest", "shard", "testing", "wasm"})
 
 # Convenience aliases: keep v1 ergonomics while keeping `tc.define.*` as the canonical home.
-get = define.get
-put = define.put
-post = define.post
-delete = define.delete
+_DEFINE_ALIASES = frozenset({"get", "put", "post", "delete"})
 
 __all__ = [
     "Library",
     "Executor",
     "backend",
+    "AsyncExecutor",
+    "abackend",
+    "ResponseCache",
+    "Metrics",
+    "RoutingTable",
+    "Policy",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "CommitError",
+    "Session",
+    "session",
+    "iter_response",
     "OpRef",
     "Ref",
     "String",
@@ -34,68 +60,131 @@ __all__ = [
     "post",
     "delete",
     "uri",
+    "routing",
+    "policy",
+    "deadline",
+    "shard",
+    "graph",
     "testing",
     "wasm",
 ]
 
 
-def execute(op: "OpRef | Ref") -> object:
-    response = _dispatch_execute(op)
+def _decode_response(response: object) -> object:
     status = getattr(response, "status", None)
     if status == 200:
-        return testing.decode_json_body(response)
+        return _decode.decode_json_body(response)
     if status == 204:
         return None
     raise AssertionError(f"unexpected status {status}")
 
+
+def _decode_observed(metrics: "Metrics | None", op: "OpRef | Ref", response: object) -> object:
+    if metrics is None:
+        return _decode_response(response)
+
+    opref = _executor._as_opref(op)
+    start = metrics.clock()
+    value = _decode_response(response)
+    metrics.observe(opref.method, opref.path, "decode", metrics.clock() - start)
+    return value
+
+
+def execute(op: "OpRef | Ref", *, timeout: "float | None" = None) -> object:
+    executor = _executor.current()
+    response = _dispatch_execute(op, executor=executor, timeout=timeout)
+    return _decode_observed(executor.metrics, op, response)
+
+
+async def aexecute(op: "OpRef | Ref", *, timeout: "float | None" = None) -> object:
+    executor = _executor.acurrent()
+    response = await _dispatch_aexecute(op, executor=executor, timeout=timeout)
+    return _decode_observed(executor.metrics, op, response)
+
+
+def iter_response(response: object) -> "Iterator[object]":
+    """
+    Decode a list or tuple response lazily, yielding one unwrapped element at a time.
+
+    This avoids materializing the whole parsed (and unwrapped) tree for very large responses.
+    """
+
+    status = getattr(response, "status", None)
+    if status == 204:
+        return iter(())
+    if status != 200:
+        raise AssertionError(f"unexpected status {status}")
+    return _decode.iter_json_body(response)
+
+
+def execute_many(ops: "Iterable[OpRef | Ref]", *, timeout: "float | None" = None) -> list[object]:
+    """Execute a batch of ops in the current executor; duplicate GETs share one decoded value."""
+
+    executor = _executor.current()
+    ops = list(ops)
+    decoded: dict[int, object] = {}
+    results = []
+    responses = _dispatch_execute_many(ops, executor=executor, timeout=timeout)
+    for op, response in zip(ops, responses):
+        # Deduplicated ops share a response object; decode each one only once.
+        key = id(response)
+        if key not in decoded:
+            decoded[key] = _decode_observed(executor.metrics, op, response)
+        results.append(decoded[key])
+    return results
+
 # Optional local (PyO3) backend. When installed, re-export its public classes at the top-level
 # so user code can keep `import tinychain as tc` (v1 ergonomics) while opting into in-process speed.
-try:  # pragma: no cover
-    import tinychain_local as local  # type: ignore
-
-    KernelHandle = local.KernelHandle
-    Backend = local.Backend
-    KernelRequest = local.KernelRequest
-    KernelResponse = local.KernelResponse
-    StateHandle = local.StateHandle
-    State = local.State
-    Scalar = local.Scalar
-    Collection = local.Collection
-    Tensor = local.Tensor
-    Value = local.Value
-
-    __all__ += [
-        "local",
-        "KernelHandle",
-        "Backend",
-        "KernelRequest",
-        "KernelResponse",
-        "StateHandle",
-        "State",
-        "Scalar",
-        "Collection",
-        "Tensor",
-        "Value",
-    ]
-except Exception:  # pragma: no cover
-    local = None
-
-
-def __getattr__(name: str):  # pragma: no cover
-    if name in {
-        "KernelHandle",
-        "Backend",
-        "KernelRequest",
-        "KernelResponse",
-        "StateHandle",
-        "State",
-        "Scalar",
-        "Collection",
-        "Tensor",
-        "Value",
-    }:
-        raise ImportError(
-            f"`tinychain.{name}` requires the optional local backend. "
-            "Install `tinychain-local` (or the equivalent extra) to enable PyO3 eager execution."
-        )
+# The extension module is only imported the first time one of these names is accessed.
+_LOCAL_EXPORTS = (
+    "KernelHandle",
+    "Backend",
+    "KernelRequest",
+    "KernelResponse",
+    "StateHandle",
+    "State",
+    "Scalar",
+    "Collection",
+    "Tensor",
+    "Value",
+)
+
+
+def _load_local() -> object:
+    try:  # pragma: no cover
+        import tinychain_local as local  # type: ignore
+    except Exception:  # pragma: no cover
+        local = None
+
+    globals()["local"] = local
+    if local is not None:
+        for name in _LOCAL_EXPORTS:
+            globals()[name] = getattr(local, name)
+    return local
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in _DEFINE_ALIASES:
+        value = getattr(importlib.import_module(".define", __name__), name)
+        globals()[name] = value
+        return value
+
+    if name == "local":
+        return _load_local()
+
+    if name in _LOCAL_EXPORTS:
+        if _load_local() is None:
+            raise ImportError(
+                f"`tinychain.{name}` requires the optional local backend. "
+                "Install `tinychain-local` (or the equivalent extra) to enable PyO3 eager execution."
+            )
+        return globals()[name]
+
     raise AttributeError(name)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_SUBMODULES, *_DEFINE_ALIASES, "local", *_LOCAL_EXPORTS})
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from .executor import AsyncExecutor, Executor
+
+_current: contextvars.ContextVar[Optional["Session"]] = contextvars.ContextVar(
+    "tinychain_session", default=None
+)
+
+
+class Queued:
+    """The response to a write queued in a session. The write is sent when the session commits."""
+
+    __slots__ = ()
+
+    status = 204
+    body = None
+
+    def __repr__(self) -> str:
+        return "Queued()"
+
+
+QUEUED = Queued()
+
+# The statuses `tc.execute` accepts for a write; anything else fails the commit.
+_OK = frozenset({200, 204})
+
+
+class CommitError(RuntimeError):
+    """
+    Raised by `Session.commit` when a write fails.
+
+    `failed` pairs the failed write's `OpRef` with its response, or with the exception it
+    raised. `responses` holds the responses of the writes sent before it, in order, and
+    `unsent` the `OpRef`s of the writes which were dropped without being sent.
+    """
+
+    def __init__(
+        self, failed: list[tuple[Any, object]], responses: list[object], unsent: list[Any]
+    ) -> None:
+        described = []
+        for opref, outcome in failed:
+            if isinstance(outcome, BaseException):
+                detail = f"{type(outcome).__name__}: {outcome}"
+            else:
+                detail = f"status {getattr(outcome, 'status', None)}"
+            described.append(f"{opref.method} {opref.path} ({detail})")
+        message = "session commit failed: " + ", ".join(described)
+        if unsent:
+            message += f"; {len(unsent)} later write(s) were not sent"
+        super().__init__(message)
+        self.failed = failed
+        self.responses = responses
+        self.unsent = unsent
+
+
+def _failed(response: object) -> bool:
+    return getattr(response, "status", None) not in _OK
+
+
+@dataclass(slots=True)
+class _Write:
+    opref: Any
+    body: Any
+    headers: Optional[list[tuple[str, str]]]
+
+
+def _overlaps(path: str, other: str) -> bool:
+    path, other = path.rstrip("/"), other.rstrip("/")
+    if len(path) > len(other):
+        path, other = other, path
+    return other == path or other.startswith(path + "/")
+
+
+class Session:
+    """
+    Buffers an executor's writes (PUT, POST and DELETE) and sends them together on `commit`.
+
+    A PUT replaces an earlier queued PUT to the same path (with the same headers) unless a POST
+    or DELETE was queued in between, so the last PUT wins without reordering the writes a POST
+    or DELETE could observe. A GET to a path overlapping a queued write commits the queue first,
+    so reads inside a session see its writes.
+
+    On commit the writes are sent one by one, in order, through the executor. They are not
+    atomic: the first one which fails stops the commit, and it and the writes after it are
+    reported by a `CommitError`, while the writes before it stay applied.
+    """
+
+    def __init__(self, executor: "Executor") -> None:
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._writes: list[Optional[_Write]] = []
+        self._puts: dict[tuple, int] = {}
+        self.queued = 0
+        self.coalesced = 0
+        self.commits = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._writes) - self._dropped()
+
+    def _dropped(self) -> int:
+        return sum(1 for write in self._writes if write is None)
+
+    def queue(self, opref: Any, body: Any, headers: Optional[list[tuple[str, str]]]) -> Queued:
+        write = _Write(opref, body, headers)
+        with self._lock:
+            self.queued += 1
+            if opref.method.upper() == "PUT":
+                key = (opref.path, opref.headers)
+                previous = self._puts.get(key)
+                if previous is not None:
+                    self._writes[previous] = None
+                    self.coalesced += 1
+                self._puts[key] = len(self._writes)
+            else:
+                # Later PUTs must not move ahead of a write which may observe them.
+                self._puts.clear()
+            self._writes.append(write)
+        return QUEUED
+
+    def pending(self, path: str) -> bool:
+        """Whether a queued write targets `path`, or a path above or below it."""
+
+        with self._lock:
+            return any(
+                write is not None and _overlaps(write.opref.path, path) for write in self._writes
+            )
+
+    def discard(self) -> None:
+        with self._lock:
+            self._writes.clear()
+            self._puts.clear()
+
+    def _take(self) -> list[_Write]:
+        with self._lock:
+            writes = [write for write in self._writes if write is not None]
+            self._writes.clear()
+            self._puts.clear()
+            return writes
+
+    def commit(self) -> list[object]:
+        """
+        Send every queued write and return their responses, in queue order. Raise `CommitError`
+        if any write fails (raises, or answers other than 200 or 204).
+        """
+
+        writes = self._take()
+        if not writes:
+            return []
+
+        from . import executor as _executor
+
+        self.commits += 1
+        exec_ctx = self.executor
+        responses: list[object] = []
+        for index, write in enumerate(writes):
+            try:
+                response = _executor._submit_uncached(
+                    exec_ctx, write.opref, write.body, write.headers
+                )
+            except Exception as err:
+                response = err
+            if isinstance(response, Exception) or _failed(response):
+                unsent = [later.opref for later in writes[index + 1:]]
+                raise CommitError([(write.opref, response)], responses, unsent)
+            responses.append(response)
+        return responses
+
+
+def active(executor: "Executor") -> Optional[Session]:
+    session = _current.get()
+    if session is not None and session.executor is executor:
+        return session
+    return None
+
+
+@contextlib.contextmanager
+def session(
+    executor: Union["Executor", "AsyncExecutor", None] = None, *, enabled: bool = True
+) -> Iterator[Optional[Session]]:
+    """
+    Batch the writes `executor` (by default the current one) makes inside the block.
+
+    The queued writes are committed when the block exits normally and discarded if it raises;
+    a failed write raises `CommitError` on exit. Writes return `None` while queued;
+    `session.commit()` returns their responses. A session
+    opened inside another for the same executor joins it. With `enabled=False`, every write is
+    sent as its own request, exactly as without a session, and the block gets `None`.
+    """
+
+    from . import executor as _executor
+
+    if executor is None:
+        executor = _executor.current()
+    # Writes through an `AsyncExecutor` are submitted by its synchronous executor.
+    executor = getattr(executor, "_sync", None) or executor
+
+    if not enabled:
+        yield None
+        return
+
+    outer = active(executor)
+    if outer is not None:
+        yield outer
+        return
+
+    current = Session(executor)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.discard()
+        raise
+    finally:
+        _current.reset(token)
+    current.commit()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from . import uri as _uri
+
+
+_MISS = object()
+
+
+def canonical_body(body: Any) -> Optional[str]:
+    """
+    Return a canonical JSON encoding of `body`, or `None` if it cannot be encoded stably.
+
+    Already-encoded `StateHandle` bodies are keyed on their JSON text when they expose one.
+    """
+
+    if body is None:
+        return ""
+    if hasattr(body, "value"):
+        value = body.value()
+        text = value.to_json() if hasattr(value, "to_json") else value
+        return text if isinstance(text, str) else None
+    try:
+        return json.dumps(body, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+def request_key(opref: "object", identity: Hashable) -> Optional[tuple]:
+    """Key a request on its method, path, canonical body and caller identity."""
+
+    body = canonical_body(opref.body)
+    if body is None:
+        return None
+    return (opref.method.upper(), opref.path, body, identity)
+
+
+class ResponseCache:
+    """
+    A size-bounded LRU cache of successful GET responses, with a per-entry TTL.
+
+    Routes decide whether their responses may be cached via `tc.define.get(cache=...)`. Routes
+    which do not say are cached only under `/lib`, whose paths are pinned to an immutable
+    library version.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1024,
+        ttl: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Optional[float], object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def accepts(self, opref: "object") -> bool:
+        if opref.method.upper() != "GET":
+            return False
+        cacheable = getattr(opref, "cacheable", None)
+        if cacheable is not None:
+            return cacheable
+        lib_root = _uri.lib_root()
+        return opref.path == lib_root or opref.path.startswith(lib_root + "/")
+
+    def key(self, opref: "object", identity: Hashable) -> Optional[Hashable]:
+        return request_key(opref, identity)
+
+    def get(self, key: Hashable) -> object:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, response = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+            self.misses += 1
+            return _MISS
+
+    def put(self, key: Hashable, response: object) -> None:
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Callable, Iterator, Optional, TypeVar
+
+from .workers import ElasticPool
+
+T = TypeVar("T")
+
+# Carries the caller's remaining budget, in whole milliseconds, into the kernel so that remote
+# hops can bound their own work.
+HEADER = "x-tc-deadline-ms"
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's deadline passes (or it is cancelled) before it completes."""
+
+
+class Deadline:
+    """
+    An absolute point in (monotonic) time by which a call must complete.
+
+    A deadline can also be cancelled, e.g. when the asyncio task waiting for it is cancelled;
+    work which has not reached the kernel yet then stops at its next `check`. Cancelling a
+    deadline cancels the deadlines derived from it, but not its parent.
+    """
+
+    __slots__ = ("expires_at", "parent", "_cancelled")
+
+    def __init__(self, expires_at: float, parent: Optional["Deadline"] = None) -> None:
+        self.expires_at = expires_at
+        self.parent = parent
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def after(cls, seconds: float, parent: Optional["Deadline"] = None) -> "Deadline":
+        if seconds < 0:
+            raise ValueError(f"timeout must be non-negative, got {seconds}")
+        expires_at = time.monotonic() + seconds
+        if parent is not None:
+            expires_at = min(expires_at, parent.expires_at)
+        return cls(expires_at, parent)
+
+    @property
+    def cancelled(self) -> bool:
+        deadline: Optional[Deadline] = self
+        while deadline is not None:
+            if deadline._cancelled.is_set():
+                return True
+            deadline = deadline.parent
+        return False
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise DeadlineExceeded("call was cancelled")
+        if self.expires_at <= time.monotonic():
+            raise DeadlineExceeded("deadline exceeded")
+
+    def header(self) -> tuple[str, str]:
+        return (HEADER, str(int(self.remaining() * 1000)))
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "tinychain_deadline", default=None
+)
+
+# Set while something (a worker wait or `asyncio.wait_for`) already enforces the current
+# deadline, so nested calls check it instead of starting another watcher.
+_enforced: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "tinychain_deadline_enforced", default=False
+)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def check() -> None:
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def resolve(timeout: Optional[float], default: Optional[float] = None) -> Optional[Deadline]:
+    """
+    The deadline for a call: `timeout` (or else `default`) seconds from now, bounded by the
+    enclosing deadline. Each call gets its own deadline, so cancelling it leaves others alone.
+    """
+
+    ambient = _current.get()
+    seconds = timeout if timeout is not None else default
+    if seconds is None:
+        return None if ambient is None else Deadline(ambient.expires_at, ambient)
+    return Deadline.after(seconds, ambient)
+
+
+@contextlib.contextmanager
+def scope(seconds: float) -> Iterator[Deadline]:
+    """Run the enclosed calls under a shared deadline `seconds` from now."""
+
+    deadline = Deadline.after(seconds, _current.get())
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def enforced(deadline: Deadline) -> Iterator[None]:
+    token = _current.set(deadline)
+    enforced_token = _enforced.set(True)
+    try:
+        yield
+    finally:
+        _enforced.reset(enforced_token)
+        _current.reset(token)
+
+
+# Each abandoned call keeps its worker until the kernel returns, so timed calls must never queue
+# behind a fixed number of workers which a stuck dependency could fill.
+_workers = ElasticPool("tinychain-deadline")
+
+
+def run(deadline: Optional[Deadline], fn: Callable[[], T]) -> T:
+    """
+    Call `fn` under `deadline`, abandoning it with `DeadlineExceeded` once the deadline passes.
+
+    A blocked kernel call cannot be interrupted, so `fn` runs on a worker thread while the
+    caller waits at most until the deadline; the deadline is then cancelled so that `fn` stops
+    at its next checkpoint instead of issuing further kernel calls. The worker is only released
+    when `fn` returns, so every call gets a worker of its own (see `workers.ElasticPool`).
+    """
+
+    if deadline is None:
+        return fn()
+
+    deadline.check()
+    watched = _current.get()
+    if _enforced.get() and watched is not None and watched.expires_at <= deadline.expires_at:
+        # An outer watcher already abandons the call in time; just make `deadline` current.
+        with enforced(deadline):
+            return fn()
+
+    def task() -> T:
+        with enforced(deadline):
+            return fn()
+
+    from concurrent.futures import TimeoutError as FutureTimeout
+
+    future = _workers.submit(contextvars.copy_context().run, task)
+    try:
+        return future.result(timeout=deadline.remaining())
+    except FutureTimeout:
+        deadline.cancel()
+        future.cancel()
+        raise DeadlineExceeded("deadline exceeded") from None
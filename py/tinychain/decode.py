@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterator
+
+
+_SCALAR_VALUE_PREFIX = "/state/scalar/value/"
+_SCALAR_MAP = "/state/scalar/map"
+_SCALAR_TUPLE = "/state/scalar/tuple"
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+_CHUNK_SIZE = 1 << 16
+
+
+_orjson: Any = None
+_orjson_loaded = False
+
+
+def orjson() -> Any:
+    """The optional `orjson` module, or None; imported on first use since it is slow to load."""
+
+    global _orjson, _orjson_loaded
+    if not _orjson_loaded:
+        try:  # Optional faster JSON backend.
+            import orjson as _orjson  # type: ignore
+        except ImportError:  # pragma: no cover
+            _orjson = None
+        _orjson_loaded = True
+    return _orjson
+
+
+def loads(text: "str | bytes") -> Any:
+    fast = _orjson if _orjson_loaded else orjson()
+    if fast is not None:
+        try:
+            return fast.loads(text)
+        except ValueError:
+            # e.g. NaN or integers wider than 64 bits, which the stdlib parser accepts
+            pass
+    return json.loads(text)
+
+
+def _peel(node: Any) -> tuple[Any, bool]:
+    # Strip any `/state/scalar/value/...` envelopes around `node`, returning the inner node and
+    # whether its children still need unwrapping (true for lists and `/state/scalar/map` bodies).
+    while type(node) is dict and len(node) == 1:
+        for key in node:
+            break
+        if type(key) is str and key.startswith(_SCALAR_VALUE_PREFIX):
+            node = node[key]
+            continue
+        if key == _SCALAR_MAP and type(node[key]) is dict:
+            return node[key], True
+        return node, False
+    return node, type(node) is list
+
+
+def unwrap_state(payload: Any) -> Any:
+    """
+    Strip the `/state/scalar/value/...` and `/state/scalar/map` envelopes from a parsed response.
+
+    Follows the same rules as `tc.testing._unwrap_state`. The difference is that this walks the
+    tree iteratively and rewrites containers in place, so a payload with no envelopes is not
+    copied. `payload` must be freshly parsed, because it may be mutated.
+    """
+
+    root, expand = _peel(payload)
+    if not expand:
+        return root
+
+    peel = _peel
+    stack = [root]
+    push = stack.append
+    while stack:
+        container = stack.pop()
+        if type(container) is list:
+            for i, child in enumerate(container):
+                if type(child) is list:
+                    push(child)
+                elif type(child) is dict and len(child) == 1:
+                    unwrapped, expand = peel(child)
+                    if unwrapped is not child:
+                        container[i] = unwrapped
+                    if expand:
+                        push(unwrapped)
+        else:
+            for key, child in container.items():
+                if type(child) is list:
+                    push(child)
+                elif type(child) is dict and len(child) == 1:
+                    unwrapped, expand = peel(child)
+                    if unwrapped is not child:
+                        container[key] = unwrapped
+                    if expand:
+                        push(unwrapped)
+
+    return root
+
+
+def decode_text(text: "str | bytes") -> Any:
+    return unwrap_state(loads(text))
+
+
+def body_text(response: "object") -> "str | bytes":
+    body = getattr(response, "body", None)
+    if body is None:
+        raise AssertionError("response missing body")
+
+    value = body.value()
+    return value.to_json() if hasattr(value, "to_json") else value
+
+
+def decode_json_body(response: "object") -> Any:
+    return decode_text(body_text(response))
+
+
+class _Reader:
+    # A cursor over JSON text which may arrive in chunks from a readable stream.
+
+    __slots__ = ("buf", "pos", "_read", "_eof", "_utf8")
+
+    def __init__(self, source: Any) -> None:
+        # Multi-byte UTF-8 sequences may be split across chunks read from a binary stream.
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        if hasattr(source, "read"):
+            self.buf = ""
+            self._read = source.read
+            self._eof = False
+        else:
+            self.buf = source.decode("utf-8") if isinstance(source, (bytes, bytearray)) else source
+            self._read = None
+            self._eof = True
+        self.pos = 0
+
+    def _fill(self, size: int = _CHUNK_SIZE) -> bool:
+        if self._eof:
+            return False
+
+        chunk = self._read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = self._utf8.decode(chunk)
+
+        # Drop the consumed prefix so memory stays bounded by the unread window.
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON response")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def string(self) -> str:
+        self.expect('"')
+        while True:
+            try:
+                value, self.pos = json.decoder.scanstring(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        self.peek()
+        size = _CHUNK_SIZE
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Read ahead geometrically so a large element is re-scanned O(log n) times.
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise
+
+            # A number cut off by the end of a chunk (e.g. `15` of `15.5e3`) may continue in the
+            # next one, so only accept it once a delimiter follows.
+            truncated = end == len(self.buf) or (
+                type(value) in (int, float) and self.buf[end] in _NUMBER_CHARS
+            )
+            if truncated and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_text(source: Any) -> Iterator[Any]:
+    """
+    Incrementally decode a JSON list or tuple response, yielding one unwrapped element at a time.
+
+    `source` is JSON text (`str`/`bytes`) or a readable stream of it. Enclosing
+    `/state/scalar/value/...` and `/state/scalar/tuple` envelopes are stripped, and each element is
+    unwrapped with the same rules as `unwrap_state`. Only one element is held in parsed form at a
+    time.
+    """
+
+    reader = _Reader(source)
+    decoder = json.JSONDecoder()
+
+    envelopes = 0
+    while reader.peek() == "{":
+        reader.expect("{")
+        key = reader.string()
+        if not (key.startswith(_SCALAR_VALUE_PREFIX) or key == _SCALAR_TUPLE):
+            raise ValueError(f"expected a list or tuple response, found a {key!r} object")
+        reader.expect(":")
+        envelopes += 1
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            yield unwrap_state(reader.value(decoder))
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("]")
+            break
+
+    for _ in range(envelopes):
+        reader.expect("}")
+
+
+def iter_json_body(response: "object") -> Iterator[Any]:
+    return iter_text(body_text(response))
@@ -1,28 +1,62 @@
 from __future__ import annotations
 
-import base64
+import hashlib
 import json
+import marshal
+import os
 import pathlib
-from dataclasses import dataclass
+import re
+import sys
+import threading
+import weakref
+from dataclasses import dataclass, field
 from typing import Any, Callable, Optional, get_type_hints
 
+from . import decode as _decode
 from .opref import OpRef
 from .ref import Ref
+from . import kernel as _kernel
+from . import manifest as _manifest
 from . import uri as _uri
 
 IR_ARTIFACT_CONTENT_TYPE = "application/tinychain+json"
 
+# Bump whenever `compile_ir`'s output changes, so IR cached by an older client is not reused.
+IR_FORMAT = 1
+
 
 def _is_method(form: Callable[..., Any]) -> bool:
     names = list(getattr(form, "__code__", None).co_varnames or ())
     return bool(names and names[0] == "self")
 
 
+_UNRESOLVED = object()
+
+
+def _parse_body(args: tuple, kwargs: dict) -> Any:
+    if args and kwargs:
+        raise TypeError("TinyChain route stubs accept either args or kwargs, not both")
+
+    if args:
+        if len(args) != 1:
+            raise TypeError("TinyChain route stubs accept at most one positional argument")
+        return args[0]
+
+    if kwargs:
+        if len(kwargs) != 1 or "body" not in kwargs:
+            raise TypeError("TinyChain route stubs accept only the keyword argument `body`")
+        return kwargs["body"]
+
+    return None
+
+
 @dataclass(frozen=True, slots=True)
 class Route:
     method: str
     form: Callable[..., Any]
     name: Optional[str] = None
+    cache: Optional[bool] = None
+    _rtype: Any = field(default=_UNRESOLVED, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not callable(self.form):
@@ -36,52 +70,67 @@ class Route:
         if self.name is None:
             object.__setattr__(self, "name", attr_name)
 
-    def _return_type(self) -> Optional[type[Ref]]:
+        # Resolve the return type once, when the class is defined. Forward references which
+        # cannot be resolved yet are retried (once) on the first stub call instead.
         try:
-            rtype = get_type_hints(self.form, globalns=self.form.__globals__).get("return")
+            object.__setattr__(self, "_rtype", self._resolve_return_type())
         except Exception:
-            return None
+            pass
 
+    def _resolve_return_type(self) -> Optional[type[Ref]]:
+        rtype = get_type_hints(self.form, globalns=self.form.__globals__).get("return")
         if isinstance(rtype, type) and issubclass(rtype, Ref):
             return rtype
-
         return None
 
-    def _opref(self, instance: object) -> OpRef[Any]:
+    def _return_type(self) -> Optional[type[Ref]]:
+        rtype = self._rtype
+        if rtype is _UNRESOLVED:
+            try:
+                rtype = self._resolve_return_type()
+            except Exception:
+                rtype = None
+            object.__setattr__(self, "_rtype", rtype)
+        return rtype
+
+    def _opref(self, instance: object, body: Any = None) -> OpRef[Any]:
         route_name = self.name or self.form.__name__
         route = getattr(instance, "route", None)
         if route is None or not callable(route):
             raise TypeError("expected instance to define a .route(...) method")
         path = route(route_name)
-        return OpRef(method=self.method, path=path)
+        return OpRef(method=self.method, path=path, body=body, cacheable=self.cache)
 
     def __get__(self, instance: object, owner: type | None = None):
         if instance is None:
             return self
+        return _BoundRoute(self, instance)
+
+
+# A route stub bound to a library instance; calling it builds a deferred `OpRef`/`Ref`.
+# (`__doc__` is a property forwarding to the route's form, so this class has no docstring.)
+class _BoundRoute:
+    __slots__ = ("_route", "_instance")
 
-        def bound(*args, **kwargs):
-            body = None
-            if args and kwargs:
-                raise TypeError("TinyChain route stubs accept either args or kwargs, not both")
+    def __init__(self, route: Route, instance: object) -> None:
+        self._route = route
+        self._instance = instance
 
-            if args:
-                if len(args) != 1:
-                    raise TypeError("TinyChain route stubs accept at most one positional argument")
-                body = args[0]
-            elif kwargs:
-                if len(kwargs) != 1 or "body" not in kwargs:
-                    raise TypeError("TinyChain route stubs accept only the keyword argument `body`")
-                body = kwargs["body"]
+    @property
+    def __name__(self) -> str:
+        return self._route.name or self._route.form.__name__
 
-            opref = self._opref(instance)
-            if body is not None:
-                opref = OpRef(method=opref.method, path=opref.path, headers=opref.headers, body=body)
-            rtype = self._return_type()
-            return rtype(opref) if rtype is not None else opref
+    @property
+    def __doc__(self) -> Optional[str]:  # type: ignore[override]
+        return self._route.form.__doc__
 
-        bound.__name__ = self.name or self.form.__name__
-        bound.__doc__ = self.form.__doc__
-        return bound
+    def __call__(self, *args, **kwargs):
+        route = self._route
+        opref = route._opref(self._instance, _parse_body(args, kwargs))
+        rtype = route._rtype
+        if rtype is _UNRESOLVED:
+            rtype = route._return_type()
+        return rtype(opref) if rtype is not None else opref
 
 
 def _decorate(
@@ -89,18 +138,27 @@ def _decorate(
     form: Optional[Callable[..., Any]] = None,
     *,
     name: Optional[str] = None,
+    cache: Optional[bool] = None,
 ):
     if form is None:
-        return lambda actual: Route(method=method.upper(), form=actual, name=name)
-    return Route(method=method.upper(), form=form, name=name)
+        return lambda actual: Route(method=method.upper(), form=actual, name=name, cache=cache)
+    return Route(method=method.upper(), form=form, name=name, cache=cache)
 
 
 def get(
     form: Optional[Callable[..., Any]] = None,
     *,
     name: Optional[str] = None,
+    cache: Optional[bool] = None,
 ):
-    return _decorate("GET", form, name=name)
+    """
+    Define a GET route.
+
+    `cache=True` lets an executor's `ResponseCache` reuse this route's responses, `cache=False`
+    forbids it, and the default leaves the decision to the cache (which caches `/lib` routes).
+    """
+
+    return _decorate("GET", form, name=name, cache=cache)
 
 
 def put(
@@ -154,12 +212,7 @@ class Library:
         return _uri.library(publisher=self.publisher, name=self.name, version=self.version)
 
     def route(self, *path: str) -> str:
-        return _uri.library(
-            publisher=self.publisher,
-            name=self.name,
-            version=self.version,
-            path=list(path) if path else None,
-        ).path
+        return _uri._library_path(self.publisher, self.name, self.version, path)
 
     def link(self) -> _uri.URI:
         return _uri.library_link(
@@ -173,7 +226,7 @@ class Library:
         return {
             "id": self.id().path,
             "version": self.version,
-            "dependencies": [dep.path for dep in self.dependencies],
+            "dependencies": list(dict.fromkeys(dep.path for dep in self.dependencies)),
         }
 
     def schema_json(self) -> str:
@@ -188,7 +241,7 @@ def _to_opref(value: object) -> Optional[OpRef[Any]]:
     return None
 
 
-def compile_ir(library: Library) -> dict:
+def _compile_ir(library: Library) -> dict:
     routes: list[dict] = []
     for name, attr in list(library.__class__.__dict__.items()):
         if not isinstance(attr, Route):
@@ -212,24 +265,231 @@ def compile_ir(library: Library) -> dict:
     return {"schema": library.schema(), "routes": routes}
 
 
+def _dumps_ir(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _filename_part(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value)
+
+
+class IRCache:
+    """
+    Compiled IR payloads for `compile_ir(..., cache=True)`: in memory, and on disk if `persist`.
+
+    In memory, a payload is kept per library class and schema for the life of the class, which
+    assumes that route forms depend only on the code and the schema, not on other instance
+    attributes or on globals which change at runtime.
+
+    On disk, a payload is keyed on a digest of the library class's routes (name, method and
+    form), the source of the class's module, the library's schema and `IR_FORMAT`, so editing
+    a route, a helper in the same module, the version or the dependencies all compile afresh.
+    The digest cannot see values a route reads from other modules, so persisting is opt-in and
+    only safe when those do not change between runs; classes defined inside a function and
+    routes which close over local variables are never persisted.
+
+    Payloads are written, like bytecode, to the `__pycache__` directory next to the class's
+    module (or to `directory`), as `<module>.<class>.<schema>.<digest>.tc-ir.json`. Writing a
+    payload removes the stale ones for the same class and schema. A directory which cannot be
+    written just leaves the cache in memory.
+    """
+
+    def __init__(self, directory: Optional[pathlib.Path] = None, *, persist: bool = False) -> None:
+        self.directory = None if directory is None else pathlib.Path(directory)
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._classes: "weakref.WeakKeyDictionary[type, str]" = weakref.WeakKeyDictionary()
+        self._memory: "weakref.WeakKeyDictionary[type, dict[str, bytes]]" = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def class_digest(self, cls: type) -> str:
+        with self._lock:
+            digest = self._classes.get(cls)
+        if digest is not None:
+            return digest
+
+        hasher = hashlib.sha256()
+        hasher.update(f"{sys.implementation.cache_tag}\0{cls.__module__}\0{cls.__qualname__}".encode())
+        source = self._source(cls)
+        if source is not None:
+            hasher.update(b"\0source\0" + source.read_bytes())
+        for name, attr in cls.__dict__.items():
+            if isinstance(attr, Route):
+                form = attr.form
+                code = form.__code__
+                hasher.update(
+                    f"\0route\0{name}\0{attr.method}\0{attr.name}"
+                    f"\0{form.__qualname__}\0{code.co_firstlineno}\0".encode()
+                )
+                # The module source already covers forms written in it; hash any other's bytecode.
+                if source is None or code.co_filename != str(source):
+                    hasher.update(marshal.dumps(code))
+                    hasher.update(repr((form.__defaults__, form.__kwdefaults__)).encode())
+        digest = hasher.hexdigest()
+
+        with self._lock:
+            self._classes[cls] = digest
+        return digest
+
+    @staticmethod
+    def _source(cls: type) -> Optional[pathlib.Path]:
+        path = getattr(sys.modules.get(cls.__module__), "__file__", None)
+        if not path or not path.endswith(".py") or not os.path.isfile(path):
+            return None
+        return pathlib.Path(path)
+
+    @staticmethod
+    def persistable(cls: type) -> bool:
+        """Whether the digest can cover what `cls`'s routes see (no enclosing function scope)."""
+
+        if "<locals>" in cls.__qualname__:
+            return False
+        return not any(
+            isinstance(attr, Route) and attr.form.__closure__ for attr in cls.__dict__.values()
+        )
+
+    def digest(self, library: Library, schema_json: Optional[str] = None) -> str:
+        schema_json = schema_json or library.schema_json()
+        return hashlib.sha256(
+            f"{IR_FORMAT}\0{self.class_digest(type(library))}\0{schema_json}".encode()
+        ).hexdigest()
+
+    def _path(self, cls: type, schema_json: str, digest: str) -> Optional[pathlib.Path]:
+        directory = self.directory
+        if directory is None:
+            source = self._source(cls)
+            if source is None:
+                return None
+            directory = source.parent / "__pycache__"
+        schema = hashlib.sha256(schema_json.encode()).hexdigest()[:12]
+        prefix = _filename_part(f"{cls.__module__}.{cls.__qualname__}")
+        return directory / f"{prefix}.{schema}.{digest[:32]}.tc-ir.json"
+
+    def load(self, library: Library, compile: Callable[[], bytes]) -> bytes:
+        """Return the cached IR for `library`, calling `compile()` to produce it on a miss."""
+
+        cls = type(library)
+        schema_json = library.schema_json()
+        with self._lock:
+            payload = self._memory.get(cls, {}).get(schema_json)
+            if payload is not None:
+                self.hits += 1
+                return payload
+
+        path = None
+        if self.persist and self.persistable(cls):
+            path = self._path(cls, schema_json, self.digest(library, schema_json))
+        payload = self._read(path)
+        if payload is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            payload = compile()
+            with self._lock:
+                self.misses += 1
+            self._write(path, payload)
+
+        with self._lock:
+            self._memory.setdefault(cls, {})[schema_json] = payload
+        return payload
+
+    @staticmethod
+    def _read(path: Optional[pathlib.Path]) -> Optional[bytes]:
+        if path is None:
+            return None
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        # Payloads are replaced atomically, so anything but a complete JSON object is foreign.
+        return payload if payload[:1] == b"{" and payload[-1:] == b"}" else None
+
+    @staticmethod
+    def _write(path: Optional[pathlib.Path], payload: bytes) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            # The class prefix and schema digest come before the payload digest in the name.
+            stem = path.name.rsplit(".", 3)[0]
+            for stale in path.parent.glob(f"{stem}.*.tc-ir.json"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Forget the payloads held in memory (the files on disk are kept)."""
+
+        with self._lock:
+            self._classes.clear()
+            self._memory.clear()
+
+
+ir_cache = IRCache()
+
+
+def compile_ir_bytes(library: Library, *, cache: bool = False) -> bytes:
+    """The compiled IR of `library` as JSON bytes, served from `ir_cache` if `cache=True`."""
+
+    if not cache:
+        return _dumps_ir(_compile_ir(library))
+    return ir_cache.load(library, lambda: _dumps_ir(_compile_ir(library)))
+
+
+def compile_ir(library: Library, *, cache: bool = False) -> dict:
+    if not cache:
+        return _compile_ir(library)
+    # Parse a fresh copy, so that callers which mutate the result cannot corrupt the cache.
+    return _decode.loads(compile_ir_bytes(library, cache=True))
+
+
 def install(
     library: Library,
     *,
     kernel: Optional[object] = None,
     data_dir: Optional[pathlib.Path] = None,
+    force: bool = False,
+    cache: bool = False,
 ) -> object:
+    """
+    Compile `library` to IR and install it through `PUT /lib`.
+
+    When `data_dir` is given, the install is skipped (returning a `SkippedInstall`) if the
+    `data_dir` manifest shows the same schema and IR were already installed there; pass
+    `force=True` to reinstall regardless. The IR is compiled afresh, so that the manifest
+    compares what would actually be installed, unless `cache=True` serves it from `ir_cache`.
+    """
+
     try:
         import tinychain_local as local  # type: ignore
     except Exception as exc:  # pragma: no cover
         raise ImportError("`tc.define.install` requires the optional `tinychain-local` backend") from exc
 
+    if kernel is None and data_dir is None:
+        raise ValueError("expected either `kernel` or `data_dir`")
+
+    ir_bytes = compile_ir_bytes(library, cache=cache)
+
+    manifest = digest = None
+    if data_dir is not None:
+        manifest = _manifest.InstallManifest(data_dir)
+        digest = _manifest.content_digest(
+            library.schema(), "/lib/ir", IR_ARTIFACT_CONTENT_TYPE, ir_bytes
+        )
+        if not force and manifest.is_current(library.id().path, digest):
+            return _manifest.SkippedInstall(library.id().path, digest)
+
     if kernel is None:
-        if data_dir is None:
-            raise ValueError("expected either `kernel` or `data_dir`")
-        kernel = local.KernelHandle.local(data_dir=str(data_dir))
+        kernel = _kernel.registry.local(data_dir)
+
+    import base64
 
-    payload = compile_ir(library)
-    ir_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
     ir_b64 = base64.b64encode(ir_bytes).decode("ascii")
 
     install_payload = json.dumps(
@@ -247,4 +507,8 @@ def install(
     )
 
     request = local.KernelRequest("PUT", "/lib", None, local.StateHandle(install_payload))
-    return kernel.dispatch(request)
+    response = kernel.dispatch(request)
+    if manifest is not None and response.status == 204:
+        manifest.record(library.id().path, digest)
+        _kernel.registry.installed(data_dir, kernel)
+    return response
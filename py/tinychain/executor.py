@@ -1,15 +1,38 @@
 from __future__ import annotations
 
 import contextvars
+import functools
 import json
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional
-
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from . import batch as _batch
+from . import deadline as _deadline
+from . import ndarray as _ndarray
+from . import opref as _opref
+from .cache import _MISS, ResponseCache, request_key
+from .metrics import Metrics
+from .policy import CircuitOpenError, Policy
+from .routing import ReplicaRouter
+from .singleflight import SingleFlight
+from .workers import ElasticPool
+
+if TYPE_CHECKING:
+    import asyncio
 
 _current_executor: contextvars.ContextVar["Executor | None"] = contextvars.ContextVar(
     "tinychain_executor", default=None
 )
 
+_current_async_executor: contextvars.ContextVar["AsyncExecutor | None"] = contextvars.ContextVar(
+    "tinychain_async_executor", default=None
+)
+
+DEFAULT_MAX_IN_FLIGHT = 64
+
+# Identical GETs in flight at the same time against the same kernel share one kernel call.
+_flights = SingleFlight()
+
 
 def _headers_to_list(headers: Optional[Iterable[tuple[str, str]]]) -> list[tuple[str, str]]:
     return list(headers) if headers else []
@@ -18,7 +41,11 @@ def _headers_to_list(headers: Optional[Iterable[tuple[str, str]]]) -> list[tuple
 def _encode_json_body(value: Any) -> "object":
     import tinychain as tc
 
-    payload = json.dumps(value, separators=(",", ":"))
+    if _ndarray.is_ndarray(value):
+        payload = _ndarray.dumps(value)
+    else:
+        # Refs nested in the body are shipped as `TCRef`s and resolved by the kernel.
+        payload = json.dumps(value, separators=(",", ":"), default=_opref.json_default)
     return tc.StateHandle(payload)
 
 
@@ -27,6 +54,12 @@ class Executor:
     kernel: object
     bearer_token: Optional[str] = None
     headers: Optional[Iterable[tuple[str, str]]] = None
+    cache: Optional[ResponseCache] = None
+    coalesce: bool = True
+    metrics: Optional[Metrics] = None
+    replicas: Optional[ReplicaRouter] = None
+    policy: Optional[Policy] = None
+    timeout: Optional[float] = None
     _token: Optional[contextvars.Token["Executor | None"]] = None
 
     def __enter__(self) -> "Executor":
@@ -38,6 +71,13 @@ class Executor:
             _current_executor.reset(self._token)
             self._token = None
 
+    def _auth_identity(self, extra: Optional[Iterable[tuple[str, str]]]) -> tuple:
+        auth = tuple(
+            v for k, v in (*_headers_to_list(self.headers), *_headers_to_list(extra))
+            if k.lower() == "authorization"
+        )
+        return (self.bearer_token, auth)
+
     def _merge_headers(self, extra: Optional[Iterable[tuple[str, str]]]) -> list[tuple[str, str]]:
         merged = _headers_to_list(self.headers)
         merged.extend(_headers_to_list(extra))
@@ -52,6 +92,7 @@ class Executor:
         *,
         headers: Optional[Iterable[tuple[str, str]]] = None,
         body: Any = None,
+        timeout: Optional[float] = None,
     ) -> object:
         import tinychain as tc
 
@@ -60,12 +101,23 @@ class Executor:
                 "KernelRequest is not available; install `tinychain-local` to use the in-process executor"
             )
 
-        request_body = None if body is None else (_encode_json_body(body) if not hasattr(body, "value") else body)
-        request = tc.KernelRequest(method, path, self._merge_headers(headers), request_body)
-        return self.kernel.dispatch(request)
+        def call() -> object:
+            request_body = None if body is None else (_encode_json_body(body) if not hasattr(body, "value") else body)
+            merged = _with_deadline_header(self._merge_headers(headers))
+            request = tc.KernelRequest(method, path, merged, request_body)
+            if self.metrics is None:
+                return self.kernel.dispatch(request)
+            return _observed(self.metrics, method, path, lambda: self.kernel.dispatch(request))
+
+        return _deadline.run(_deadline.resolve(timeout, self.timeout), call)
+
+    def execute(self, opref: "object", *, timeout: Optional[float] = None) -> object:
+        return execute(opref, executor=self, timeout=timeout)
 
-    def execute(self, opref: "object") -> object:
-        return execute(opref, executor=self)
+    def execute_many(
+        self, oprefs: Iterable["object"], *, timeout: Optional[float] = None
+    ) -> list[object]:
+        return execute_many(oprefs, executor=self, timeout=timeout)
 
     def resolve(
         self,
@@ -74,6 +126,7 @@ class Executor:
         *,
         body: Any = None,
         bearer_token: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> object:
         token = bearer_token or self.bearer_token
 
@@ -83,13 +136,142 @@ class Executor:
         if fn is None:
             raise NotImplementedError(f"kernel does not implement {fn_name}")
 
-        if method in {"GET", "DELETE"}:
+        if method not in {"GET", "DELETE"}:
+            raise NotImplementedError(f"{fn_name} is not wired for method {method}")
+
+        def send() -> object:
             encoded = _encode_body(body)
             if encoded is None:
                 return fn(path, bearer_token=token)
             return fn(path, encoded, bearer_token=token)
 
-        raise NotImplementedError(f"{fn_name} is not wired for method {method}")
+        def call() -> object:
+            if self.metrics is None:
+                return send()
+            return _observed(self.metrics, method, path, send)
+
+        return _deadline.run(_deadline.resolve(timeout, self.timeout), call)
+
+
+@dataclass(slots=True)
+class AsyncExecutor:
+    """An asyncio counterpart to `Executor` which runs kernel calls on worker threads."""
+
+    kernel: object
+    bearer_token: Optional[str] = None
+    headers: Optional[Iterable[tuple[str, str]]] = None
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    cache: Optional[ResponseCache] = None
+    coalesce: bool = True
+    metrics: Optional[Metrics] = None
+    replicas: Optional[ReplicaRouter] = None
+    policy: Optional[Policy] = None
+    timeout: Optional[float] = None
+    _sync: Optional[Executor] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _pool: Optional[ElasticPool] = None
+    _token: Optional[contextvars.Token["AsyncExecutor | None"]] = None
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight <= 0:
+            raise ValueError(f"max_in_flight must be positive, got {self.max_in_flight}")
+        self._pool = ElasticPool("tinychain-kernel")
+        self._sync = Executor(
+            kernel=self.kernel,
+            bearer_token=self.bearer_token,
+            headers=self.headers,
+            cache=self.cache,
+            coalesce=self.coalesce,
+            metrics=self.metrics,
+            replicas=self.replicas,
+            policy=self.policy,
+            timeout=self.timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncExecutor":
+        self._token = _current_async_executor.set(self)
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb) -> None:
+        if self._token is not None:
+            _current_async_executor.reset(self._token)
+            self._token = None
+        self.close()
+
+    def close(self) -> None:
+        self._semaphore = None
+        self._loop = None
+
+    async def _run(self, fn, *args, **kwargs) -> object:
+        import asyncio
+
+        # An asyncio semaphore belongs to one event loop, and an executor may outlive its loop
+        # (e.g. a module-level executor used from successive `asyncio.run` calls).
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+
+        # A call abandoned at its deadline gives up its slot but keeps its worker until the kernel
+        # returns, so calls get workers from an elastic pool rather than `max_in_flight` threads.
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        async with self._semaphore:
+            return await asyncio.wrap_future(self._pool.submit(call))
+
+    async def _run_until(self, timeout: Optional[float], fn, *args, **kwargs) -> object:
+        """Like `_run`, but give up and cancel the call's deadline when it passes."""
+
+        deadline = _deadline.resolve(timeout, self.timeout)
+        if deadline is None:
+            return await self._run(fn, *args, **kwargs)
+
+        import asyncio
+
+        deadline.check()
+        with _deadline.enforced(deadline):
+            try:
+                return await asyncio.wait_for(self._run(fn, *args, **kwargs), deadline.remaining())
+            except asyncio.TimeoutError:
+                deadline.cancel()
+                raise _deadline.DeadlineExceeded("deadline exceeded") from None
+            except asyncio.CancelledError:
+                deadline.cancel()
+                raise
+
+    async def dispatch(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Optional[Iterable[tuple[str, str]]] = None,
+        body: Any = None,
+        timeout: Optional[float] = None,
+    ) -> object:
+        return await self._run_until(
+            timeout, self._sync.dispatch, method, path, headers=headers, body=body
+        )
+
+    async def resolve(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: Any = None,
+        bearer_token: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> object:
+        return await self._run_until(
+            timeout, self._sync.resolve, method, path, body=body, bearer_token=bearer_token
+        )
+
+    async def execute(self, opref: "object", *, timeout: Optional[float] = None) -> object:
+        return await aexecute(opref, executor=self, timeout=timeout)
+
+    async def execute_many(
+        self, oprefs: Iterable["object"], *, timeout: Optional[float] = None
+    ) -> list[object]:
+        return await self._run_until(timeout, execute_many, list(oprefs), executor=self._sync)
 
 
 def current() -> "Executor":
@@ -103,8 +285,63 @@ def try_current() -> "Executor | None":
     return _current_executor.get()
 
 
-def backend(kernel: object, *, bearer_token: Optional[str] = None) -> Executor:
-    return Executor(kernel=kernel, bearer_token=bearer_token)
+def backend(
+    kernel: object,
+    *,
+    bearer_token: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    coalesce: bool = True,
+    metrics: Optional[Metrics] = None,
+    replicas: Optional[ReplicaRouter] = None,
+    policy: Optional[Policy] = None,
+    timeout: Optional[float] = None,
+) -> Executor:
+    return Executor(
+        kernel=kernel,
+        bearer_token=bearer_token,
+        cache=cache,
+        coalesce=coalesce,
+        metrics=metrics,
+        replicas=replicas,
+        policy=policy,
+        timeout=timeout,
+    )
+
+
+def acurrent() -> "AsyncExecutor":
+    executor = _current_async_executor.get()
+    if executor is None:
+        raise RuntimeError("no active TinyChain async executor (use `async with tc.abackend(...):`)")
+    return executor
+
+
+def try_acurrent() -> "AsyncExecutor | None":
+    return _current_async_executor.get()
+
+
+def abackend(
+    kernel: object,
+    *,
+    bearer_token: Optional[str] = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    cache: Optional[ResponseCache] = None,
+    coalesce: bool = True,
+    metrics: Optional[Metrics] = None,
+    replicas: Optional[ReplicaRouter] = None,
+    policy: Optional[Policy] = None,
+    timeout: Optional[float] = None,
+) -> AsyncExecutor:
+    return AsyncExecutor(
+        kernel=kernel,
+        bearer_token=bearer_token,
+        max_in_flight=max_in_flight,
+        cache=cache,
+        coalesce=coalesce,
+        metrics=metrics,
+        replicas=replicas,
+        policy=policy,
+        timeout=timeout,
+    )
 
 
 def _is_state_handle(obj: object) -> bool:
@@ -148,7 +385,7 @@ def _kernel_resolve(
     raise NotImplementedError(f"{fn_name} is not wired for method {method}")
 
 
-def execute(opref: "object", *, executor: "Executor | None" = None) -> object:
+def _as_opref(opref: "object") -> "object":
     from .opref import OpRef
     from .ref import Ref
 
@@ -158,15 +395,242 @@ def execute(opref: "object", *, executor: "Executor | None" = None) -> object:
     if not isinstance(opref, OpRef):
         raise TypeError(f"expected OpRef or Ref, got {type(opref).__name__}")
 
-    exec_ctx = executor or current()
-    headers = exec_ctx._merge_headers(opref.headers)
+    return opref
+
+
+def _body_key(body: Any) -> object:
+    if body is None:
+        return None
+    if _is_state_handle(body):
+        return ("handle", id(body))
+    try:
+        return json.dumps(body, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return ("object", id(body))
+
+
+def _dedup_key(opref: "object") -> object:
+    return (opref.path, opref.headers, _body_key(opref.body))
+
+
+def _counted(metrics: Metrics, method: str, path: str, call) -> object:
+    try:
+        response = call()
+    except Exception:
+        metrics.record_status(method, path, "error")
+        raise
+    metrics.record_status(method, path, getattr(response, "status", None))
+    return response
+
+
+def _observed(metrics: Metrics, method: str, path: str, call) -> object:
+    return _counted(metrics, method, path, lambda: metrics.call(method, path, call))
+
+
+def _encode_observed(exec_ctx: Executor, opref: "object") -> object:
+    metrics = exec_ctx.metrics
+    if metrics is None:
+        return _encode_body(opref.body)
+
+    start = metrics.clock()
+    body = _encode_body(opref.body)
+    metrics.observe(opref.method, opref.path, "encode", metrics.clock() - start)
+    return body
+
+
+def _submit(exec_ctx: Executor, opref: "object", body: Any, headers) -> object:
+    session = _batch.active(exec_ctx)
+    if session is not None:
+        if opref.method.upper() != "GET":
+            return session.queue(opref, body, headers)
+        if session.pending(opref.path):
+            session.commit()
+
+    metrics = exec_ctx.metrics
+    if metrics is None:
+        return _submit_shared(exec_ctx, opref, body, headers)
+    return _counted(
+        metrics, opref.method, opref.path, lambda: _submit_shared(exec_ctx, opref, body, headers)
+    )
+
+
+def _submit_shared(exec_ctx: Executor, opref: "object", body: Any, headers) -> object:
+    cache = exec_ctx.cache
+    use_cache = cache is not None and cache.accepts(opref)
+    coalesce = exec_ctx.coalesce and opref.method.upper() == "GET"
+    if not (use_cache or coalesce):
+        return _submit_uncached(exec_ctx, opref, body, headers)
+
+    key = request_key(opref, exec_ctx._auth_identity(opref.headers))
+    if key is None:
+        return _submit_uncached(exec_ctx, opref, body, headers)
+
+    if use_cache:
+        response = cache.get(key)
+        if response is not _MISS:
+            return response
+
+    if coalesce:
+        deadline = _deadline.current()
+        response = _flights.do(
+            (id(exec_ctx.kernel), key),
+            lambda: _submit_uncached(exec_ctx, opref, body, headers),
+            tag=deadline,
+            accept=functools.partial(_shares_outcome, deadline),
+        )
+    else:
+        response = _submit_uncached(exec_ctx, opref, body, headers)
+
+    if use_cache and getattr(response, "status", None) == 200:
+        cache.put(key, response)
+
+    return response
+
+
+def _shares_outcome(
+    mine: Optional[_deadline.Deadline],
+    leader: Optional[_deadline.Deadline],
+    response: object,
+    error: Optional[BaseException],
+) -> bool:
+    """Whether a coalesced caller may take its leader's outcome instead of calling again."""
+
+    if error is None and (getattr(response, "status", None) or 0) < 500:
+        return True
+    if leader is None or leader is mine:
+        return True
+    if leader.cancelled:
+        return False
+    return mine is not None and mine.expires_at <= leader.expires_at
+
+
+def _submit_uncached(exec_ctx: Executor, opref: "object", body: Any, headers) -> object:
+    metrics = exec_ctx.metrics
+    if metrics is None:
+        return _call_kernel(exec_ctx, opref, body, headers)
+    return metrics.call(
+        opref.method, opref.path, lambda: _call_kernel(exec_ctx, opref, body, headers)
+    )
+
+
+def _call_kernel(exec_ctx: Executor, opref: "object", body: Any, headers) -> object:
+    policy = exec_ctx.policy
+    if policy is None:
+        return _route(exec_ctx, opref, body, headers)
+    return policy.run(opref.method, lambda: _route(exec_ctx, opref, body, headers))
+
+
+def _route(exec_ctx: Executor, opref: "object", body: Any, headers) -> object:
+    policy = exec_ctx.policy
+    replicas = exec_ctx.replicas
+    if replicas is not None:
+        targets = replicas.replicas(opref.path)
+        if targets:
+            if policy is not None:
+                authorities = [authority for authority, _ in targets]
+                available = set(policy.available(authorities))
+                targets = [target for target in targets if target[0] in available]
+                if not targets:
+                    raise CircuitOpenError(", ".join(authorities))
+            return replicas.call(
+                opref.method,
+                targets,
+                lambda authority, kernel: _attempt(exec_ctx, authority, kernel, opref, body, headers),
+            )
+
+    authority = None if policy is None else policy.authority(opref.path)
+    return _attempt(exec_ctx, authority, exec_ctx.kernel, opref, body, headers)
+
+
+def _attempt(
+    exec_ctx: Executor, authority: Optional[str], kernel: object, opref: "object", body: Any, headers
+) -> object:
+    policy = exec_ctx.policy
+    if policy is None or authority is None:
+        return _call_on(exec_ctx, kernel, opref, body, headers)
+    return policy.guard(authority, lambda: _call_on(exec_ctx, kernel, opref, body, headers))
+
+
+def _with_deadline_header(headers: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    deadline = _deadline.current()
+    if deadline is None:
+        return headers
+    return [*headers, deadline.header()]
+
+
+def _call_on(exec_ctx: Executor, kernel: object, opref: "object", body: Any, headers) -> object:
+    _deadline.check()
 
     # GETs are always resolved through the kernel's op resolver when available. This avoids
     # leaking "local vs remote" deployment details into per-method decorators and ensures
     # transaction lifetimes remain kernel-owned (resolve_get rolls back automatically).
-    if opref.method.upper() == "GET" and hasattr(exec_ctx.kernel, "resolve_get"):
-        return _kernel_resolve(
-            exec_ctx.kernel, "GET", opref.path, exec_ctx.bearer_token, opref.body
-        )
+    if opref.method.upper() == "GET" and hasattr(kernel, "resolve_get"):
+        return _kernel_resolve(kernel, "GET", opref.path, exec_ctx.bearer_token, body)
+
+    if headers is None:
+        headers = exec_ctx._merge_headers(opref.headers)
+
+    return _kernel_dispatch(kernel, opref.method, opref.path, _with_deadline_header(headers), body)
+
 
-    return _kernel_dispatch(exec_ctx.kernel, opref.method, opref.path, headers, _encode_body(opref.body))
+def execute(
+    opref: "object", *, executor: "Executor | None" = None, timeout: Optional[float] = None
+) -> object:
+    opref = _as_opref(opref)
+    exec_ctx = executor or current()
+    deadline = _deadline.resolve(timeout, exec_ctx.timeout)
+    if deadline is None:
+        return _submit(exec_ctx, opref, _encode_observed(exec_ctx, opref), None)
+    return _deadline.run(
+        deadline, lambda: _submit(exec_ctx, opref, _encode_observed(exec_ctx, opref), None)
+    )
+
+
+def execute_many(
+    oprefs: Iterable["object"],
+    *,
+    executor: "Executor | None" = None,
+    timeout: Optional[float] = None,
+) -> list[object]:
+    """Execute a batch of `OpRef`s in one pass, returning responses in input order."""
+
+    ops = [_as_opref(op) for op in oprefs]
+    exec_ctx = executor or current()
+    deadline = _deadline.resolve(timeout, exec_ctx.timeout)
+    if deadline is None:
+        return _execute_batch(exec_ctx, ops)
+    return _deadline.run(deadline, lambda: _execute_batch(exec_ctx, ops))
+
+
+def _execute_batch(exec_ctx: Executor, ops: list["object"]) -> list[object]:
+    jobs: list[tuple[object, list[int]]] = []
+    seen: dict[object, int] = {}
+    for i, op in enumerate(ops):
+        if op.method.upper() == "GET":
+            key = _dedup_key(op)
+            job = seen.get(key)
+            if job is not None:
+                jobs[job][1].append(i)
+                continue
+            seen[key] = len(jobs)
+        jobs.append((op, [i]))
+
+    bodies = [_encode_observed(exec_ctx, op) for op, _ in jobs]
+    base_headers = exec_ctx._merge_headers(None)
+
+    results: list[object] = [None] * len(ops)
+    for (op, indices), body in zip(jobs, bodies):
+        headers = exec_ctx._merge_headers(op.headers) if op.headers else list(base_headers)
+        response = _submit(exec_ctx, op, body, headers)
+        for i in indices:
+            results[i] = response
+
+    return results
+
+
+async def aexecute(
+    opref: "object", *, executor: "AsyncExecutor | None" = None, timeout: Optional[float] = None
+) -> object:
+    opref = _as_opref(opref)
+    exec_ctx = executor or acurrent()
+    return await exec_ctx._run_until(timeout, execute, opref, executor=exec_ctx._sync)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import contextvars
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional, Union
+
+from . import deadline as _deadline
+from . import executor as _executor
+from .opref import OpRef
+from .ref import Ref
+from .workers import LazyPool
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class _Slot:
+    """Marks where a dependency's value goes in a node's body."""
+
+    index: int
+
+
+@dataclass(slots=True)
+class _Node:
+    op: OpRef
+    body: Any
+    deps: tuple[int, ...]
+    users: list[int] = field(default_factory=list)
+
+
+def _as_op(value: object) -> Optional[OpRef]:
+    if isinstance(value, Ref):
+        return value.op
+    if isinstance(value, OpRef):
+        return value
+    return None
+
+
+def _slot_json(value: object) -> object:
+    if isinstance(value, _Slot):
+        return {"$node": value.index}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _fill(body: Any, values: list[Any]) -> Any:
+    if isinstance(body, _Slot):
+        return values[body.index]
+    if isinstance(body, dict):
+        return {key: _fill(value, values) for key, value in body.items()}
+    if isinstance(body, (list, tuple)):
+        return type(body)(_fill(value, values) for value in body)
+    return body
+
+
+class Graph:
+    """
+    A DAG of deferred ops, built from `Ref`s (or `OpRef`s) whose bodies may embed other `Ref`s.
+
+    Each embedded `Ref` becomes a node which must run first; its decoded value takes the
+    `Ref`'s place in the body of the op which uses it. GETs with the same path, headers and
+    body (after substitution) are one node, so a shared subexpression runs once. A write runs
+    once per distinct `Ref` object.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: list[_Node] = []
+        self._gets: dict[object, int] = {}
+        self._seen: dict[int, int] = {}
+        # Keep every added object alive so that `id()` keys in `_seen` stay unique.
+        self._objects: list[object] = []
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, ref: Union[Ref, OpRef]) -> int:
+        """Add `ref` and everything its body depends on, returning its node index."""
+
+        op = _as_op(ref)
+        if op is None:
+            raise TypeError(f"expected OpRef or Ref, got {type(ref).__name__}")
+        return self._add(ref, op, set())
+
+    def _add(self, ref: object, op: OpRef, visiting: set[int]) -> int:
+        known = self._seen.get(id(ref))
+        if known is not None:
+            return known
+        if id(ref) in visiting:
+            raise ValueError(f"cyclic reference through {op.method} {op.path}")
+
+        visiting.add(id(ref))
+        deps: dict[int, None] = {}
+        body = self._template(op.body, deps, visiting)
+        visiting.discard(id(ref))
+
+        key = None
+        if op.method.upper() == "GET":
+            try:
+                body_key = json.dumps(body, sort_keys=True, separators=(",", ":"), default=_slot_json)
+            except (TypeError, ValueError):
+                body_key = ("object", id(op.body))
+            key = (op.path, op.headers, body_key)
+
+        index = self._gets.get(key) if key is not None else None
+        if index is None:
+            index = len(self._nodes)
+            self._nodes.append(_Node(op, body, tuple(deps)))
+            for dep in deps:
+                self._nodes[dep].users.append(index)
+            if key is not None:
+                self._gets[key] = index
+
+        self._seen[id(ref)] = index
+        self._objects.append(ref)
+        return index
+
+    def _template(self, body: Any, deps: dict[int, None], visiting: set[int]) -> Any:
+        op = _as_op(body)
+        if op is not None:
+            index = self._add(body, op, visiting)
+            deps[index] = None
+            return _Slot(index)
+        if isinstance(body, dict):
+            return {key: self._template(value, deps, visiting) for key, value in body.items()}
+        if isinstance(body, (list, tuple)):
+            return type(body)(self._template(value, deps, visiting) for value in body)
+        return body
+
+    def evaluate(
+        self,
+        *,
+        executor: Optional[_executor.Executor] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> list[Any]:
+        """
+        Run every node, returning the decoded value of each in node order.
+
+        Nodes whose inputs are ready run concurrently, up to `max_workers` at a time, each as
+        its own `tc.execute` in `executor` (by default the current one). Nodes with no data
+        dependency between them, writes included, may run in any order. The first failure
+        stops new nodes from starting and is raised. `timeout` bounds the whole graph.
+        """
+
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        exec_ctx = executor or _executor.current()
+        deadline = _deadline.resolve(timeout, exec_ctx.timeout)
+        if deadline is None:
+            return self._run(exec_ctx, max_workers)
+        return _deadline.run(deadline, lambda: self._run(exec_ctx, max_workers))
+
+    def _call(self, exec_ctx: _executor.Executor, index: int, values: list[Any]) -> Any:
+        import tinychain as tc
+
+        node = self._nodes[index]
+        op = node.op
+        if node.deps:
+            op = OpRef(op.method, op.path, op.headers, _fill(node.body, values), op.cacheable)
+        response = _executor.execute(op, executor=exec_ctx)
+        return tc._decode_observed(exec_ctx.metrics, op, response)
+
+    def _run(self, exec_ctx: _executor.Executor, max_workers: int) -> list[Any]:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        nodes = self._nodes
+        values: list[Any] = [None] * len(nodes)
+        waiting = [len(node.deps) for node in nodes]
+        ready = deque(index for index, count in enumerate(waiting) if count == 0)
+        in_flight: dict[Any, int] = {}
+        pool = graph_pool
+        context = contextvars.copy_context()
+
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < max_workers:
+                    index = ready.popleft()
+                    future = pool.submit(context.copy().run, self._call, exec_ctx, index, values)
+                    in_flight[future] = index
+
+                finished, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = in_flight.pop(future)
+                    values[index] = future.result()
+                    for user in nodes[index].users:
+                        waiting[user] -= 1
+                        if waiting[user] == 0:
+                            ready.append(user)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        return values
+
+
+graph_pool = LazyPool("tinychain-graph", max_workers=32)
+
+
+def evaluate(
+    refs: Union[Iterable[Union[Ref, OpRef]], Mapping[str, Union[Ref, OpRef]]],
+    *,
+    executor: Optional[_executor.Executor] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: Optional[float] = None,
+) -> Union[list[Any], dict[str, Any]]:
+    """
+    Evaluate `refs` as one dependency graph and return their decoded values.
+
+    A list of refs gives a list of values in the same order; a mapping gives a dict with the
+    same keys. See `Graph.evaluate` for scheduling.
+    """
+
+    graph = Graph()
+    if isinstance(refs, Mapping):
+        indices = {name: graph.add(ref) for name, ref in refs.items()}
+        values = graph.evaluate(executor=executor, max_workers=max_workers, timeout=timeout)
+        return {name: values[index] for name, index in indices.items()}
+
+    indices = [graph.add(ref) for ref in refs]
+    values = graph.evaluate(executor=executor, max_workers=max_workers, timeout=timeout)
+    return [values[index] for index in indices]
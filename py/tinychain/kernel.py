@@ -1,33 +1,286 @@
 from __future__ import annotations
 
+import os
 import pathlib
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 
 from .library import Library
+from .routing import LatencyTracker, ReplicaRouter, RoutingTable
 from .uri import URI
 
 
+class KernelRegistry:
+    """A process-wide cache of `KernelHandle`s, keyed by constructor, `data_dir` and arguments."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handles: dict[tuple, object] = {}
+        self._building: dict[tuple, threading.Lock] = {}
+
+    @staticmethod
+    def key(constructor: str, *args: object, data_dir: pathlib.Path) -> tuple:
+        return (constructor, os.path.realpath(data_dir), args)
+
+    def handle(self, constructor: str, *args: object, data_dir: pathlib.Path) -> object:
+        """Return the cached `KernelHandle.<constructor>(*args, data_dir=...)`, built once."""
+
+        key = self.key(constructor, *args, data_dir=data_dir)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                return handle
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._lock:
+                handle = self._handles.get(key)
+            if handle is None:
+                handle = self.build(constructor, *args, data_dir=data_dir)
+                with self._lock:
+                    self._handles[key] = handle
+                    self._building.pop(key, None)
+            return handle
+
+    @staticmethod
+    def build(constructor: str, *args: object, data_dir: pathlib.Path) -> object:
+        """Construct `KernelHandle.<constructor>(*args, data_dir=...)` without caching it."""
+
+        try:
+            import tinychain_local as local  # type: ignore
+        except Exception as exc:  # pragma: no cover
+            raise ImportError(
+                "`tc.kernel.registry` requires the optional `tinychain-local` backend"
+            ) from exc
+
+        return getattr(local.KernelHandle, constructor)(*args, data_dir=str(data_dir))
+
+    def local(self, data_dir: pathlib.Path) -> object:
+        return self.handle("local", data_dir=data_dir)
+
+    def installed(self, data_dir: pathlib.Path, kernel: object = None) -> int:
+        """Drop the handles for `data_dir` other than `kernel`, which just installed into it."""
+
+        root = os.path.realpath(data_dir)
+        with self._lock:
+            keys = [
+                key for key, handle in self._handles.items()
+                if key[1] == root and handle is not kernel
+            ]
+            for key in keys:
+                del self._handles[key]
+        return len(keys)
+
+    def evict(self, data_dir: Optional[pathlib.Path] = None) -> int:
+        """Drop and close the cached handles for `data_dir`, or every handle if it is `None`."""
+
+        root = None if data_dir is None else os.path.realpath(data_dir)
+        with self._lock:
+            keys = [key for key in self._handles if root is None or key[1] == root]
+            handles = [self._handles.pop(key) for key in keys]
+
+        for handle in handles:
+            close = getattr(handle, "close", None)
+            if callable(close):
+                close()
+        return len(handles)
+
+    def close(self) -> None:
+        self.evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._handles)
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            return key in self._handles
+
+
+registry = KernelRegistry()
+
+
+class RoutedKernel:
+    """A local kernel whose requests under a dependency prefix go to that dependency's replicas."""
+
+    def __init__(self, kernel: object, replicas: ReplicaRouter) -> None:
+        self.kernel = kernel
+        self.replicas = replicas
+
+    def _routed(self, method: str, path: str, call: Callable[[object], object]) -> object:
+        targets = self.replicas.replicas(path)
+        if not targets:
+            return call(self.kernel)
+        return self.replicas.call(method, targets, lambda _authority, kernel: call(kernel))
+
+    def dispatch(self, request: object) -> object:
+        return self._routed(request.method, request.path, lambda kernel: kernel.dispatch(request))
+
+    def __getattr__(self, name: str) -> object:
+        attr = getattr(self.kernel, name)
+        if name not in ("resolve_get", "resolve_delete"):
+            return attr
+
+        method = name[len("resolve_"):].upper()
+
+        def resolve(path: str, *args: object, **kwargs: object) -> object:
+            return self._routed(
+                method, path, lambda kernel: getattr(kernel, name)(path, *args, **kwargs)
+            )
+
+        return resolve
+
+
 def for_library(
     library: Library,
     *,
     data_dir: pathlib.Path,
     dependency: Optional[URI] = None,
+    routes: Optional[RoutingTable] = None,
+    hedge_after: Optional[float] = None,
 ) -> "object":
+    """Return a kernel for `library` whose egress is routed to its remote dependencies."""
+
     import tinychain as tc
 
     if not hasattr(tc, "KernelHandle"):
         raise ImportError("`tc.kernel.for_library` requires the optional `tinychain-local` backend")
 
-    dep = dependency or next((d for d in library.dependencies if d.host is not None), None)
+    if routes is None:
+        deps = library.dependencies if dependency is None else (dependency,)
+        routes = RoutingTable.from_dependencies(deps)
 
-    if dep is None or dep.host is None:
+    if not routes:
         raise ValueError(
             "expected at least one dependency with an `authority` to configure egress routing"
         )
 
-    return tc.KernelHandle.with_library_schema_and_dependency_route(
+    # The bindings route one prefix to one authority per kernel, so the library's own egress
+    # goes to the first route; requests for the others are sent to their replicas' kernels.
+    (prefix, authorities), *rest = routes
+    kernel = registry.handle(
+        "with_library_schema_and_dependency_route",
         library.schema_json(),
-        dep.path,
-        dep.authority(),
-        data_dir=str(data_dir),
+        prefix,
+        authorities[0],
+        data_dir=data_dir,
     )
+    if len(authorities) == 1 and not rest:
+        return kernel
+
+    replicas = for_replicas(library, data_dir=data_dir, routes=routes, hedge_after=hedge_after)
+    return RoutedKernel(kernel, replicas)
+
+
+def for_replicas(
+    library: Library,
+    *,
+    data_dir: pathlib.Path,
+    routes: Optional[RoutingTable] = None,
+    hedge_after: Optional[float] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> ReplicaRouter:
+    """Return a `ReplicaRouter` with one kernel per replica of `library`'s remote dependencies."""
+
+    if routes is None:
+        routes = RoutingTable.from_dependencies(library.dependencies)
+
+    if not routes:
+        raise ValueError("expected at least one dependency with an `authority` to route replicas")
+
+    schema_json = library.schema_json()
+
+    def connect(prefix: str, authority: str) -> object:
+        return registry.handle(
+            "with_library_schema_and_dependency_route",
+            schema_json,
+            prefix,
+            authority,
+            data_dir=data_dir,
+        )
+
+    return ReplicaRouter(routes, connect, hedge_after=hedge_after, tracker=tracker)
+
+
+@dataclass
+class RouteWarmup:
+    """Cold and warm timings of one GET issued by `warm`."""
+
+    path: str
+    cold_seconds: float = 0.0
+    warm_seconds: float = 0.0
+    status: Optional[int] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.error is not None or self.warm_seconds <= 0:
+            return None
+        return self.cold_seconds / self.warm_seconds
+
+
+@dataclass
+class WarmReport:
+    """The result of `warm`: one `RouteWarmup` per path, plus the non-GET routes left cold."""
+
+    routes: list[RouteWarmup] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every path answered without raising or returning a server error."""
+
+        return all(
+            route.error is None and route.status is not None and route.status < 500
+            for route in self.routes
+        )
+
+
+def _route_paths(library: object) -> tuple[list[str], list[str]]:
+    from .define import Route
+
+    gets: list[str] = []
+    others: list[str] = []
+    seen: set[str] = set()
+    for cls in type(library).__mro__:
+        for attr_name, attr in vars(cls).items():
+            if not isinstance(attr, Route) or attr_name in seen:
+                continue
+            seen.add(attr_name)
+            path = library.route(attr.name or attr.form.__name__)
+            (gets if attr.method == "GET" else others).append(path)
+    return gets, others
+
+
+def warm(
+    kernel: object,
+    library: object,
+    *,
+    bearer_token: Optional[str] = None,
+) -> WarmReport:
+    """Instantiate `library`'s GET and dependency routes in `kernel` before it serves traffic."""
+
+    from .executor import Executor, _call_kernel
+    from .opref import OpRef
+
+    exec_ctx = Executor(kernel=kernel, bearer_token=bearer_token, coalesce=False)
+    gets, others = _route_paths(library)
+    paths = [library.id().path, *(dep.path for dep in library.dependencies), *gets]
+
+    report = WarmReport(skipped=others)
+    for path in paths:
+        opref = OpRef(method="GET", path=path)
+        route = RouteWarmup(path)
+        report.routes.append(route)
+        try:
+            for attr in ("cold_seconds", "warm_seconds"):
+                start = time.perf_counter()
+                response = _call_kernel(exec_ctx, opref, None, None)
+                setattr(route, attr, time.perf_counter() - start)
+                route.status = getattr(response, "status", None)
+        except Exception as err:
+            route.error = err
+
+    return report
@@ -22,12 +22,7 @@ class Library:
         )
 
     def route(self, *path: str) -> str:
-        return uri.library(
-            publisher=self.publisher,
-            name=self.name,
-            version=self.version,
-            path=list(path) if path else None,
-        ).path
+        return uri._library_path(self.publisher, self.name, self.version, path)
 
     def link(self) -> uri.URI:
         return uri.library_link(
@@ -41,7 +36,7 @@ class Library:
         return {
             "id": self.id().path,
             "version": self.version,
-            "dependencies": [dep.path for dep in self.dependencies],
+            "dependencies": list(dict.fromkeys(dep.path for dep in self.dependencies)),
         }
 
     def schema_json(self) -> str:
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import threading
+from dataclasses import dataclass
+from typing import Optional, Union
+
+
+MANIFEST_NAME = "tc-install-manifest.json"
+
+# Bump to invalidate every recorded digest, e.g. if the install payload format changes.
+_DIGEST_VERSION = b"tinychain-install/1"
+
+_HASH_CHUNK = 1 << 20
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _manifest_lock(path: pathlib.Path) -> threading.Lock:
+    key = os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _update_file(digest: "hashlib._Hash", path: pathlib.Path) -> None:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as data:
+                for offset in range(0, len(data), _HASH_CHUNK):
+                    digest.update(data[offset:offset + _HASH_CHUNK])
+
+
+def content_digest(
+    schema: dict,
+    artifact_path: str,
+    content_type: str,
+    content: Union[bytes, pathlib.Path],
+) -> str:
+    """
+    Hash a library install: its schema plus the artifact it ships.
+
+    `content` is either the artifact bytes or the path of a file holding them, which is hashed
+    without reading it into memory.
+    """
+
+    digest = hashlib.sha256(_DIGEST_VERSION)
+    for part in (
+        json.dumps(schema, sort_keys=True, separators=(",", ":")),
+        artifact_path,
+        content_type,
+    ):
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    digest.update(b"\0")
+
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        digest.update(content)
+    else:
+        _update_file(digest, pathlib.Path(content))
+
+    return f"sha256:{digest.hexdigest()}"
+
+
+@dataclass(frozen=True)
+class SkippedInstall:
+    """
+    Returned in place of a kernel response when an install is skipped because the library is
+    already installed with the same content. Its `status` is 204, as for a successful install.
+    """
+
+    library: str
+    digest: str
+    status: int = 204
+    body: None = None
+
+
+class InstallManifest:
+    """
+    The record of what has been installed into a `data_dir`, keyed by library id.
+
+    The manifest is a JSON file in the `data_dir` root. Updates are merged under a per-path lock
+    and written atomically, so installers running in parallel threads do not lose entries.
+    """
+
+    def __init__(self, data_dir: pathlib.Path) -> None:
+        self.data_dir = pathlib.Path(data_dir)
+        self.path = self.data_dir / MANIFEST_NAME
+
+    def _read(self) -> dict:
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        libraries = manifest.get("libraries") if isinstance(manifest, dict) else None
+        return libraries if isinstance(libraries, dict) else {}
+
+    def digest(self, library: str) -> Optional[str]:
+        entry = self._read().get(library)
+        return entry.get("digest") if isinstance(entry, dict) else None
+
+    def is_current(self, library: str, digest: str) -> bool:
+        """
+        Return whether `library` was last installed with `digest` and its directory still exists.
+        """
+
+        if self.digest(library) != digest:
+            return False
+        return self.data_dir.joinpath(*library.strip("/").split("/")).is_dir()
+
+    def record(self, library: str, digest: str) -> None:
+        with _manifest_lock(self.path):
+            libraries = self._read()
+            libraries[library] = {"digest": digest}
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(
+                json.dumps({"libraries": libraries}, sort_keys=True, indent=2),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Callable, Iterable
+
+
+# Latency histogram bucket upper bounds, in seconds (the Prometheus client defaults).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+PHASES = ("encode", "kernel", "decode")
+
+
+def default_path_template(path: str) -> str:
+    """
+    Map a request path onto a low-cardinality metrics label.
+
+    `/lib/...` and `/service/...` paths name a versioned route and are kept as-is. `/state/...`
+    paths embed keys, so only the namespace and collection are kept.
+    """
+
+    if path.startswith("/state/"):
+        segments = path.split("/", 4)
+        if len(segments) > 4:
+            return "/".join(segments[:4]) + "/..."
+    return path
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        buckets = []
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            buckets.append((_format_bound(bound), total))
+        return buckets
+
+
+class Metrics:
+    """
+    Per-route client metrics for an `Executor`.
+
+    Records latency histograms for each (method, path template, phase), counters of response
+    status codes, and in-flight request gauges. Executors without a `Metrics` instance skip all
+    of this, so instrumentation costs nothing unless it is enabled.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        path_template: Callable[[str], str] = default_path_template,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.path_template = path_template
+        self.clock = clock
+        self._latency: dict[tuple[str, str, str], Histogram] = {}
+        self._status: dict[tuple[str, str, str], int] = {}
+        self._in_flight: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, path: str, phase: str, seconds: float) -> None:
+        if phase not in PHASES:
+            raise ValueError(f"unknown phase {phase!r} (expected one of {PHASES})")
+
+        key = (method.upper(), self.path_template(path), phase)
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record_status(self, method: str, path: str, status: object) -> None:
+        key = (method.upper(), self.path_template(path), str(status))
+        with self._lock:
+            self._status[key] = self._status.get(key, 0) + 1
+
+    def _add_in_flight(self, key: tuple[str, str], delta: int) -> None:
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + delta
+
+    def call(self, method: str, path: str, fn: Callable[[], object]) -> object:
+        """Run the kernel call `fn`, tracking it as in flight and timing its `kernel` phase."""
+
+        key = (method.upper(), self.path_template(path))
+        self._add_in_flight(key, 1)
+        start = self.clock()
+        try:
+            return fn()
+        finally:
+            elapsed = self.clock() - start
+            self._add_in_flight(key, -1)
+            self.observe(method, path, "kernel", elapsed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._status.clear()
+            self._in_flight.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latency: dict[str, dict[str, dict]] = {}
+            for (method, path, phase), histogram in sorted(self._latency.items()):
+                latency.setdefault(f"{method} {path}", {})[phase] = {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": dict(histogram.cumulative()),
+                }
+
+            status: dict[str, dict[str, int]] = {}
+            for (method, path, code), count in sorted(self._status.items()):
+                status.setdefault(f"{method} {path}", {})[code] = count
+
+            in_flight = {
+                f"{method} {path}": count for (method, path), count in sorted(self._in_flight.items())
+            }
+
+        return {"latency": latency, "status": status, "in_flight": in_flight}
+
+    def prometheus(self, *, prefix: str = "tinychain_client") -> str:
+        """Render the current metrics in the Prometheus text exposition format."""
+
+        with self._lock:
+            latency = sorted((key, h.count, h.sum, h.cumulative()) for key, h in self._latency.items())
+            status = sorted(self._status.items())
+            in_flight = sorted(self._in_flight.items())
+
+        lines = [
+            f"# HELP {prefix}_latency_seconds Client-side request latency by phase.",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for (method, path, phase), count, total, buckets in latency:
+            labels = _labels(method=method, path=path, phase=phase)
+            for bound, cumulative in buckets:
+                lines.append(f"{prefix}_latency_seconds_bucket{{{labels},le=\"{bound}\"}} {cumulative}")
+            lines.append(f"{prefix}_latency_seconds_sum{{{labels}}} {total!r}")
+            lines.append(f"{prefix}_latency_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            f"# HELP {prefix}_responses_total Responses returned to callers, by status code.",
+            f"# TYPE {prefix}_responses_total counter",
+        ]
+        for (method, path, code), count in status:
+            lines.append(f"{prefix}_responses_total{{{_labels(method=method, path=path, status=code)}}} {count}")
+
+        lines += [
+            f"# HELP {prefix}_in_flight Kernel calls currently in flight.",
+            f"# TYPE {prefix}_in_flight gauge",
+        ]
+        for (method, path), count in in_flight:
+            lines.append(f"{prefix}_in_flight{{{_labels(method=method, path=path)}}} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
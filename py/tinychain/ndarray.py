@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+from . import decode as _decode
+
+
+def _numpy():
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("`tc.ndarray` requires NumPy (`pip install numpy`)") from exc
+    return np
+
+
+def is_ndarray(value: object) -> bool:
+    # Checked without importing NumPy, so plain JSON bodies never pay for it.
+    cls = type(value)
+    return cls.__name__ == "ndarray" and cls.__module__ == "numpy"
+
+
+def json_default(value: object) -> Any:
+    """A `json.dumps(default=...)` hook which converts NumPy arrays and scalars in bulk."""
+
+    tolist = getattr(value, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return tolist()
+
+
+def dumps(array: Any) -> str:
+    """
+    Encode an `ndarray` as a (nested) JSON list.
+
+    Uses `orjson`'s native NumPy serializer when it is installed; otherwise converts the array
+    with `ndarray.tolist()` in a single C-level pass before encoding.
+    """
+
+    orjson = _decode.orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        except TypeError:
+            # e.g. non-contiguous arrays or dtypes orjson does not serialize natively
+            pass
+    return json.dumps(array.tolist(), separators=(",", ":"))
+
+
+def _buffer(value: object) -> Optional[memoryview]:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return memoryview(value)
+    to_bytes = getattr(value, "to_bytes", None)
+    if callable(to_bytes):
+        return memoryview(to_bytes())
+    return None
+
+
+def decode_json_body(
+    response: "object",
+    *,
+    dtype: Any = None,
+    shape: Optional[tuple[int, ...]] = None,
+) -> Any:
+    """
+    Decode a dense numeric response body as an `ndarray`.
+
+    If the kernel hands back a binary buffer (bytes-like, or a value with `to_bytes()`), the array
+    is a zero-copy view of it, interpreted as `dtype` (default `float64`) and reshaped to `shape`.
+    Otherwise the JSON body is parsed once and converted with a single `numpy.asarray` call.
+    """
+
+    np = _numpy()
+
+    body = getattr(response, "body", None)
+    if body is None:
+        raise AssertionError("response missing body")
+
+    value = body.value()
+    buffer = _buffer(value)
+    if buffer is not None:
+        array = np.frombuffer(buffer, dtype=np.float64 if dtype is None else dtype)
+    else:
+        text = value.to_json() if hasattr(value, "to_json") else value
+        array = np.asarray(_decode.decode_text(text), dtype=dtype)
+
+    return array if shape is None else array.reshape(shape)
+
+
+def execute(
+    op: "object",
+    *,
+    dtype: Any = None,
+    shape: Optional[tuple[int, ...]] = None,
+) -> Any:
+    """Like `tc.execute`, but decode a 200 response as an `ndarray`."""
+
+    from . import executor as _executor
+
+    response = _executor.execute(op)
+    status = getattr(response, "status", None)
+    if status != 200:
+        raise AssertionError(f"unexpected status {status}")
+    return decode_json_body(response, dtype=dtype, shape=shape)
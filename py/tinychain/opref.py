@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from typing import Any, Generic, Iterable, Optional, TypeVar
+from typing import Any, Generic, Iterable, Mapping, Optional, TypeVar
+
+from . import ndarray as _ndarray
 
 
 T = TypeVar("T")
 
+# A one-entry map from a path to a list encodes a GET (`[key]`) or a PUT (`[key, value]`), so a
+# DELETE is encoded under this subject instead, as `[path, key]`.
+DELETE_SUBJECT = "/state/scalar/ref/op/delete"
+
 
 @dataclass(frozen=True, slots=True)
 class OpRef(Generic[T]):
@@ -13,6 +20,7 @@ class OpRef(Generic[T]):
     path: str
     headers: tuple[tuple[str, str], ...] = ()
     body: Any = None
+    cacheable: Optional[bool] = None
 
     def with_headers(self, headers: Optional[Iterable[tuple[str, str]]]) -> "OpRef[T]":
         if not headers:
@@ -22,4 +30,41 @@ class OpRef(Generic[T]):
             path=self.path,
             headers=self.headers + tuple(headers),
             body=self.body,
+            cacheable=self.cacheable,
         )
+
+    def to_json(self) -> str:
+        """
+        Encode this op as a `TCRef`, for the kernel to resolve. Any `Ref` or `OpRef` in the body
+        is encoded the same way, nested, so a chain of dependent ops becomes one payload.
+        """
+
+        return json.dumps(self, separators=(",", ":"), default=json_default)
+
+
+def _tcref(op: OpRef) -> dict:
+    method = op.method.upper()
+    body = op.body
+    if method == "GET":
+        return {op.path: [] if body is None else [body]}
+    if method == "PUT":
+        return {op.path: [None, body]}
+    if method == "POST":
+        if body is not None and not isinstance(body, Mapping):
+            raise TypeError(f"a nested POST {op.path} needs a map body, got {type(body).__name__}")
+        return {op.path: dict(body or {})}
+    if method == "DELETE":
+        return {DELETE_SUBJECT: [op.path, body]}
+    raise ValueError(f"cannot encode a {op.method} op as a TCRef")
+
+
+def json_default(value: object) -> Any:
+    """
+    A `json.dumps(default=...)` hook which encodes a `Ref` or `OpRef` as its `TCRef` and converts
+    NumPy arrays and scalars in bulk.
+    """
+
+    op = getattr(value, "op", value)
+    if isinstance(op, OpRef):
+        return _tcref(op)
+    return _ndarray.json_default(value)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from . import deadline as _deadline
+from .routing import RoutingTable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses which mean the dependency (not the request) failed, so a GET may be retried.
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an authority whose circuit breaker is open."""
+
+    def __init__(self, authority: str) -> None:
+        super().__init__(f"circuit breaker for {authority} is open")
+        self.authority = authority
+
+
+def _failed(response: object) -> bool:
+    return (getattr(response, "status", None) or 0) >= 500
+
+
+class CircuitBreaker:
+    """Fails calls to one authority fast once it keeps failing."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= 0:
+            raise ValueError(f"failure_threshold must be positive, got {failure_threshold}")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probed_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        elif (
+            self._state == HALF_OPEN
+            and self._probes
+            and self.clock() - self._probed_at >= self.reset_timeout
+        ):
+            self._probes = 0  # the outstanding probes are presumed lost
+        return self._state
+
+    def allows(self) -> bool:
+        """Return whether a call would currently be let through, without reserving a probe."""
+
+        with self._lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_max)
+
+    def acquire(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                self._probed_at = self.clock()
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a probe reservation whose call was abandoned before it had an outcome."""
+
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != OPEN:
+                    self.opened += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class RetryBudget:
+    """A token bucket which bounds retries to a fraction of traffic across the executor."""
+
+    def __init__(self, *, ratio: float = 0.1, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._tokens = min(min_tokens, max_tokens)
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+
+class Policy:
+    """Retries and per-authority circuit breaking for an executor's kernel calls."""
+
+    def __init__(
+        self,
+        *,
+        retries: int = 2,
+        backoff: float = 0.05,
+        max_backoff: float = 1.0,
+        budget: Optional[RetryBudget] = None,
+        routes: Optional[RoutingTable] = None,
+        breaker: Callable[[], CircuitBreaker] = CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if retries < 0:
+            raise ValueError(f"retries must be non-negative, got {retries}")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget or RetryBudget()
+        self.routes = routes
+        self._breaker = breaker
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.retried = 0
+
+    def breaker(self, authority: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(authority)
+            if breaker is None:
+                breaker = self._breakers[authority] = self._breaker()
+            return breaker
+
+    def authority(self, path: str) -> Optional[str]:
+        """The authority a single-route kernel sends `path` to, if `routes` covers it."""
+
+        if self.routes is None:
+            return None
+        authorities = self.routes.authorities(path)
+        return authorities[0] if authorities else None
+
+    def available(self, authorities: list[str]) -> list[str]:
+        return [authority for authority in authorities if self.breaker(authority).allows()]
+
+    def guard(self, authority: Optional[str], call: Callable[[], object]) -> object:
+        """Run one attempt against `authority` through its circuit breaker."""
+
+        if authority is None:
+            return call()
+
+        # A call out of time never reaches the kernel, so it says nothing about the authority.
+        _deadline.check()
+        breaker = self.breaker(authority)
+        if not breaker.acquire():
+            raise CircuitOpenError(authority)
+
+        try:
+            response = call()
+        except _deadline.DeadlineExceeded:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        if _failed(response):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _delay(self, attempt: int) -> float:
+        import random
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def run(self, method: str, call: Callable[[], object]) -> object:
+        """Run `call`, retrying it if it is a GET which failed and the budget allows."""
+
+        self.budget.deposit()
+        if method.upper() != "GET":
+            return call()
+
+        attempt = 0
+        while True:
+            try:
+                response = call()
+            except CircuitOpenError:
+                raise
+            except Exception:
+                if not self._retry(attempt):
+                    raise
+            else:
+                if getattr(response, "status", None) not in RETRY_STATUSES or not self._retry(attempt):
+                    return response
+            attempt += 1
+
+    def _retry(self, attempt: int) -> bool:
+        if attempt >= self.retries:
+            return False
+
+        delay = self._delay(attempt)
+        deadline = _deadline.current()
+        if deadline is not None and deadline.remaining() <= delay:
+            return False
+
+        if not self.budget.withdraw():
+            return False
+        with self._lock:
+            self.retried += 1
+        self._sleep(delay)
+        return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+            retried = self.retried
+        return {
+            "breakers": {authority: breaker.snapshot() for authority, breaker in breakers.items()},
+            "retried": retried,
+            "budget": {"tokens": self.budget.tokens, "exhausted": self.budget.exhausted},
+        }
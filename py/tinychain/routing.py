@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from typing import Callable, Iterable, Mapping, Optional, Sequence, Union
+
+from . import deadline as _deadline
+from .uri import URI
+from .workers import ElasticPool
+
+
+def _canonical_prefix(prefix: str) -> str:
+    if not prefix.startswith("/"):
+        raise ValueError(f"route prefix must start with '/': {prefix}")
+    prefix = prefix.rstrip("/")
+    if not prefix:
+        raise ValueError("the root path cannot be routed to a dependency")
+    return prefix
+
+
+class RoutingTable:
+    """
+    Maps canonical path prefixes (e.g. `/lib/<publisher>/<name>/<version>`) to the authorities
+    (`host[:port]`) which serve them. A prefix may have several authorities, which are replicas.
+
+    `resolve(path)` uses longest-prefix matching on whole path segments, so `/lib/a/b/1.0`
+    matches `/lib/a/b/1.0/hello` but not `/lib/a/b/1.0.1`.
+    """
+
+    __slots__ = ("_routes",)
+
+    def __init__(self, routes: Optional[Mapping[str, Sequence[str]]] = None) -> None:
+        self._routes: dict[str, tuple[str, ...]] = {}
+        for prefix, authorities in (routes or {}).items():
+            for authority in authorities:
+                self.add(prefix, authority)
+
+    @classmethod
+    def from_dependencies(cls, dependencies: Iterable[URI]) -> "RoutingTable":
+        """
+        Route every dependency which has an authority. Dependencies repeated with different
+        authorities are replicas of the same prefix.
+        """
+
+        table = cls()
+        for dep in dependencies:
+            if dep.host is not None:
+                table.add(dep.path, dep.authority())
+        return table
+
+    def add(self, prefix: str, authority: Union[str, URI]) -> None:
+        if isinstance(authority, URI):
+            authority = authority.authority()
+        if not authority:
+            raise ValueError(f"expected an authority for route {prefix}")
+
+        prefix = _canonical_prefix(prefix)
+        replicas = self._routes.get(prefix, ())
+        if authority not in replicas:
+            self._routes[prefix] = (*replicas, authority)
+
+    def resolve(self, path: str) -> Optional[tuple[str, tuple[str, ...]]]:
+        """Return the longest `(prefix, authorities)` route covering `path`, if any."""
+
+        routes = self._routes
+        if not routes:
+            return None
+
+        candidate = path.rstrip("/")
+        while candidate:
+            replicas = routes.get(candidate)
+            if replicas is not None:
+                return candidate, replicas
+            candidate = candidate[: candidate.rfind("/")]
+        return None
+
+    def authorities(self, path: str) -> tuple[str, ...]:
+        route = self.resolve(path)
+        return route[1] if route is not None else ()
+
+    def prefixes(self) -> list[str]:
+        """Every routed prefix, longest first."""
+
+        return sorted(self._routes, key=lambda prefix: (-len(prefix), prefix))
+
+    def to_json(self) -> str:
+        return json.dumps(
+            [
+                {"prefix": prefix, "authorities": list(self._routes[prefix])}
+                for prefix in self.prefixes()
+            ],
+            separators=(",", ":"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __iter__(self):
+        return iter(self._routes.items())
+
+    def __repr__(self) -> str:
+        return f"RoutingTable({self._routes!r})"
+
+
+class LatencyTracker:
+    """
+    An exponentially weighted moving average (EWMA) of response latency per authority.
+
+    A failed call counts as a `failure_penalty`-second sample. An estimate decays toward zero
+    with a `half_life` (in seconds) while its authority gets no traffic, so a replica which
+    was slow or down is tried again once it has had time to recover.
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.3,
+        half_life: float = 30.0,
+        failure_penalty: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.half_life = half_life
+        self.failure_penalty = failure_penalty
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._estimates: dict[str, tuple[float, float]] = {}
+
+    def observe(self, authority: str, seconds: float) -> None:
+        now = self.clock()
+        with self._lock:
+            estimate = self._estimates.get(authority)
+            if estimate is not None:
+                seconds = self.alpha * seconds + (1 - self.alpha) * self._decayed(estimate, now)
+            self._estimates[authority] = (seconds, now)
+
+    def failure(self, authority: str) -> None:
+        self.observe(authority, self.failure_penalty)
+
+    def _decayed(self, estimate: tuple[float, float], now: float) -> float:
+        value, observed_at = estimate
+        if self.half_life <= 0:
+            return value
+        return value * 0.5 ** ((now - observed_at) / self.half_life)
+
+    def estimate(self, authority: str) -> Optional[float]:
+        with self._lock:
+            estimate = self._estimates.get(authority)
+            return None if estimate is None else self._decayed(estimate, self.clock())
+
+    def rank(self, authorities: Sequence[str]) -> list[str]:
+        """
+        Order `authorities` fastest first. Authorities with no samples yet come first, so each
+        replica is measured before the tracker settles on one.
+        """
+
+        now = self.clock()
+        with self._lock:
+            scores = {
+                authority: self._decayed(estimate, now)
+                for authority in authorities
+                if (estimate := self._estimates.get(authority)) is not None
+            }
+        return sorted(authorities, key=lambda authority: scores.get(authority, -1.0))
+
+    def snapshot(self) -> dict[str, float]:
+        now = self.clock()
+        with self._lock:
+            return {
+                authority: self._decayed(estimate, now)
+                for authority, estimate in self._estimates.items()
+            }
+
+
+# A hedged attempt to a hung replica keeps its worker, so attempts must not queue behind them.
+hedge_pool = ElasticPool("tinychain-hedge")
+
+
+class ReplicaRouter:
+    """
+    Sends requests under a routed prefix to one of that prefix's replicas.
+
+    Each replica is reached through its own kernel, built on first use by `connect(prefix,
+    authority)` and kept for reuse. The replica with the lowest EWMA latency is chosen. If
+    `hedge_after` is set, a GET which has not answered after that many seconds is also sent to
+    the next-best replica, and whichever answers first wins. Only GETs are hedged, because they
+    are idempotent.
+    """
+
+    def __init__(
+        self,
+        routes: RoutingTable,
+        connect: Callable[[str, str], object],
+        *,
+        hedge_after: Optional[float] = None,
+        tracker: Optional[LatencyTracker] = None,
+    ) -> None:
+        if hedge_after is not None and hedge_after < 0:
+            raise ValueError(f"hedge_after must be non-negative, got {hedge_after}")
+        self.routes = routes
+        self.connect = connect
+        self.hedge_after = hedge_after
+        self.tracker = tracker or LatencyTracker()
+        self.hedged = 0
+        self._lock = threading.Lock()
+        self._kernels: dict[tuple[str, str], object] = {}
+
+    def _kernel(self, prefix: str, authority: str) -> object:
+        key = (prefix, authority)
+        with self._lock:
+            kernel = self._kernels.get(key)
+        if kernel is None:
+            kernel = self.connect(prefix, authority)
+            with self._lock:
+                kernel = self._kernels.setdefault(key, kernel)
+        return kernel
+
+    def replicas(self, path: str) -> Optional[list[tuple[str, object]]]:
+        """Return the `(authority, kernel)` replicas serving `path`, fastest first."""
+
+        route = self.routes.resolve(path)
+        if route is None:
+            return None
+        prefix, authorities = route
+        return [
+            (authority, self._kernel(prefix, authority))
+            for authority in self.tracker.rank(authorities)
+        ]
+
+    def _timed(
+        self, authority: str, kernel: object, call: Callable[[str, object], object]
+    ) -> object:
+        start = time.perf_counter()
+        try:
+            response = call(authority, kernel)
+        except Exception:
+            self.tracker.failure(authority)
+            raise
+        if (getattr(response, "status", None) or 0) >= 500:
+            self.tracker.failure(authority)
+        else:
+            self.tracker.observe(authority, time.perf_counter() - start)
+        return response
+
+    def call(
+        self,
+        method: str,
+        replicas: list[tuple[str, object]],
+        call: Callable[[str, object], object],
+    ) -> object:
+        """Run `call(authority, kernel)` against the best replica, hedging GETs if configured."""
+
+        if self.hedge_after is None or method.upper() != "GET" or len(replicas) < 2:
+            authority, kernel = replicas[0]
+            return self._timed(authority, kernel, call)
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pool = hedge_pool
+        context = contextvars.copy_context()
+        submit = lambda replica: pool.submit(context.copy().run, self._timed, *replica, call)  # noqa: E731
+        pending = {submit(replicas[0])}
+        backups = iter(replicas[1:2])
+        timeout: Optional[float] = self.hedge_after
+        error: Optional[BaseException] = None
+        deadline = _deadline.current()
+
+        while pending:
+            if deadline is not None:
+                remaining = deadline.remaining()
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not done and deadline is not None:
+                deadline.check()
+
+            # Hedge once `hedge_after` passes, or fail over at once if the primary failed.
+            backup = next(backups, None)
+            if backup is not None:
+                if not done:
+                    with self._lock:
+                        self.hedged += 1
+                pending.add(submit(backup))
+            timeout = None
+
+        assert error is not None
+        raise error
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import dataclasses
+import hashlib
+import heapq
+import json
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from . import deadline as _deadline
+from . import executor as _executor
+from . import uri as _uri
+from .opref import OpRef
+from .uri import URI
+from .workers import LazyPool
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+_MASK = (1 << 64) - 1
+_RING = float(1 << 64)
+
+Host = Union[str, URI]
+
+
+def _splitmix64(value: int) -> int:
+    z = (value + 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _digest(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def key_hash(key: Any) -> int:
+    """
+    The 64-bit position of a collection key on the ring.
+
+    Integers are mixed with splitmix64, which is also computed in bulk for NumPy integer arrays.
+    Other keys are hashed with BLAKE2b: strings and bytes directly, anything else (e.g. a
+    BTree key tuple or a Table row key) as canonical JSON. Every encoding is type-tagged, so
+    `1` and `"1"` land in different places.
+    """
+
+    if isinstance(key, int) and not isinstance(key, bool):
+        return _splitmix64(key & _MASK)
+    if isinstance(key, str):
+        return _digest(b"s" + key.encode("utf-8"))
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return _digest(b"b" + bytes(key))
+    tolist = getattr(key, "tolist", None)
+    if tolist is not None:  # a NumPy scalar
+        return key_hash(tolist())
+    return _digest(b"j" + json.dumps(key, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+
+def _host(host: Host) -> URI:
+    if isinstance(host, str):
+        host = URI.parse(host)
+    if host.host is None:
+        raise ValueError(f"a shard host needs an authority, got {host}")
+    return URI(scheme=host.scheme, host=host.host, port=host.port)
+
+
+def _integer_array(keys: object) -> bool:
+    cls = type(keys)
+    if cls.__name__ != "ndarray" or cls.__module__ != "numpy":
+        return False
+    return keys.dtype.kind in "iu"  # type: ignore[attr-defined]
+
+
+class HashRing:
+    """
+    A consistent-hash ring which assigns collection keys to host authorities.
+
+    Each host owns `vnodes * weight` points on a 64-bit ring, and a key belongs to the host
+    owning the first point at or after the key's hash. A host's points depend only on its own
+    authority, so when a host joins it takes over roughly its share of keys from the others,
+    and when it leaves only its own keys move.
+    """
+
+    def __init__(
+        self,
+        hosts: Union[Mapping[Host, float], Iterable[Host]] = (),
+        *,
+        vnodes: int = 128,
+    ) -> None:
+        if vnodes <= 0:
+            raise ValueError(f"vnodes must be positive, got {vnodes}")
+        self.vnodes = vnodes
+        self._hosts: dict[str, tuple[URI, float]] = {}
+        self._points: list[int] = []
+        self._owners: list[int] = []
+        self._order: list[URI] = []
+        self._arrays: Optional[tuple[Any, Any]] = None
+
+        weighted = hosts.items() if isinstance(hosts, Mapping) else ((host, 1.0) for host in hosts)
+        for host, weight in weighted:
+            self._put(host, weight)
+        self._rebuild()
+
+    def _put(self, host: Host, weight: float) -> None:
+        if weight <= 0:
+            raise ValueError(f"weight must be positive, got {weight}")
+        host = _host(host)
+        self._hosts[host.authority()] = (host, float(weight))
+
+    def add(self, host: Host, weight: float = 1.0) -> None:
+        """Add `host` (or change its weight)."""
+
+        self._put(host, weight)
+        self._rebuild()
+
+    def remove(self, host: Host) -> None:
+        authority = _host(host).authority()
+        if authority not in self._hosts:
+            raise KeyError(authority)
+        del self._hosts[authority]
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._order = [host for host, _weight in self._hosts.values()]
+        points: list[tuple[int, int]] = []
+        for index, (host, weight) in enumerate(self._hosts.values()):
+            label = host.authority().encode("utf-8")
+            for replica in range(max(1, round(self.vnodes * weight))):
+                points.append((_digest(label + b"#" + str(replica).encode("ascii")), index))
+        points.sort()
+
+        self._points = [point for point, _index in points]
+        self._owners = [index for _point, index in points]
+        if self._owners:
+            # A hash past the last point wraps around to the first one.
+            self._owners.append(self._owners[0])
+        self._arrays = None
+
+    @property
+    def hosts(self) -> tuple[URI, ...]:
+        return tuple(self._order)
+
+    def weight(self, host: Host) -> float:
+        return self._hosts[_host(host).authority()][1]
+
+    def _require_hosts(self) -> None:
+        if not self._points:
+            raise LookupError("the hash ring has no hosts")
+
+    def host(self, key: Any) -> URI:
+        self._require_hosts()
+        return self._order[self._owners[bisect.bisect_left(self._points, key_hash(key))]]
+
+    def indices(self, keys: Union[Sequence[Any], Any]) -> Any:
+        """
+        The index into `hosts` of each key's shard.
+
+        A NumPy integer array is hashed and placed in bulk (one `searchsorted` over the ring)
+        and an array of indices is returned; any other sequence gives a list.
+        """
+
+        self._require_hosts()
+        if _integer_array(keys):
+            return self._indices_array(keys)
+
+        points, owners, locate = self._points, self._owners, bisect.bisect_left
+        return [owners[locate(points, key_hash(key))] for key in keys]
+
+    def _indices_array(self, keys: Any) -> Any:
+        from .ndarray import _numpy
+
+        np = _numpy()
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self._points, dtype=np.uint64),
+                np.asarray(self._owners, dtype=np.intp),
+            )
+        points, owners = self._arrays
+
+        with np.errstate(over="ignore"):
+            z = keys.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            z = z ^ (z >> np.uint64(31))
+        return owners[np.searchsorted(points, z, side="left")]
+
+    def assign(self, keys: Union[Sequence[Any], Any]) -> list[URI]:
+        """The host of each key, in order."""
+
+        order = self._order
+        return [order[index] for index in self.indices(keys)]
+
+    def partition(self, keys: Union[Sequence[Any], Any]) -> dict[URI, Any]:
+        """
+        Group `keys` by host, keeping their relative order, e.g. to send one request per shard.
+        A NumPy integer array is split into one array per host.
+        """
+
+        indices = self.indices(keys)
+        if _integer_array(keys):
+            return {
+                self._order[index]: keys[indices == index]
+                for index in sorted(set(indices.tolist()))
+            }
+
+        groups: dict[int, list[Any]] = {}
+        for key, index in zip(keys, indices):
+            groups.setdefault(index, []).append(key)
+        return {self._order[index]: group for index, group in groups.items()}
+
+    def locate(self, key: Any, *, namespace: str, path: Optional[Iterable[str]] = None) -> URI:
+        """The collection at `tc.uri.state(namespace=..., path=...)` on the host which owns `key`."""
+
+        host = self.host(key)
+        return URI(
+            path=_uri.state(namespace=namespace, path=path),
+            scheme=host.scheme,
+            host=host.host,
+            port=host.port,
+        )
+
+    def ownership(self) -> dict[URI, float]:
+        """The fraction of the ring (and so, of uniformly hashed keys) each host owns."""
+
+        shares = [0.0] * len(self._order)
+        points, owners = self._points, self._owners
+        for position, point in enumerate(points):
+            previous = points[position - 1] if position else points[-1] - (1 << 64)
+            shares[owners[position]] += (point - previous) / _RING
+        return dict(zip(self._order, shares))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, host: object) -> bool:
+        if not isinstance(host, (str, URI)):
+            return False
+        return _host(host).authority() in self._hosts
+
+    def __repr__(self) -> str:
+        weights = {authority: weight for authority, (_host, weight) in self._hosts.items()}
+        return f"HashRing({weights!r}, vnodes={self.vnodes})"
+
+
+scan_pool = LazyPool("tinychain-shard", max_workers=32)
+
+
+_START = object()
+
+
+@dataclasses.dataclass
+class _Shard:
+    host: URI
+    executor: _executor.Executor
+    rows: deque = dataclasses.field(default_factory=deque)
+    after: Any = _START
+    requested: int = 0
+    exhausted: bool = False
+    pending: Optional[Future] = None
+
+
+def scan(
+    ring: Union[HashRing, Iterable[Host]],
+    *,
+    namespace: str,
+    path: Optional[Iterable[str]] = None,
+    connect: Callable[[URI], object],
+    body: Optional[Mapping[str, Any]] = None,
+    key: Optional[Callable[[Any], Any]] = None,
+    limit: Optional[int] = None,
+    page_size: int = 1000,
+    executor: Optional[_executor.Executor] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Any]:
+    """
+    Read a range from every shard of a collection at once, yielding rows in global key order.
+
+    Each host in `ring` is reached through `connect(host)`, a kernel routed to that host, and is
+    read in pages: a GET of `tc.uri.state(namespace=..., path=...)` whose body is `body` (e.g. the
+    range bounds) plus `"limit"` (the page size) and, after the first page, `"after"` (the key of
+    the last row received). A shard answers with a list of rows in key order, where a short
+    page means the shard has no more rows.
+
+    The first page of every shard is requested concurrently, so a sorted scan costs about one
+    round trip, and the pages are merged with a heap on `key(row)` (the row itself by default).
+    Each shard holds at most one buffered page plus one in flight. With a `limit`, no shard is
+    asked for more rows than could still be yielded, and the scan stops once `limit` rows have
+    been yielded. `timeout` bounds the whole scan. Closing the iterator early abandons the
+    pages still in flight.
+
+    Pages go through a copy of `executor` (by default the current one), so its credentials,
+    policy, metrics and timeout apply to every page. Its response cache and replicas do not.
+    """
+
+    if page_size <= 0:
+        raise ValueError(f"page_size must be positive, got {page_size}")
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must be non-negative, got {limit}")
+
+    hosts = ring.hosts if isinstance(ring, HashRing) else tuple(_host(host) for host in ring)
+    exec_ctx = executor or _executor.current()
+    return _scan(
+        [
+            _Shard(host, dataclasses.replace(
+                exec_ctx, kernel=connect(host), cache=None, replicas=None, _token=None
+            ))
+            for host in hosts
+        ],
+        _uri.state(namespace=namespace, path=path),
+        dict(body or {}),
+        key or (lambda row: row),
+        limit,
+        page_size,
+        _deadline.resolve(timeout),
+    )
+
+
+def _scan(
+    shards: list[_Shard],
+    state_path: str,
+    body: dict[str, Any],
+    key: Callable[[Any], Any],
+    limit: Optional[int],
+    page_size: int,
+    deadline: Optional[_deadline.Deadline],
+) -> Iterator[Any]:
+    import tinychain as tc
+
+    pool = scan_pool
+    context = contextvars.copy_context()
+    yielded = 0
+
+    def fetch(shard: _Shard, op: OpRef) -> list:
+        with contextlib.ExitStack() as stack:
+            if deadline is not None:
+                stack.enter_context(_deadline.enforced(deadline))
+            response = _executor.execute(op, executor=shard.executor)
+            rows = tc._decode_observed(shard.executor.metrics, op, response)
+        if rows is None:
+            return []
+        if not isinstance(rows, list):
+            raise TypeError(f"expected a page of rows from {shard.host}, got {type(rows).__name__}")
+        return rows
+
+    def request(shard: _Shard) -> None:
+        count = page_size
+        if limit is not None:
+            count = min(count, limit - yielded - len(shard.rows))
+        if shard.exhausted or count <= 0:
+            return
+
+        page = dict(body, limit=count)
+        if shard.after is not _START:
+            page["after"] = shard.after
+        shard.requested = count
+        shard.pending = pool.submit(context.copy().run, fetch, shard, OpRef("GET", state_path, body=page))
+
+    def receive(shard: _Shard) -> None:
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        future, shard.pending = shard.pending, None
+        try:
+            rows = future.result(timeout=None if deadline is None else deadline.remaining())
+        except FutureTimeout:
+            deadline.cancel()
+            raise _deadline.DeadlineExceeded("deadline exceeded") from None
+
+        shard.rows.extend(rows)
+        if len(rows) < shard.requested:
+            shard.exhausted = True
+        else:
+            shard.after = key(rows[-1])
+            # Prefetch the next page while this one is merged.
+            request(shard)
+
+    heap: list[tuple[Any, int, Any]] = []
+
+    def push(index: int) -> None:
+        row = shards[index].rows.popleft()
+        heapq.heappush(heap, (key(row), index, row))
+
+    try:
+        if limit == 0:
+            return
+        for shard in shards:
+            request(shard)
+        for index, shard in enumerate(shards):
+            receive(shard)
+            if shard.rows:
+                push(index)
+
+        while heap:
+            _key, index, row = heapq.heappop(heap)
+            yield row
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+            shard = shards[index]
+            if not shard.rows:
+                if shard.pending is None:
+                    request(shard)
+                if shard.pending is not None:
+                    receive(shard)
+            if shard.rows:
+                push(index)
+    finally:
+        for shard in shards:
+            if shard.pending is not None:
+                shard.pending.cancel()
+        if deadline is not None:
+            deadline.cancel()
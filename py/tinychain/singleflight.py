@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Hashable, Optional
+
+
+class _Flight:
+    __slots__ = ("done", "response", "error", "waiters", "tag")
+
+    def __init__(self, tag: object = None) -> None:
+        self.done = threading.Event()
+        self.response: object = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.tag = tag
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls which share a key into one call.
+
+    The first caller for a key runs the call; callers which arrive while it is in flight block
+    until it finishes and then share its result (or re-raise its error). Nothing is remembered
+    once the call completes.
+
+    The leader may `tag` its flight (e.g. with its deadline). A follower which passes `accept`
+    is asked `accept(tag, response, error)` before taking the outcome; if it declines, it runs
+    the call again (leading or joining a new flight) instead.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self.declined = 0
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], object],
+        *,
+        tag: object = None,
+        accept: Optional[Callable[[object, object, Optional[BaseException]], bool]] = None,
+    ) -> object:
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight(tag)
+                else:
+                    flight.waiters += 1
+                    self.coalesced += 1
+
+            if leader:
+                break
+
+            flight.done.wait()
+            if accept is not None and not accept(flight.tag, flight.response, flight.error):
+                with self._lock:
+                    self.declined += 1
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = fn()
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.response
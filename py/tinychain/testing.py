@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import json
 import pathlib
 import subprocess
 from typing import Iterable, Optional, Tuple
 
-
-_SCALAR_VALUE_PREFIX = "/state/scalar/value/"
+from . import decode as _decode
+from .decode import _SCALAR_VALUE_PREFIX
 
 
 def _unwrap_scalar_value(payload: object) -> object:
@@ -30,13 +29,7 @@ def _unwrap_state(payload: object) -> object:
 
 
 def decode_json_body(response: "object"):
-    body = getattr(response, "body", None)
-    if body is None:
-        raise AssertionError("response missing body")
-
-    value = body.value()
-    text = value.to_json() if hasattr(value, "to_json") else value
-    return _unwrap_state(json.loads(text))
+    return _decode.decode_json_body(response)
 
 
 def response_json(response: "object"):
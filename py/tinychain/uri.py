@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import sys
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
@@ -108,13 +110,10 @@ def _path_segments(path: Optional[Iterable[str]]) -> list[str]:
     return segments
 
 
-def library(
-    *,
-    publisher: str,
-    name: str,
-    version: str,
-    path: Optional[Iterable[str]] = None,
-) -> URI:
+@functools.lru_cache(maxsize=4096)
+def _library_path(publisher: str, name: str, version: str, path: tuple[str, ...] = ()) -> str:
+    # Route stubs build the same handful of library paths over and over, so validate each
+    # distinct path once and hand back a single interned string for it.
     segments = [
         "lib",
         _segment("publisher", publisher),
@@ -122,7 +121,17 @@ def library(
         _segment("version", version),
         *_path_segments(path),
     ]
-    return URI("/" + "/".join(segments))
+    return sys.intern("/" + "/".join(segments))
+
+
+def library(
+    *,
+    publisher: str,
+    name: str,
+    version: str,
+    path: Optional[Iterable[str]] = None,
+) -> URI:
+    return URI(_library_path(publisher, name, version, tuple(path) if path is not None else ()))
 
 
 def library_link(
@@ -139,6 +148,26 @@ def library_link(
     return URI(path=base.path, scheme=authority.scheme, host=authority.host, port=authority.port)
 
 
+def replicas(dependency: URI, *authorities: URI | str) -> tuple[URI, ...]:
+    """
+    Return `dependency` once per authority, e.g. to list a library's replicas in `dependencies`.
+    """
+
+    linked = []
+    for authority in authorities:
+        if isinstance(authority, str):
+            authority = URI.parse(authority)
+        linked.append(
+            URI(
+                path=dependency.path,
+                scheme=authority.scheme,
+                host=authority.host,
+                port=authority.port,
+            )
+        )
+    return tuple(linked)
+
+
 def service(
     *,
     publisher: str,
@@ -1,75 +1,317 @@
 from __future__ import annotations
 
 import base64
+import contextlib
 import json
+import mmap
 import os
 import pathlib
-from typing import Optional, Union
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
 
+from . import kernel as _kernel
+from . import manifest as _manifest
 
 Schema = Union[pathlib.Path, dict]
 
+# Base64-encode the artifact this many raw bytes at a time. A multiple of 3, so the encoded
+# chunks concatenate into exactly the encoding of the whole artifact.
+CHUNK_SIZE = 3 << 20
+
 
 def _read_schema(path: pathlib.Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _read_wasm_b64(path: pathlib.Path) -> str:
-    data = path.read_bytes()
-    if not data:
-        raise RuntimeError(f"WASM binary {path} is empty")
-    return base64.b64encode(data).decode("ascii")
+@contextlib.contextmanager
+def _map_wasm(path: pathlib.Path) -> Iterator[mmap.mmap]:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise RuntimeError(f"WASM binary {path} is empty")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
 
 
-def install(
-    schema: Schema,
-    wasm_path: pathlib.Path,
-    *,
-    kernel: Optional[object] = None,
-    data_dir: Optional[pathlib.Path] = None,
-    bearer_token: Optional[str] = None,
-) -> object:
-    try:
-        import tinychain_local as local  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise ImportError(
-            "`tc.wasm.install` requires the optional `tinychain-local` backend"
-        ) from exc
+def _release_pages(mapped: mmap.mmap, end: int) -> None:
+    # Drop already-encoded pages of the mapping so they stop counting toward resident memory.
+    end -= end % mmap.PAGESIZE
+    if end > 0 and hasattr(mapped, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        mapped.madvise(mmap.MADV_DONTNEED, 0, end)
 
-    schema_value = schema if isinstance(schema, dict) else _read_schema(schema)
 
-    if kernel is None:
-        if data_dir is None:
-            raise ValueError("expected either `kernel` or `data_dir`")
-        token_host = os.environ.get("TC_TOKEN_HOST")
-        actor_id = os.environ.get("TC_ACTOR_ID")
-        public_key_b64 = os.environ.get("TC_PUBLIC_KEY_B64")
-        if token_host and actor_id and public_key_b64:
-            kernel = local.KernelHandle.with_library_schema_rjwt(
-                json.dumps(schema_value, separators=(",", ":")),
-                token_host,
-                actor_id,
-                public_key_b64,
-                data_dir=str(data_dir),
-            )
-        else:
-            kernel = local.KernelHandle.local(data_dir=str(data_dir))
-    payload = json.dumps(
+def _payload_envelope(schema_value: dict) -> tuple[bytes, bytes]:
+    # Render the install payload around a unique placeholder and split it there, so the
+    # artifact bytes can be spliced in without ever building the payload as a Python object.
+    marker = uuid.uuid4().hex
+    rendered = json.dumps(
         {
             "schema": schema_value,
             "artifacts": [
                 {
                     "path": "/lib/wasm",
                     "content_type": "application/wasm",
-                    "bytes": _read_wasm_b64(wasm_path),
+                    "bytes": marker,
                 }
             ],
         },
         separators=(",", ":"),
     )
+    prefix, suffix = rendered.split(marker)
+    return prefix.encode("ascii"), suffix.encode("ascii")
+
+
+def iter_install_payload(
+    schema: Schema,
+    wasm_path: pathlib.Path,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the JSON `/lib` install payload for a WASM library as ASCII chunks."""
+
+    if chunk_size <= 0 or chunk_size % 3:
+        raise ValueError(f"chunk_size must be a positive multiple of 3, got {chunk_size}")
+
+    schema_value = schema if isinstance(schema, dict) else _read_schema(schema)
+    prefix, suffix = _payload_envelope(schema_value)
+
+    with _map_wasm(wasm_path) as mapped:
+        yield prefix
+        with memoryview(mapped) as data:
+            for offset in range(0, len(data), chunk_size):
+                chunk = base64.b64encode(data[offset:offset + chunk_size])
+                _release_pages(mapped, offset + chunk_size)
+                yield chunk
+        yield suffix
+
+
+def install_payload(schema: Schema, wasm_path: pathlib.Path) -> str:
+    """Build the JSON `/lib` install payload for a WASM library in one buffer."""
+
+    size = pathlib.Path(wasm_path).stat().st_size
+    schema_value = schema if isinstance(schema, dict) else _read_schema(schema)
+    prefix, suffix = _payload_envelope(schema_value)
+    buffer = bytearray(len(prefix) + 4 * -(-size // 3) + len(suffix))
+
+    offset = 0
+    for chunk in iter_install_payload(schema_value, wasm_path):
+        buffer[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+
+    return buffer.decode("ascii")
+
+
+def _import_local(caller: str):
+    try:
+        import tinychain_local as local  # type: ignore
+    except Exception as exc:  # pragma: no cover
+        raise ImportError(f"`{caller}` requires the optional `tinychain-local` backend") from exc
+    return local
+
+
+def _rjwt_config() -> Optional[tuple[str, str, str]]:
+    token_host = os.environ.get("TC_TOKEN_HOST")
+    actor_id = os.environ.get("TC_ACTOR_ID")
+    public_key_b64 = os.environ.get("TC_PUBLIC_KEY_B64")
+    if token_host and actor_id and public_key_b64:
+        return token_host, actor_id, public_key_b64
+    return None
+
+
+def _local_kernel(schema_value: dict, data_dir: pathlib.Path) -> object:
+    rjwt = _rjwt_config()
+    if rjwt is not None:
+        # An RJWT kernel is bound to the one schema it installs, so it is not worth caching.
+        return _kernel.registry.build(
+            "with_library_schema_rjwt",
+            json.dumps(schema_value, separators=(",", ":")),
+            *rjwt,
+            data_dir=data_dir,
+        )
+    return _kernel.registry.local(data_dir)
+
+
+def _auth_headers(bearer_token: Optional[str]) -> Optional[list[tuple[str, str]]]:
+    if bearer_token is None:
+        return None
+    return [("authorization", f"Bearer {bearer_token}")]
+
+
+@dataclass
+class _Prepared:
+    schema: dict
+    digest: Optional[str]
+    body: object = None
+    skipped: Optional[_manifest.SkippedInstall] = None
+
+
+def _prepare(
+    local,
+    schema: Schema,
+    wasm_path: pathlib.Path,
+    manifest: Optional[_manifest.InstallManifest],
+    force: bool,
+) -> _Prepared:
+    schema_value = schema if isinstance(schema, dict) else _read_schema(schema)
+
+    digest = None
+    if manifest is not None:
+        digest = _manifest.content_digest(
+            schema_value, "/lib/wasm", "application/wasm", pathlib.Path(wasm_path)
+        )
+        if not force and manifest.is_current(schema_value["id"], digest):
+            skipped = _manifest.SkippedInstall(schema_value["id"], digest)
+            return _Prepared(schema_value, digest, skipped=skipped)
+
+    # Build the payload inline so the Python string is released as soon as the handle owns a copy.
+    body = local.StateHandle(install_payload(schema_value, wasm_path))
+    return _Prepared(schema_value, digest, body=body)
+
+
+def _dispatch(
+    local,
+    kernel: object,
+    prepared: _Prepared,
+    headers: Optional[list[tuple[str, str]]],
+    manifest: Optional[_manifest.InstallManifest],
+) -> object:
+    request = local.KernelRequest("PUT", "/lib", headers, prepared.body)
+    prepared.body = None
+    response = kernel.dispatch(request)
+    if manifest is not None and response.status == 204:
+        manifest.record(prepared.schema["id"], prepared.digest)
+        _kernel.registry.installed(manifest.data_dir, kernel)
+    return response
+
+
+def install(
+    schema: Schema,
+    wasm_path: pathlib.Path,
+    *,
+    kernel: Optional[object] = None,
+    data_dir: Optional[pathlib.Path] = None,
+    bearer_token: Optional[str] = None,
+    force: bool = False,
+) -> object:
+    """Install a WASM library through `PUT /lib`, unless `data_dir` already has it."""
+
+    local = _import_local("tc.wasm.install")
+
+    if kernel is None and data_dir is None:
+        raise ValueError("expected either `kernel` or `data_dir`")
+
+    manifest = _manifest.InstallManifest(data_dir) if data_dir is not None else None
+    prepared = _prepare(local, schema, wasm_path, manifest, force)
+    if prepared.skipped is not None:
+        return prepared.skipped
+
+    if kernel is None:
+        kernel = _local_kernel(prepared.schema, data_dir)
+
+    return _dispatch(local, kernel, prepared, _auth_headers(bearer_token), manifest)
+
+
+@dataclass
+class InstallResult:
+    """The outcome of installing one library with `install_many`."""
+
+    schema: Schema
+    wasm_path: pathlib.Path
+    library: Optional[str] = None
+    response: Optional[object] = None
+    error: Optional[BaseException] = None
+    prepare_seconds: float = 0.0
+    install_seconds: float = 0.0
+
+    @property
+    def skipped(self) -> bool:
+        return isinstance(self.response, _manifest.SkippedInstall)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and getattr(self.response, "status", None) == 204
+
+
+def discover(source: pathlib.Path) -> list[tuple[pathlib.Path, pathlib.Path]]:
+    """List the `(schema, wasm)` pairs to install from a directory or a manifest file."""
+
+    source = pathlib.Path(source)
+    if source.is_dir():
+        pairs = []
+        for wasm_path in sorted(source.glob("*.wasm")):
+            schema_path = wasm_path.with_suffix(".json")
+            if not schema_path.is_file():
+                raise ValueError(f"no schema {schema_path.name} for WASM binary {wasm_path}")
+            pairs.append((schema_path, wasm_path))
+        return pairs
+
+    entries = json.loads(source.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError(f"expected a JSON list of libraries in {source}")
+    return [(source.parent / entry["schema"], source.parent / entry["wasm"]) for entry in entries]
+
+
+def install_many(
+    libraries: Union[pathlib.Path, Iterable[tuple[Schema, pathlib.Path]]],
+    *,
+    kernel: Optional[object] = None,
+    data_dir: Optional[pathlib.Path] = None,
+    bearer_token: Optional[str] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[InstallResult]:
+    """Install many WASM libraries through one kernel, encoding them in a thread pool."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    local = _import_local("tc.wasm.install_many")
+
+    if isinstance(libraries, (str, pathlib.Path)):
+        libraries = discover(pathlib.Path(libraries))
+    results = [InstallResult(schema, pathlib.Path(wasm_path)) for schema, wasm_path in libraries]
+
+    if kernel is None and data_dir is None:
+        raise ValueError("expected either `kernel` or `data_dir`")
+
+    manifest = _manifest.InstallManifest(data_dir) if data_dir is not None else None
+    headers = _auth_headers(bearer_token)
+    # RJWT kernels are bound to one library schema, so only a plain local kernel is shared.
+    if kernel is None and _rjwt_config() is None:
+        kernel = _kernel.registry.local(data_dir)
+
+    def prepare(result: InstallResult) -> _Prepared:
+        start = time.perf_counter()
+        try:
+            return _prepare(local, result.schema, result.wasm_path, manifest, force)
+        finally:
+            result.prepare_seconds = time.perf_counter() - start
+
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tinychain-install") as pool:
+        pending = {}
+        for index, result in enumerate(results):
+            # Keep at most `workers` encoded payloads alive ahead of the dispatch loop.
+            for ahead in range(index, min(index + workers, len(results))):
+                if ahead not in pending:
+                    pending[ahead] = pool.submit(prepare, results[ahead])
+
+            try:
+                prepared = pending.pop(index).result()
+                result.library = prepared.schema["id"]
+                if prepared.skipped is not None:
+                    result.response = prepared.skipped
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    target = kernel if kernel is not None else _local_kernel(
+                        prepared.schema, data_dir
+                    )
+                    result.response = _dispatch(local, target, prepared, headers, manifest)
+                finally:
+                    result.install_seconds = time.perf_counter() - start
+            except Exception as err:
+                result.error = err
 
-    headers = None
-    if bearer_token is not None:
-        headers = [("authorization", f"Bearer {bearer_token}")]
-    request = local.KernelRequest("PUT", "/lib", headers, local.StateHandle(payload))
-    return kernel.dispatch(request)
+    return results
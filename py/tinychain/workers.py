@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:  # thread pools are only imported once a task is submitted.
+    import queue
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class LazyPool:
+    """
+    A `ThreadPoolExecutor` of up to `max_workers` threads, created on first use.
+
+    Shard scans and graph evaluation each own one, so `import tinychain` starts no threads.
+    `resize` changes the size for later submissions; work already submitted finishes on the old
+    pool.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        self.name = name
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def get(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            return self._pool
+
+    def submit(self, fn: Callable[..., object], *args: object) -> Future:
+        return self.get().submit(fn, *args)
+
+    def resize(self, max_workers: int) -> None:
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        with self._lock:
+            self.max_workers = max_workers
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Release the threads once their work finishes; the next submission starts a new pool."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+class ElasticPool:
+    """
+    Runs each task on an idle worker thread, or on a new one when every worker is busy.
+
+    Unlike a fixed-size pool, a task never queues behind blocked ones: a kernel call which hangs
+    holds its own worker, and only that one, until it returns. Workers are daemon threads and
+    exit after `idle_timeout` seconds without work, so the pool shrinks back after a burst.
+    """
+
+    def __init__(self, name: str, *, idle_timeout: float = 30.0) -> None:
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._tasks: Optional[queue.SimpleQueue] = None
+        self._idle = 0  # idle workers not yet promised a task
+        self._workers = 0
+        self._started = 0
+
+    @property
+    def workers(self) -> int:
+        with self._lock:
+            return self._workers
+
+    def submit(self, fn: Callable[..., object], *args: object) -> Future:
+        from concurrent.futures import Future
+
+        future: Future = Future()
+        with self._lock:
+            if self._tasks is None:
+                import queue
+
+                self._tasks = queue.SimpleQueue()
+            spawn = self._idle == 0
+            if spawn:
+                self._workers += 1
+                self._started += 1
+                name = f"{self.name}_{self._started}"
+            else:
+                self._idle -= 1
+
+        self._tasks.put((future, fn, args))
+        if spawn:
+            threading.Thread(target=self._work, name=name, daemon=True).start()
+        return future
+
+    def _work(self) -> None:
+        import queue
+
+        tasks = self._tasks
+        while True:
+            try:
+                future, fn, args = tasks.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # With no unpromised idle workers, a task is on its way to one of us.
+                    if self._idle > 0:
+                        self._idle -= 1
+                        self._workers -= 1
+                        return
+                continue
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args)
+                except BaseException as err:
+                    future.set_exception(err)
+                else:
+                    future.set_result(result)
+            del future, fn, args
+
+            with self._lock:
+                self._idle += 1